@@ -0,0 +1,163 @@
+"""
+Toplu dönüştürme: birden çok Trendyol dışa aktarımını tüm çekirdeklerde işler.
+
+Girdi olarak dosya, klasör ya da glob deseni verilir; klasörlerde
+'Ürünleriniz_*.xlsx' dosyaları aranır. Her (dosya × pazaryeri) çifti süreç
+havuzunda ayrı bir iş olarak çalışır ve çıktılar <çıktı klasörü>/<dosya adı>/
+altına yazılır. Bir işin hatası diğerlerini durdurmaz; sonunda özet tablo basılır.
+
+Önce her dosya bir kez ayrıştırılıp katalog önbelleğine (cache.py) alınır; böylece
+aynı dosyanın pazaryeri işleri Excel'i tekrar tekrar ayrıştırmaz.
+
+Kullanım:
+    python batch.py . --output-dir toplu_cikti
+    python batch.py "arsiv/Ürünleriniz_*.12.2025-*.xlsx" --marketplaces n11 pazarama --workers 4
+"""
+import argparse
+import glob
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cache
+from catalog import read_trendyol_export
+import convert
+import idefix
+import pipeline
+
+EXPORT_PATTERN = 'Ürünleriniz_*.xlsx'
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Girdiler ---
+
+def expand_inputs(inputs):
+    """Dosya, klasör ve glob desenlerini sıralı, tekrarsız dosya listesine çevirir."""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            files.extend(glob.glob(os.path.join(item, EXPORT_PATTERN)))
+        elif os.path.isfile(item):
+            files.append(item)
+        else:
+            files.extend(glob.glob(item))
+    # Açık Excel dosyalarının '~$' kilit dosyalarını atla
+    files = [f for f in files if not os.path.basename(f).startswith('~$')]
+    return sorted(set(os.path.abspath(f) for f in files))
+
+def _output_dir(output_root, trendyol_file):
+    return os.path.join(output_root, os.path.splitext(os.path.basename(trendyol_file))[0])
+
+# --- İşler (alt süreçte çalışır) ---
+
+def _error_message(exc):
+    return f"{type(exc).__name__}: {exc}"
+
+def _warm_cache(trendyol_file, cache_dir):
+    """Dosyayı bir kez ayrıştırıp önbelleğe alır; (satır sayısı, hata) döndürür."""
+    try:
+        return len(cache.read_trendyol_export_cached(trendyol_file, cache_dir=cache_dir)), None
+    except Exception as exc:
+        return 0, _error_message(exc)
+
+def _run_job(trendyol_file, marketplace, output_root, cache_dir, options):
+    start = time.perf_counter()
+    result = {'file': trendyol_file, 'marketplace': marketplace, 'rows': None, 'output': None, 'error': None}
+    try:
+        if cache_dir:
+            catalog_df = cache.read_trendyol_export_cached(trendyol_file, cache_dir=cache_dir)
+        else:
+            catalog_df = read_trendyol_export(trendyol_file)
+        out_dir = _output_dir(output_root, trendyol_file)
+        os.makedirs(out_dir, exist_ok=True)
+        write, path = pipeline.JOBS[marketplace](catalog_df, out_dir, options)
+        write()
+        result.update(rows=len(catalog_df), output=path)
+    except Exception as exc:
+        result['error'] = _error_message(exc)
+        result['traceback'] = traceback.format_exc()
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+# --- Ana İşlem ---
+
+def run_batch(files, output_root, marketplaces=pipeline.MARKETPLACES, max_workers=None,
+              cache_dir=cache.CACHE_DIR, hepsiburada_template=convert.hepsiburada_template_file,
+              idefix_template=idefix.template_file):
+    """
+    Her (dosya × pazaryeri) işini süreç havuzunda çalıştırır ve iş sonuçlarının
+    listesini döndürür. Hatalı işlerde 'error' dolu, 'output' None olur.
+    """
+    options = {'hepsiburada_template': os.path.abspath(hepsiburada_template),
+               'idefix_template': os.path.abspath(idefix_template),
+               'sku_registry': None}
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        # 1. Her dosyayı bir kez ayrıştır (önbellek); okunamayan dosyaların işleri atlanır
+        failed_files = {}
+        if cache_dir:
+            warm = {pool.submit(_warm_cache, f, cache_dir): f for f in files}
+            for future in as_completed(warm):
+                _, error = future.result()
+                if error:
+                    failed_files[warm[future]] = error
+
+        # 2. Pazaryeri işleri
+        futures = {}
+        for f in files:
+            for name in marketplaces:
+                if f in failed_files:
+                    results.append({'file': f, 'marketplace': name, 'rows': None, 'output': None,
+                                    'error': failed_files[f], 'seconds': 0.0})
+                else:
+                    futures[pool.submit(_run_job, f, name, output_root, cache_dir, options)] = (f, name)
+        for future in as_completed(futures):
+            f, name = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as exc:  # Alt süreç çöktüyse (BrokenProcessPool vb.)
+                results.append({'file': f, 'marketplace': name, 'rows': None, 'output': None,
+                                'error': _error_message(exc), 'seconds': 0.0})
+
+    order = {(f, name): i for i, (f, name) in enumerate((f, n) for f in files for n in marketplaces)}
+    return sorted(results, key=lambda r: order[(r['file'], r['marketplace'])])
+
+def print_summary(results):
+    name_width = max([len(os.path.basename(r['file'])) for r in results] + [5])
+    print(f"{'dosya':<{name_width}}  {'pazaryeri':<12}{'durum':<7}{'satır':>7}{'süre (sn)':>11}  çıktı / hata")
+    for r in results:
+        status = 'OK' if r['error'] is None else 'HATA'
+        rows = '' if r['rows'] is None else r['rows']
+        detail = r['output'] if r['error'] is None else r['error']
+        print(f"{os.path.basename(r['file']):<{name_width}}  {r['marketplace']:<12}{status:<7}{rows:>7}"
+              f"{r['seconds']:>11.2f}  {detail}")
+    failed = sum(r['error'] is not None for r in results)
+    print(f"{len(results) - failed} iş başarılı, {failed} iş hatalı.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Birden çok Trendyol dışa aktarımını paralel dönüştürür.')
+    parser.add_argument('inputs', nargs='+', help="Dosya, klasör ya da glob (örn. 'arsiv/Ürünleriniz_*.xlsx')")
+    parser.add_argument('--output-dir', default='toplu_cikti', help='Her dosya için alt klasör açılır')
+    parser.add_argument('--marketplaces', nargs='+', choices=pipeline.MARKETPLACES, default=list(pipeline.MARKETPLACES))
+    parser.add_argument('--workers', type=int, default=None, help='Süreç sayısı (varsayılan: çekirdek sayısı)')
+    parser.add_argument('--hepsiburada-template', default=os.path.join(BASE_DIR, convert.hepsiburada_template_file))
+    parser.add_argument('--idefix-template', default=os.path.join(BASE_DIR, idefix.template_file))
+    parser.add_argument('--cache-dir', default=cache.CACHE_DIR, help='Ayrıştırılmış katalog önbelleği klasörü')
+    parser.add_argument('--no-cache', action='store_true', help='Önbelleği kullanma; her iş dosyayı kendisi ayrıştırır')
+    args = parser.parse_args(argv)
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("Hata: işlenecek Trendyol dosyası bulunamadı.")
+        return 1
+
+    start = time.perf_counter()
+    results = run_batch(files, args.output_dir, args.marketplaces, args.workers,
+                        None if args.no_cache else args.cache_dir,
+                        args.hepsiburada_template, args.idefix_template)
+    print_summary(results)
+    print(f"{len(files)} dosya, {len(results)} iş, {time.perf_counter() - start:.2f} sn.")
+    return 0 if all(r['error'] is None for r in results) else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
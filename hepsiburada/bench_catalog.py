@@ -0,0 +1,126 @@
+"""
+Sıkıştırılmış katalog okuması (catalog.read_trendyol_export) ile düz
+pd.read_excel(header=...) okumasının bellek kullanımını karşılaştırır.
+
+bench_suite'teki sentetik dışa aktarımlar kullanılır. Her boyut ve yöntem ayrı bir
+süreçte çalışır; okumadan sonraki DataFrame boyutu (memory_usage(deep=True)), okuma
+sonrası tepe RSS ve dört dönüştürücü de çalıştırıldıktan sonraki tepe RSS ölçülür.
+Oranlar modüller yüklendikten sonraki RSS düşülerek (yalnızca verinin payı) verilir.
+Küçük boyutta iki okumanın (kategori sütunları açıldıktan sonra) aynı değerleri
+verdiği doğrulanır.
+
+Kullanım:
+    python bench_catalog.py                     # 10k, 100k satır
+    python bench_catalog.py 200000 --workdir bench_data
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from bench_suite import DEFAULT_WORKDIR, _peak_rss_mb, ensure_export
+
+DEFAULT_SIZES = (10_000, 100_000)
+METHODS = ('read_excel', 'compact')
+
+def plain_read(file_path):
+    """Sıkıştırma öncesi okuma: pd.read_excel + aynı temizlik, tüm sütunlar okunduğu tipte."""
+    from catalog import TRENDYOL_SHEET_NAME, clean_trendyol_frame, locate_header
+
+    header_idx, _ = locate_header(file_path)
+    df = pd.read_excel(file_path, sheet_name=TRENDYOL_SHEET_NAME, header=header_idx)
+    return clean_trendyol_frame(df)
+
+def _read(method, file_path):
+    from catalog import read_trendyol_export
+
+    return plain_read(file_path) if method == 'read_excel' else read_trendyol_export(file_path)
+
+# --- Tek Ölçüm (alt süreç) ---
+
+def measure(method, file_path):
+    import convert
+    import idefix
+    import pipeline
+    from bench_suite import BASE_DIR
+
+    import_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    df = _read(method, file_path)
+    read_seconds = time.perf_counter() - start
+    read_rss = _peak_rss_mb()
+    frame_mb = df.memory_usage(deep=True).sum() / 2**20
+
+    options = {'hepsiburada_template': os.path.join(BASE_DIR, convert.hepsiburada_template_file),
+               'idefix_template': os.path.join(BASE_DIR, idefix.template_file),
+               'sku_registry': None}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for job in pipeline.JOBS.values():
+            write, _ = job(df, output_dir, options)
+            write()
+    return {'import_rss_mb': import_rss, 'read_seconds': read_seconds, 'frame_mb': frame_mb, 'read_rss_mb': read_rss,
+            'total_seconds': time.perf_counter() - start, 'peak_rss_mb': _peak_rss_mb()}
+
+def same_values(file_path):
+    from catalog import dense_column
+
+    plain, compact = _read('read_excel', file_path), _read('compact', file_path)
+    compact = compact.apply(dense_column)
+    for col in plain.columns:
+        a = pd.to_numeric(plain[col], errors='coerce') if pd.api.types.is_numeric_dtype(compact[col]) else plain[col]
+        if not a.astype(str).reset_index(drop=True).equals(compact[col].astype(str).reset_index(drop=True)):
+            return False
+    return True
+
+# --- Ana İşlem ---
+
+def run(sizes, workdir):
+    print(f"{'satır':>8}{'yöntem':>12}{'okuma (sn)':>12}{'DataFrame MB':>14}{'okuma RSS':>11}"
+          f"{'toplam (sn)':>13}{'tepe RSS':>10}")
+    for i, n in enumerate(sizes):
+        path = ensure_export(n, workdir)
+        if i == 0:
+            # Karşılaştırma da ayrı süreçte: Linux'ta tepe RSS exec ile alt sürece geçer
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--check', path],
+                                  capture_output=True, text=True)
+            if proc.returncode != 0:
+                raise AssertionError(f"Sıkıştırılmış katalog düz okumadan farklı (n={n})")
+        results = {}
+        for method in METHODS:
+            # Her yöntem ayrı süreçte: tepe RSS birbirinden etkilenmesin
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', method, path],
+                                  capture_output=True, text=True, check=True)
+            r = results[method] = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{n:>8}{method:>12}{r['read_seconds']:>12.2f}{r['frame_mb']:>14.0f}{r['read_rss_mb']:>11.0f}"
+                  f"{r['total_seconds']:>13.2f}{r['peak_rss_mb']:>10.0f}")
+        old, new = results['read_excel'], results['compact']
+
+        def ratio(key):
+            # Küçük dosyalarda okuma tepe değeri modül yüklemesinin altında kalabilir
+            return max(old[key] - old['import_rss_mb'], 1) / max(new[key] - new['import_rss_mb'], 1)
+        print(f"{'':>8}{'oran':>12}{'':>12}{old['frame_mb'] / new['frame_mb']:>13.1f}x"
+              f"{ratio('read_rss_mb'):>10.1f}x{'':>13}{ratio('peak_rss_mb'):>9.1f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('sizes', nargs='*', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help='Sentetik dosyaların klasörü')
+    parser.add_argument('--measure', nargs=2, metavar=('YONTEM', 'DOSYA'), help=argparse.SUPPRESS)
+    parser.add_argument('--check', metavar='DOSYA', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 0 if same_values(args.check) else 1
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return 0
+    run(args.sizes, args.workdir)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
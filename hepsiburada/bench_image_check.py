@@ -0,0 +1,196 @@
+"""
+image_check için yerel sahte (stub) HTTP sunucusuyla doğrulama ve hız ölçümü.
+
+Sunucu ayrı bir iş parçacığında asyncio ile çalışır, iki portta (iki ayrı 'host')
+keep-alive HTTP/1.1 konuşur ve yol önekine göre yanıt verir:
+
+    /img/...       200 image/jpeg
+    /missing/...   404
+    /html/...      200 text/html (görsel değil)
+    /redirect/N    302 -> /img/N.jpg
+    /nohead/...    HEAD'e 405, GET'e 206 image/jpeg
+    /chunked/...   HEAD'e 405, GET'e Range'i yok sayan, LARGE_BODY_BYTES'lık parçalı 200 image/jpeg
+    /stream/...    HEAD'e 405, GET'e Content-Length'siz, bağlantı kapanana kadar süren 200 image/jpeg
+    /slow/...      zaman aşımından uzun bekler
+
+Her URL'nin beklenen sonucu bilindiği için denetim sonuçları tek tek doğrulanır;
+ardından aynı URL'ler ikinci kez denetlenerek önbelleğin çalıştığı gösterilir.
+
+Kullanım:
+    python bench_image_check.py                 # 20.000 URL
+    python bench_image_check.py 50000 --per-host 32
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+import image_check
+
+DEFAULT_COUNT = 20_000
+KINDS = ('img', 'img', 'img', 'img', 'img', 'missing', 'html', 'redirect', 'nohead')
+EXPECTED = {'img': (True, 200), 'missing': (False, 404), 'html': (False, 200),
+            'redirect': (True, 200), 'nohead': (True, 206), 'chunked': (True, 200), 'stream': (True, 200),
+            'slow': (False, None)}
+SLOW_SECONDS = 2.0
+LARGE_BODY_BYTES = 4 * 32 * 1024  # image_check.MAX_DRAIN_BYTES'tan büyük
+
+# --- Sahte Sunucu ---
+
+def _response(status, reason, content_type=None, extra=''):
+    head = f"HTTP/1.1 {status} {reason}\r\nContent-Length: 0\r\n"
+    if content_type:
+        head += f"Content-Type: {content_type}\r\n"
+    return (head + extra + '\r\n').encode('latin-1')
+
+async def _handle(reader, writer, stats):
+    stats['connections'] += 1
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            stats['requests'] += 1
+            kind = path.split('/')[1]
+            if kind == 'img':
+                writer.write(_response(200, 'OK', 'image/jpeg'))
+            elif kind == 'missing':
+                writer.write(_response(404, 'Not Found', 'text/html'))
+            elif kind == 'html':
+                writer.write(_response(200, 'OK', 'text/html; charset=utf-8'))
+            elif kind == 'redirect':
+                writer.write(_response(302, 'Found', extra=f"Location: /img/{path.split('/')[2]}.jpg\r\n"))
+            elif kind == 'nohead':
+                if method == 'HEAD':
+                    writer.write(_response(405, 'Method Not Allowed'))
+                else:
+                    writer.write(b"HTTP/1.1 206 Partial Content\r\nContent-Type: image/jpeg\r\n"
+                                 b"Content-Range: bytes 0-0/1000\r\nContent-Length: 1\r\n\r\n\xff")
+            elif kind in ('chunked', 'stream') and method == 'HEAD':
+                writer.write(_response(405, 'Method Not Allowed'))
+            elif kind == 'chunked':
+                part = b'\xff' * (LARGE_BODY_BYTES // 4)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: image/jpeg\r\nTransfer-Encoding: chunked\r\n\r\n"
+                             + b'%x\r\n%s\r\n' % (len(part), part) * 4 + b'0\r\n\r\n')
+            elif kind == 'stream':
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: image/jpeg\r\nConnection: close\r\n\r\n"
+                             + b'\xff' * LARGE_BODY_BYTES)
+                await writer.drain()
+                break
+            elif kind == 'slow':
+                await asyncio.sleep(SLOW_SECONDS)
+                writer.write(_response(200, 'OK', 'image/jpeg'))
+            else:
+                writer.write(_response(400, 'Bad Request'))
+            await writer.drain()
+    except (ConnectionError, ValueError, asyncio.CancelledError):
+        pass  # Kapanışta iptal edilen bağlantılar
+    finally:
+        writer.close()
+
+class StubServer:
+    """Arka planda çalışan, iki portlu sahte görsel sunucusu."""
+
+    def __init__(self, hosts=2):
+        self.hosts = hosts
+        self.ports = []
+        self.stats = {'connections': 0, 'requests': 0}
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.servers = []
+        for _ in range(self.hosts):
+            server = self.loop.run_until_complete(asyncio.start_server(
+                lambda r, w: _handle(r, w, self.stats), '127.0.0.1', 0, backlog=1024))
+            self.servers.append(server)
+            self.ports.append(server.sockets[0].getsockname()[1])
+        self._ready.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    async def _shutdown(self):
+        for server in self.servers:
+            server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self._thread.join(timeout=5)
+
+def make_urls(ports, count, slow=0):
+    """(url, tür) listesi üretir; türler KINDS sırasıyla dağıtılır."""
+    urls = []
+    for i in range(count):
+        kind = KINDS[i % len(KINDS)]
+        port = ports[i % len(ports)]
+        path = f"/redirect/{i}" if kind == 'redirect' else f"/{kind}/{i}.jpg"
+        urls.append((f"http://127.0.0.1:{port}{path}", kind))
+    for i in range(slow):
+        urls.append((f"http://127.0.0.1:{ports[0]}/slow/{i}.jpg", 'slow'))
+    return urls
+
+# --- Ölçüm ---
+
+def verify(urls, results):
+    """Beklenmeyen sonuç sayısını döndürür."""
+    wrong = 0
+    for url, kind in urls:
+        ok, status = EXPECTED[kind]
+        result = results[url]
+        if result['ok'] != ok or result['status'] != status:
+            wrong += 1
+            if wrong <= 5:
+                print(f"  BEKLENMEYEN: {url} -> {result}")
+    return wrong
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='image_check yerel sahte sunucu ölçümü')
+    parser.add_argument('count', type=int, nargs='?', default=DEFAULT_COUNT)
+    parser.add_argument('--per-host', type=int, default=image_check.PER_HOST_LIMIT)
+    parser.add_argument('--concurrency', type=int, default=image_check.TOTAL_LIMIT)
+    parser.add_argument('--slow', type=int, default=20, help='Zaman aşımına düşecek URL sayısı')
+    parser.add_argument('--timeout', type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        urls = make_urls(server.ports, args.count, args.slow)
+        cache_file = os.path.join(tmp, 'gorsel_kontrol.sqlite')
+        options = dict(cache_file=cache_file, per_host=args.per_host,
+                       concurrency=args.concurrency, timeout=args.timeout)
+
+        start = time.perf_counter()
+        results = image_check.check_urls([u for u, _ in urls], **options)
+        elapsed = time.perf_counter() - start
+        wrong = verify(urls, results)
+        print(f"ilk denetim   : {len(urls)} URL, {elapsed:.2f} sn ({len(urls) / elapsed:,.0f} URL/sn), "
+              f"{server.stats['requests']} istek / {server.stats['connections']} bağlantı, "
+              f"{wrong} beklenmeyen sonuç")
+
+        requests_before = server.stats['requests']
+        start = time.perf_counter()
+        cached = image_check.check_urls([u for u, _ in urls], **options)
+        elapsed = time.perf_counter() - start
+        # Hatalı sonuçların TTL'i de dolmadığı için ikinci çalıştırmada hiç istek gitmemeli
+        print(f"önbellekten   : {len(cached)} URL, {elapsed:.2f} sn, "
+              f"{server.stats['requests'] - requests_before} yeni istek")
+    return 0 if wrong == 0 else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+"""
+kernels.py çekirdeklerini satır bazlı eski yardımcı fonksiyonlarla (tests/baseline.py)
+karşılaştırır.
+
+Her boyutta önce sonuçların birebir aynı olduğu doğrulanır, sonra süreler ölçülür.
+
+Kullanım:
+    python bench_kernels.py                 # 10k, 100k, 1M satır
+    python bench_kernels.py 10000 50000
+"""
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import kernels
+from tests import baseline
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+# --- Sentetik Veri ---
+
+def synthetic_columns(n, seed=42):
+    rng = random.Random(seed)
+    n_models = max(1, n // 3)  # Ortalama 3 varyantlı ürün grupları
+    models = [f"MK{rng.randrange(n_models):06d}-{rng.choice(['S', 'M', 'L', 'Kirmizi', 'Mavi', '1'])}" for _ in range(n)]
+    for i in range(0, n, 97):
+        models[i] = np.nan
+    for i in range(5, n, 89):
+        models[i] = f"  {models[i - 1]}\n"
+
+    dims_pool = ['18x20', '10*15*5', '12 cm', '12,5 x 8 cm', ' ', '30X40', 'abc', '5x', '1x2x3x4', np.nan, np.nan, 7]
+    dims = [rng.choice(dims_pool) for _ in range(n)]
+
+    texts_pool = [' Ürün\nadı ', 'Açıklama\r\nsatırı', np.nan, 'düz metin', '  boşluklu  ']
+    texts = [rng.choice(texts_pool) for _ in range(n)]
+
+    return (pd.Series(models, dtype=object).astype(str).where(pd.notna(models), np.nan),
+            pd.Series(dims, dtype=object),
+            pd.Series(texts, dtype=object).astype(str).where(pd.notna(texts), np.nan))
+
+# --- Eski (satır bazlı) Sürümler ---
+
+def scalar_clean_text(s):
+    return [baseline.clean_text(v) for v in s]
+
+def scalar_unique_skus(s):
+    sku_counts = {}
+    return [baseline.get_unique_sku(baseline.clean_text(v), sku_counts) for v in s]
+
+def scalar_hb_unique_skus(s):
+    sku_counts = {}
+    return [baseline.make_sku_unique(v, sku_counts) for v in s]
+
+def scalar_variant_group_ids(s):
+    return [baseline.generate_variant_group_id(v) for v in s]
+
+def scalar_parse_dimensions(s):
+    parts = [baseline.parse_dimensions(v) for v in s]
+    return [[p[i] for p in parts] for i in range(3)]
+
+# --- Çekirdek Sürümler ---
+
+def kernel_clean_text(s):
+    return kernels.clean_text(s).tolist()
+
+def kernel_unique_skus(s):
+    return kernels.unique_skus(kernels.clean_text(s)).tolist()
+
+def kernel_hb_unique_skus(s):
+    return kernels.unique_skus(kernels.strip_text(s)).tolist()
+
+def kernel_variant_group_ids(s):
+    return kernels.variant_group_ids(s).tolist()
+
+def kernel_parse_dimensions(s):
+    return [part.tolist() for part in kernels.parse_dimensions(s)]
+
+CASES = [
+    ('clean_text', 'texts', scalar_clean_text, kernel_clean_text),
+    ('get_unique_sku', 'models', scalar_unique_skus, kernel_unique_skus),
+    ('make_sku_unique', 'models', scalar_hb_unique_skus, kernel_hb_unique_skus),
+    ('generate_variant_group_id', 'models', scalar_variant_group_ids, kernel_variant_group_ids),
+    ('parse_dimensions', 'dims', scalar_parse_dimensions, kernel_parse_dimensions),
+]
+
+def _timed(fn, arg):
+    start = time.perf_counter()
+    result = fn(arg)
+    return result, time.perf_counter() - start
+
+def run(sizes=DEFAULT_SIZES):
+    print(f"{'çekirdek':<28}{'satır':>10}{'eski (sn)':>12}{'yeni (sn)':>12}{'hızlanma':>10}")
+    for n in sizes:
+        models, dims, texts = synthetic_columns(n)
+        data = {'models': models, 'dims': dims, 'texts': texts}
+        for name, source, scalar_fn, kernel_fn in CASES:
+            expected, t_old = _timed(scalar_fn, data[source])
+            actual, t_new = _timed(kernel_fn, data[source])
+            if expected != actual:
+                raise AssertionError(f"{name}: çekirdek sonucu satır bazlı sonuçtan farklı (n={n})")
+            print(f"{name:<28}{n:>10}{t_old:>12.3f}{t_new:>12.3f}{t_old / t_new:>9.1f}x")
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,79 @@
+"""
+Fiyatlandırma kurallarının (pricing.py) süresini ölçer.
+
+bench_suite.synthetic_export ile n ürünlük katalog bellekte üretilir. Kural dosyası
+(varsayılan: fiyat_kurallari_ornek.json) bir kez derlenir; her pazaryeri için
+yeniden fiyatlama en iyi süresi ölçülür ve sonuç kuralları satır satır uygulayan
+düz Python hesabıyla karşılaştırılır.
+
+Kullanım:
+    python bench_pricing.py                     # 100k ürün
+    python bench_pricing.py 10000 --rules kurallar.json
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from bench_suite import synthetic_export
+from catalog import clean_trendyol_frame, compact_catalog, dense_column
+from pricing import (CATEGORY_COLUMN, DEFAULT_KEY, MARKETPLACES, PRICE_COLUMNS, RULE_FIELDS, _resolve,
+                     compile_rules, load_rules)
+
+DEFAULT_SIZE = 100_000
+DEFAULT_RULES = 'fiyat_kurallari_ornek.json'
+DEFAULT_REPEAT = 5
+
+def expected_prices(catalog_df, rules, marketplace, price):
+    """Karşılaştırma için kuralları satır satır uygulayan hesap."""
+    marketplace_rules = dict(rules.get(marketplace, {}))
+    base = _resolve(rules.get(DEFAULT_KEY, {}), marketplace_rules.pop(DEFAULT_KEY, {}))
+    out = []
+    for category, value in zip(dense_column(catalog_df[CATEGORY_COLUMN]), catalog_df[PRICE_COLUMNS[price]]):
+        rule = _resolve(base, marketplace_rules[category]) if category in marketplace_rules else base
+        if math.isnan(value) or not set(rule) - {'applies_to'} or price not in rule.get('applies_to', PRICE_COLUMNS):
+            out.append(value)
+            continue
+        r = {field: rule.get(field, neutral) for field, neutral in RULE_FIELDS.items()}
+        p = (value * (1 + r['markup_pct'] / 100) + r['markup_fixed']) / (1 - r['commission_pct'] / 100)
+        if r['round_step'] > 0:
+            p = math.ceil((p - r['ending']) / r['round_step'] - 1e-9) * r['round_step'] + r['ending']
+        if p < r['min']:
+            p = r['min']
+        if p > r['max']:
+            p = r['max']
+        out.append(round(p, 2))
+    return np.array(out, dtype='float64')
+
+def run(n, rules_file, repeat):
+    catalog_df = compact_catalog(clean_trendyol_frame(synthetic_export(n)))
+    rules = load_rules(rules_file)
+    print(f"{len(catalog_df)} ürün, kurallar: {rules_file}")
+    print(f"{'pazaryeri':<14}{'derleme (ms)':>14}{'fiyatlama (ms)':>16}")
+    for marketplace in MARKETPLACES:
+        start = time.perf_counter()
+        reprice = compile_rules(rules, marketplace)
+        compile_ms = (time.perf_counter() - start) * 1000
+        best, out = float('inf'), None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            out = reprice(catalog_df)
+            best = min(best, time.perf_counter() - start)
+        for price, column in PRICE_COLUMNS.items():
+            if not np.allclose(out[column].to_numpy(dtype='float64'),
+                               expected_prices(catalog_df, rules, marketplace, price), equal_nan=True):
+                raise AssertionError(f"{marketplace}/{price}: fiyatlar satır satır hesapla uyuşmuyor")
+        print(f"{marketplace:<14}{compile_ms:>14.2f}{best * 1000:>16.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('size', nargs='?', type=int, default=DEFAULT_SIZE, help='Ürün sayısı')
+    parser.add_argument('--rules', default=DEFAULT_RULES, help='Kural dosyası (JSON)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Her ölçüm kaç kez tekrarlanır')
+    args = parser.parse_args(argv)
+    run(args.size, args.rules, args.repeat)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+"""
+Trendyol dışa aktarımını okuma motorlarını (catalog.READER_ENGINES) karşılaştırır.
+
+Varsayılan olarak klasördeki gerçek 'Ürünleriniz_*.xlsx' dosyaları okunur. Her dosya
+ve motor için read_trendyol_export en iyi süresi ölçülür; iki motorun ürettiği
+DataFrame'lerin (sütun tipleri dahil) aynı olduğu doğrulanır. python-calamine kurulu
+değilse yalnızca openpyxl ölçülür.
+
+Kullanım:
+    python bench_reader.py                                   # Ürünleriniz_*.xlsx
+    python bench_reader.py bench_data/Ürünleriniz_sentetik_100000.xlsx --repeat 1
+"""
+import argparse
+import glob
+import os
+import time
+
+from catalog import HAS_CALAMINE, read_trendyol_export
+
+DEFAULT_PATTERN = 'Ürünleriniz_*.xlsx'
+DEFAULT_REPEAT = 3
+
+def _best_time(file_path, engine, repeat):
+    best, df = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = read_trendyol_export(file_path, engine=engine)
+        best = min(best, time.perf_counter() - start)
+    return best, df
+
+def run(files, repeat):
+    engines = ('openpyxl', 'calamine') if HAS_CALAMINE else ('openpyxl',)
+    if not HAS_CALAMINE:
+        print("python-calamine kurulu değil; yalnızca openpyxl ölçülüyor.")
+    print(f"{'dosya':<40}{'satır':>8}" + ''.join(f"{e + ' (sn)':>17}" for e in engines)
+          + (f"{'hızlanma':>10}" if len(engines) > 1 else ''))
+    for path in files:
+        times, frames = [], []
+        for engine in engines:
+            elapsed, df = _best_time(path, engine, repeat)
+            times.append(elapsed)
+            frames.append(df)
+        if len(frames) > 1 and not (frames[0].equals(frames[1]) and frames[0].dtypes.equals(frames[1].dtypes)):
+            raise AssertionError(f"Okuma motorlarının sonuçları farklı: {path}")
+        line = f"{os.path.basename(path)[:39]:<40}{len(frames[0]):>8}" + ''.join(f"{t:>17.3f}" for t in times)
+        if len(times) > 1:
+            line += f"{times[0] / times[1]:>9.1f}x"
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('files', nargs='*', help=f"Okunacak dosyalar (varsayılan: {DEFAULT_PATTERN})")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Her ölçüm kaç kez tekrarlanır')
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(glob.glob(DEFAULT_PATTERN))
+    if not files:
+        print(f"Hata: okunacak dosya yok ({DEFAULT_PATTERN}).")
+        return 1
+    run(files, args.repeat)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""
+Stok uzlaştırmasının (reconcile.py) süresini ölçer.
+
+bench_suite.synthetic_export ile n ürünlük katalog bellekte üretilir (xlsx yazılıp
+okunmaz). Her kanal için n sipariş satırı üretilir: satırların bir kısmı yalnızca
+kanal stok koduyla, bir kısmı iptal durumunda, küçük bir kısmı katalogda olmayan
+barkodla gelir. SkuIndex kurulumu ve reconcile ayrı ayrı ölçülür; sonuç basit bir
+döngüyle hesaplanan kullanılabilir stokla karşılaştırılır.
+
+Kullanım:
+    python bench_reconcile.py                   # 100k ürün x 5 kanal
+    python bench_reconcile.py 10000 --repeat 5
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench_suite import synthetic_export
+from catalog import clean_trendyol_frame, compact_catalog
+from reconcile import CHANNELS, SkuIndex, normalize_orders, reconcile
+
+DEFAULT_SIZE = 100_000
+DEFAULT_REPEAT = 3
+
+def synthetic_orders(index, channel, n, seed):
+    """index ürünlerinden n satırlık, ham sipariş dışa aktarımı düzeninde tablo."""
+    rng = np.random.default_rng(seed)
+    pick = rng.integers(0, len(index), n)
+    barcodes = index.barcodes[pick].copy()
+    skus = index.skus[channel][pick].copy()
+    by_sku = (rng.random(n) < 0.3) & (skus != '')  # Barkodsuz, yalnızca stok koduyla gelen satırlar
+    barcodes[by_sku] = ''
+    unknown = rng.random(n) < 0.01  # Katalogda olmayan ürünler
+    barcodes[unknown] = 'YOK' + pd.Series(np.arange(unknown.sum())).astype(str).to_numpy(dtype=object)
+    skus[unknown] = ''
+    status = np.where(rng.random(n) < 0.05, 'İptal Edildi', 'Teslim Edildi')
+    return pd.DataFrame({'Barkod': barcodes, 'Stok Kodu': skus,
+                         'Adet': rng.integers(1, 4, n).astype(str), 'Sipariş Durumu': status})
+
+def expected_available(index, orders_by_channel):
+    """Karşılaştırma için sözlük tabanlı, satır satır hesap."""
+    sold = np.zeros(len(index), dtype='int64')
+    barcode_pos = {}
+    for i, b in enumerate(index.barcodes):
+        if b:
+            barcode_pos.setdefault(b, i)
+    for channel, orders in orders_by_channel.items():
+        sku_pos = {}
+        for i, s in enumerate(index.skus[channel]):
+            if s:
+                sku_pos.setdefault(s, i)
+        for b, s, q in zip(orders['barcode'], orders['sku'], orders['quantity']):
+            pos = barcode_pos.get(b, sku_pos.get(s)) if b else sku_pos.get(s)
+            if pos is not None:
+                sold[pos] += q
+    return np.maximum(index.stock - sold, 0)
+
+def _best_time(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run(n, repeat):
+    catalog_df = compact_catalog(clean_trendyol_frame(synthetic_export(n)))
+    index_seconds, index = _best_time(lambda: SkuIndex(catalog_df), repeat)
+    orders = {channel: normalize_orders(synthetic_orders(index, channel, n, seed))
+              for seed, channel in enumerate(CHANNELS)}
+    reconcile_seconds, (summary, unmatched) = _best_time(lambda: reconcile(index, orders), repeat)
+
+    if not np.array_equal(summary['Kullanılabilir Stok'].to_numpy(), expected_available(index, orders)):
+        raise AssertionError("Uzlaştırma sonucu satır satır hesapla uyuşmuyor")
+    print(f"{len(index)} ürün, {len(CHANNELS)} kanal x {n} sipariş satırı "
+          f"({len(unmatched)} eşleşmedi)")
+    print(f"{'indeks kurulumu (sn)':<24}{index_seconds:>8.3f}")
+    print(f"{'uzlaştırma (sn)':<24}{reconcile_seconds:>8.3f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('size', nargs='?', type=int, default=DEFAULT_SIZE, help='Ürün sayısı')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Her ölçüm kaç kez tekrarlanır')
+    args = parser.parse_args(argv)
+    run(args.size, args.repeat)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+"""
+Dönüştürücü kıyaslama (benchmark) takımı.
+
+Gerçek 'Ürünleriniz_*.xlsx' düzeninde ('Ürünler' sayfası, aynı sütunlar, tüm hücreler
+metin) sentetik dışa aktarımlar üretir: çok satırlı açıklamalar, 8 görsel sütunu,
+tekrar eden model kodları, dağınık Boyut/Ebat değerleri, barkodu boş satırlar ve
+araya karışmış başlık satırları. Her boyut için dört dönüştürücü (Hepsiburada,
+Pazarama, N11, Idefix) ayrı bir süreçte çalıştırılır; toplam süre, tepe RSS ve
+aşama süreleri (okuma, doğrulama, her pazaryeri için eşleştirme ve yazma; ayrıntısı
+profiling.py kayıtlarında) JSON olarak raporlanır.
+
+Sentetik dosyalar --workdir altında saklanır ve sonraki çalıştırmalarda yeniden kullanılır.
+
+Kullanım:
+    python bench_suite.py                            # 1k, 10k, 100k, 500k satır
+    python bench_suite.py 1000 10000 --output sonuc.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 500_000)
+DEFAULT_WORKDIR = os.path.join(BASE_DIR, 'bench_data')
+DEFAULT_OUTPUT = 'bench_results.json'
+
+# Trendyol dışa aktarımındaki sütun sırası
+TRENDYOL_COLUMNS = [
+    'Partner ID', 'Barkod', 'Komisyon Oranı', 'Model Kodu', 'Ürün Rengi', 'Beden', 'Boyut/Ebat',
+    'Cinsiyet', 'Marka', 'Kategori İsmi', 'Tedarikçi Stok Kodu', 'Ürün Adı', 'Ürün Açıklaması',
+    'Piyasa Satış Fiyatı (KDV Dahil)', "Trendyol'da Satılacak Fiyat (KDV Dahil)", 'BuyBox Fiyatı',
+    'Ürün Stok Adedi', 'KDV Oranı', 'ÖTV Oranı', 'Desi',
+    'Görsel 1', 'Görsel 2', 'Görsel 3', 'Görsel 4', 'Görsel 5', 'Görsel 6', 'Görsel 7', 'Görsel 8',
+    'Sevkiyat Süresi', 'Sevkiyat Tipi', 'Parti/Lot/SKT Bilgisi', 'Durum', 'Durum Açıklaması',
+    'Trendyol.com Linki',
+]
+
+# --- Sentetik Veri ---
+
+_COLORS = ['', '', 'Siyah', 'Beyaz', 'Kırmızı', 'Mavi', 'Çok Renkli']
+_SIZES = ['Tek Ebat', 'Tek Ebat', 'S', 'M', 'L', '42', '']
+_DIMENSIONS = ['', '', '18x20', '10*15*5', '12 cm', '12,5 x 8 cm', ' ', '30X40', 'abc', '5x', '1x2x3x4', '7']
+_BRANDS = ['hivhestın', 'hivhestın', 'Dekorasyon', 'ÖrnekMarka']
+_CATEGORIES = ['Karakter Figür Oyuncak', 'Dekoratif Obje', 'Biblo', 'Figür', 'Maket']
+_WORDS = ['Dekoratif', '3D', 'Baskı', 'Figür', 'Premium', 'Koleksiyon', 'Biblo', 'Yoda', 'Groot',
+          'Low', 'Poly', 'Masaüstü', 'Hediye', 'Set', "2'li", 'Mat', 'Parlak', 'El', 'Yapımı']
+_STATUSES = ['Satışta', 'Satışta', 'Satışta', 'Onaylandı', 'Stokta Yok']
+
+def _description(rng):
+    lines = [' '.join(rng.choices(_WORDS, k=rng.randint(8, 25))) for _ in range(rng.randint(1, 4))]
+    return 'Ürün Açıklaması ' + rng.choice(['\n', '\r\n', ' ']).join(lines)
+
+def synthetic_export(n, seed=42):
+    """Gerçek dışa aktarım düzeninde, tüm hücreleri metin olan n satırlık katalog."""
+    rng = random.Random(seed)
+    n_models = max(1, n * 2 // 3)  # Yaklaşık üçte bir satır tekrar eden model kodu
+    rows = []
+    for i in range(n):
+        model = f"Dkrsyn{rng.randrange(n_models):06d}"
+        if rng.random() < 0.2:
+            model += rng.choice(['-1', '-2', '-S', '-Kirmizi'])
+        price = f"{rng.randint(50, 2500)}.{rng.choice(['0', '5', '25', '99'])}"
+        n_images = rng.randint(1, 8)
+        images = [f"https://cdn.dsmcdn.com/ty{rng.randint(1000, 1999)}/prod/QC_PREP/{i}_{k}_org_zoom.jpg"
+                  if k < n_images else '' for k in range(8)]
+        rows.append([
+            '1133791', f"Bench{i:08d}", '19.0', model, rng.choice(_COLORS), rng.choice(_SIZES),
+            rng.choice(_DIMENSIONS), '', rng.choice(_BRANDS), rng.choice(_CATEGORIES), '',
+            ' '.join(rng.choices(_WORDS, k=rng.randint(3, 10))) + rng.choice(['', ' ', ' -']),
+            _description(rng), price, price, '', str(rng.randint(0, 500)), rng.choice(['20', '10', '1']),
+            '', rng.choice(['0.0', '1.0', '2.5']), *images, '', '', '', rng.choice(_STATUSES), '',
+            f"https://www.trendyol.com/hivhestin/urun-p-{i}",
+        ])
+
+    # Trendyol dosyalarındaki kirli satırlar: boş barkod ve araya karışmış başlık satırı
+    for i in range(17, n, 997):
+        rows[i][1] = ''
+    for i in range(501, n, 4999):
+        rows[i] = list(TRENDYOL_COLUMNS)
+    return pd.DataFrame(rows, columns=TRENDYOL_COLUMNS)
+
+def ensure_export(n, workdir):
+    """Sentetik dosyayı (yoksa) üretir ve yolunu döndürür."""
+    from xlsx_writer import write_frame
+
+    path = os.path.join(workdir, f"Ürünleriniz_sentetik_{n}.xlsx")
+    if not os.path.exists(path):
+        os.makedirs(workdir, exist_ok=True)
+        write_frame(f"{path}.tmp", 'Ürünler', synthetic_export(n))
+        os.replace(f"{path}.tmp", path)
+    return path
+
+# --- Tek Boyut Ölçümü (alt süreç) ---
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB
+
+def measure(trendyol_file, output_dir):
+    """Dört dönüştürücüyü sırayla çalıştırır ve aşama sürelerini döndürür."""
+    from catalog import read_trendyol_export
+    import convert
+    import idefix
+    import pipeline
+    import profiling
+    import validation
+
+    phases = {}
+    records = []
+    profiling.add_hook(records.append)  # Ayrıntılı alt aşamalar (read.rows, hepsiburada.dtype_fixup ...)
+    start = time.perf_counter()
+
+    t = time.perf_counter()
+    catalog_df = read_trendyol_export(trendyol_file)
+    phases['read'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    validation.validate_catalog(catalog_df)
+    phases['validate'] = time.perf_counter() - t
+
+    options = {'hepsiburada_template': os.path.join(BASE_DIR, convert.hepsiburada_template_file),
+               'idefix_template': os.path.join(BASE_DIR, idefix.template_file),
+               'sku_registry': None}
+    for name, job in pipeline.JOBS.items():
+        t = time.perf_counter()
+        write, _ = job(catalog_df, output_dir, options)
+        phases[f"{name}.map"] = time.perf_counter() - t
+        t = time.perf_counter()
+        write()
+        phases[f"{name}.write"] = time.perf_counter() - t
+
+    return {
+        'rows': len(catalog_df),
+        'wall_seconds': time.perf_counter() - start,
+        'peak_rss_mb': _peak_rss_mb(),
+        'phases': phases,
+        'profile': [{k: r[k] for k in ('phase', 'parent', 'wall_s', 'cpu_s', 'rows', 'rows_per_s')} for r in records],
+    }
+
+# --- Ana İşlem ---
+
+def run(sizes, workdir, output):
+    results = []
+    print(f"{'satır':>8}{'okuma (sn)':>12}{'toplam (sn)':>13}{'tepe RSS (MB)':>15}")
+    for n in sizes:
+        path = ensure_export(n, workdir)
+        out_dir = os.path.join(workdir, f"cikti_{n}")
+        os.makedirs(out_dir, exist_ok=True)
+        # Her boyut ayrı süreçte: tepe RSS önceki boyutlardan etkilenmesin
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', path, out_dir],
+                              cwd=out_dir, capture_output=True, text=True, check=True)
+        result = {'size': n, 'file': os.path.basename(path), 'file_bytes': os.path.getsize(path),
+                  **json.loads(proc.stdout.strip().splitlines()[-1])}
+        results.append(result)
+        print(f"{n:>8}{result['phases']['read']:>12.2f}{result['wall_seconds']:>13.2f}{result['peak_rss_mb']:>15.0f}")
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar yazıldı: {output}")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Dönüştürücüleri sentetik Trendyol dosyalarıyla ölçer.')
+    parser.add_argument('sizes', nargs='*', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help='Sentetik dosyaların ve çıktıların klasörü')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON sonuç dosyası')
+    parser.add_argument('--measure', nargs=2, metavar=('DOSYA', 'CIKTI_KLASORU'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return 0
+    run(args.sizes, args.workdir, args.output)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""
+upload.py'yi sahte pazaryeri sunucusuna (fake_marketplace.py) karşı ölçer ve doğrular.
+
+Sentetik bir Trendyol dışa aktarımı (bench_suite.py) seçilen pazaryerleri için eşlenir
+ve yüklenir. Sunucunun hız sınırı istemcininkinden düşük tutulur ve geçici 503
+hataları üretilir; böylece 429/Retry-After, yeniden deneme ve Idempotency-Key yolları
+da çalışır. Sonunda her pazaryerinde sunucuya ulaşan satır sayısının eşlenen satır
+sayısına eşit olduğu ve tüm paketlerin 'completed' olduğu doğrulanır; ardından aynı
+yükleme tekrarlanarak hiçbir paketin yeniden gönderilmediği gösterilir.
+
+Kullanım:
+    python bench_upload.py                       # 50.000 satır, n11 ve pazarama
+    python bench_upload.py 10000 --marketplaces hepsiburada idefix --fail-rate 0.1
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import bench_suite
+import cache
+import convert
+import idefix
+import upload
+from fake_marketplace import FakeMarketplace
+from pipeline import FRAMES, MARKETPLACES
+
+DEFAULT_SIZE = 50_000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='upload.py sahte sunucu ölçümü')
+    parser.add_argument('size', type=int, nargs='?', default=DEFAULT_SIZE)
+    parser.add_argument('--marketplaces', nargs='+', choices=MARKETPLACES, default=['n11', 'pazarama'])
+    parser.add_argument('--workdir', default=bench_suite.DEFAULT_WORKDIR)
+    parser.add_argument('--server-rate', type=float, default=None,
+                        help='Sunucu hız sınırı, istek/sn (varsayılan: istemci sınırının %%80\'i)')
+    parser.add_argument('--fail-rate', type=float, default=0.05)
+    parser.add_argument('--reject-every', type=int, default=97)
+    args = parser.parse_args(argv)
+
+    export = bench_suite.ensure_export(args.size, args.workdir)
+    catalog_df = cache.read_trendyol_export_cached(export, cache_dir=os.path.join(args.workdir, cache.CACHE_DIR))
+    options = {'hepsiburada_template': os.path.join(bench_suite.BASE_DIR, convert.hepsiburada_template_file),
+               'idefix_template': os.path.join(bench_suite.BASE_DIR, idefix.template_file), 'sku_registry': None}
+    frames = {name: FRAMES[name](catalog_df, options)[0] for name in args.marketplaces}
+
+    server_rate = args.server_rate or 0.8 * min(upload.MARKETPLACE_APIS[n]['rate'] for n in args.marketplaces)
+    upload.POLL_INTERVAL_SECONDS = 1.0
+    ok = True
+    with FakeMarketplace(rate=server_rate, fail_rate=args.fail_rate, processing_seconds=0.5,
+                         reject_every=args.reject_every, seed=1) as server, tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, upload.STATE_FILE)
+        start = time.perf_counter()
+        results = upload.upload_frames(frames, state_file, base_url=server.url)
+        elapsed = time.perf_counter() - start
+        stats = dict(server.stats)
+        print(f"yükleme       : {sum(len(df) for df in frames.values())} satır, {elapsed:.1f} sn; "
+              f"{stats['requests']} istek, {stats['rate_limited']} x 429, {stats['transient_errors']} x 503, "
+              f"{stats['duplicates']} tekrar eden paket")
+        for name, (statuses, rejected_rows) in results.items():
+            received = stats['items'].get(name, 0)
+            complete = set(statuses) == {'completed'} and received == len(frames[name])
+            ok = ok and complete
+            print(f"  {name:<12}{len(frames[name]):>7} satır, sunucuya ulaşan {received:>7}, "
+                  f"paketler {statuses}, reddedilen {rejected_rows} -> {'OK' if complete else 'HATA'}")
+
+        requests_before = server.stats['requests']
+        start = time.perf_counter()
+        upload.upload_frames(frames, state_file, base_url=server.url, poll=False)
+        print(f"tekrar        : {time.perf_counter() - start:.2f} sn, "
+              f"{server.stats['requests'] - requests_before} yeni istek")
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
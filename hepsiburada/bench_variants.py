@@ -0,0 +1,62 @@
+"""
+Varyant grubu indeksinin (variants.py) süresini ölçer.
+
+bench_suite.synthetic_export ile n ürünlük katalog bellekte üretilir. İndeks kurulumu,
+grup denetimleri ve görsellerin gruba yayılması ayrı ayrı ölçülür; tekrar eden
+varyant denetimi pandas groupby/duplicated ile hesaplanan sonuçla karşılaştırılır.
+
+Kullanım:
+    python bench_variants.py                    # 100k ürün
+    python bench_variants.py 500000 --repeat 1
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from bench_suite import synthetic_export
+from catalog import clean_trendyol_frame, compact_catalog, dense_column
+from kernels import strip_text, variant_group_ids
+from variants import IMAGE_COLUMNS, OPTION_COLUMNS, VariantGroupIndex, fill_from_group, group_rules
+
+DEFAULT_SIZE = 100_000
+DEFAULT_REPEAT = 3
+
+def expected_duplicates(catalog_df):
+    frame = pd.DataFrame({'grup': variant_group_ids(dense_column(catalog_df['Model Kodu'])),
+                          **{c: strip_text(dense_column(catalog_df[c])) for c in OPTION_COLUMNS}})
+    return ((frame['grup'] != '') & frame.duplicated(keep=False)).to_numpy()
+
+def _best_time(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run(n, repeat):
+    catalog_df = compact_catalog(clean_trendyol_frame(synthetic_export(n)))
+    index_seconds, index = _best_time(lambda: VariantGroupIndex(catalog_df), repeat)
+    rules_seconds, rules = _best_time(lambda: group_rules(catalog_df, index), repeat)
+    fill_seconds, _ = _best_time(lambda: fill_from_group(catalog_df, IMAGE_COLUMNS, index, overwrite=True), repeat)
+
+    if not (rules[0][3] == expected_duplicates(catalog_df)).all():
+        raise AssertionError("Tekrar eden varyant denetimi pandas sonucuyla uyuşmuyor")
+    print(f"{len(catalog_df)} ürün, {len(index)} grup ({int((index.sizes > 1).sum())} çok varyantlı)")
+    print(f"{'indeks kurulumu (sn)':<24}{index_seconds:>8.3f}")
+    print(f"{'grup denetimleri (sn)':<24}{rules_seconds:>8.3f}")
+    print(f"{'görsel yayma (sn)':<24}{fill_seconds:>8.3f}")
+    for rule, _, _, mask, _ in rules:
+        print(f"  {rule:<24}{int(mask.sum()):>8}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('size', nargs='?', type=int, default=DEFAULT_SIZE, help='Ürün sayısı')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Her ölçüm kaç kez tekrarlanır')
+    args = parser.parse_args(argv)
+    run(args.size, args.repeat)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
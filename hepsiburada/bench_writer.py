@@ -0,0 +1,73 @@
+"""
+xlsx_writer (akışlı yazıcı) ile pd.ExcelWriter(engine='openpyxl') yazımını karşılaştırır.
+
+Gerçek bir Trendyol dışa aktarımından üretilen Pazarama çıktısı istenen satır
+sayısına çoğaltılır. Her boyutta süre ve tracemalloc tepe belleği ölçülür; küçük
+boyutta iki dosyanın hücre değerlerinin aynı olduğu doğrulanır.
+
+Kullanım:
+    python bench_writer.py                      # 5k, 20k, 50k satır
+    python bench_writer.py 100000 --source "Ürünleriniz_02.01.2026-23.27.xlsx"
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from catalog import read_trendyol_export
+import pazarama
+from xlsx_writer import write_frame
+
+DEFAULT_SIZES = (5_000, 20_000, 50_000)
+DEFAULT_SOURCE = 'Ürünleriniz_02.01.2026-23.27.xlsx'
+SHEET_NAME = 'Ürün Listesi'
+
+def pandas_write(df, path):
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name=SHEET_NAME)
+
+def stream_write(df, path):
+    write_frame(path, SHEET_NAME, df)
+
+def _measure(fn, df, path):
+    start = time.perf_counter()
+    fn(df, path)
+    elapsed = time.perf_counter() - start
+
+    # Bellek ayrı bir çalıştırmada ölçülür (tracemalloc süreyi bozar)
+    tracemalloc.start()
+    fn(df, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+def _same_cells(path_a, path_b):
+    from openpyxl import load_workbook
+
+    def cells(path):
+        wb = load_workbook(path, read_only=True)
+        return wb.sheetnames, [row for row in wb.active.iter_rows(values_only=True)]
+    return cells(path_a) == cells(path_b)
+
+def run(sizes, source):
+    base = pazarama.build_pazarama(read_trendyol_export(source))
+    print(f"{'satır':>10}{'pandas (sn)':>13}{'akış (sn)':>11}{'hızlanma':>10}{'pandas MB':>11}{'akış MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path, new_path = os.path.join(tmp, 'pandas.xlsx'), os.path.join(tmp, 'stream.xlsx')
+        for i, n in enumerate(sizes):
+            df = pd.concat([base] * (n // len(base) + 1), ignore_index=True).iloc[:n]
+            t_old, m_old = _measure(pandas_write, df, old_path)
+            t_new, m_new = _measure(stream_write, df, new_path)
+            if i == 0 and not _same_cells(old_path, new_path):
+                raise AssertionError(f"Akış yazıcısının çıktısı pandas çıktısından farklı (n={n})")
+            print(f"{n:>10}{t_old:>13.2f}{t_new:>11.2f}{t_old / t_new:>9.1f}x{m_old:>11.0f}{m_new:>9.0f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('sizes', nargs='*', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--source', default=DEFAULT_SOURCE)
+    args = parser.parse_args()
+    run(args.sizes, args.source)
@@ -0,0 +1,122 @@
+"""
+Ayrıştırılmış Trendyol kataloğu önbelleği.
+
+'Ürünleriniz_*.xlsx' dosyasının openpyxl ile ayrıştırılması dönüştürmenin en pahalı
+adımıdır. Bu modül temizlenmiş katalog DataFrame'ini (başlık bulunmuş, Barkod'u boş
+satırlar ve tekrar eden başlıklar atılmış) dosya içeriğinin özetiyle (hash) saklar;
+aynı dosya tekrar işlendiğinde Excel hiç açılmaz.
+
+- pyarrow kuruluysa katalog Parquet olarak yazılır ve bellek eşlemeli (memory_map)
+  okunur. Parquet'e yazılamayan karışık tipli sütunlar (örn. Beden: 42 ve 'S') ya da
+  pyarrow olmayan ortamlar için pickle kullanılır.
+- Önbellek klasörü max_bytes'ı aşarsa en uzun süredir kullanılmayan girdiler silinir.
+- Anahtar dosyanın adına değil içeriğine bağlıdır; temizleme kuralları değişirse
+  CACHE_VERSION artırılır.
+"""
+import hashlib
+import os
+
+import pandas as pd
+
+from catalog import TRENDYOL_SHEET_NAME, read_trendyol_export
+from profiling import phase
+
+# --- Ayarlar ---
+CACHE_DIR = '.katalog_onbellek'
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+CACHE_VERSION = 3  # clean_trendyol_frame / read_trendyol_export davranışı değişince artırın
+
+PARQUET_SUFFIX = '.parquet'
+PICKLE_SUFFIX = '.pkl'
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# --- Anahtar ---
+
+def cache_key(file_path, sheet_name=TRENDYOL_SHEET_NAME):
+    """Dosya içeriği, sayfa adı ve önbellek sürümünden türetilen anahtar."""
+    with open(file_path, 'rb') as f:
+        digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16))
+    digest.update(f"\0{sheet_name}\0{CACHE_VERSION}".encode('utf-8'))
+    return digest.hexdigest()
+
+# --- Okuma / Yazma ---
+
+def _read_entry(path):
+    if path.endswith(PARQUET_SUFFIX):
+        return pd.read_parquet(path, engine='pyarrow', memory_map=True)
+    return pd.read_pickle(path)
+
+def _write_entry(df, base_path):
+    """Katalogu Parquet (olmazsa pickle) olarak yazar; yazılan dosyanın yolunu döndürür."""
+    if HAS_PYARROW:
+        path = base_path + PARQUET_SUFFIX
+        try:
+            df.to_parquet(f"{path}.tmp", engine='pyarrow')
+            os.replace(f"{path}.tmp", path)
+            return path
+        except (TypeError, ValueError, NotImplementedError):
+            # Karışık tipli object sütunu: pickle'a düş
+            if os.path.exists(f"{path}.tmp"):
+                os.remove(f"{path}.tmp")
+    path = base_path + PICKLE_SUFFIX
+    df.to_pickle(f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+    return path
+
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """
+    Toplam boyut max_bytes'ın altına inene kadar en eski (son kullanımı en eski)
+    girdileri siler. En yeni girdi her zaman korunur. Silinen dosya sayısını döndürür.
+    """
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith((PARQUET_SUFFIX, PICKLE_SUFFIX)):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    entries.sort()
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries[:-1]:
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        removed += 1
+    return removed
+
+def read_trendyol_export_cached(file_path, sheet_name=TRENDYOL_SHEET_NAME,
+                                cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """
+    read_trendyol_export'un önbellekli sürümü. Aynı içerikli dosya daha önce
+    okunduysa katalog önbellekten döner, değilse okunup önbelleğe yazılır.
+    """
+    key = cache_key(file_path, sheet_name)
+    base_path = os.path.join(cache_dir, key)
+
+    for suffix in (PARQUET_SUFFIX, PICKLE_SUFFIX):
+        path = base_path + suffix
+        if not os.path.exists(path) or (suffix == PARQUET_SUFFIX and not HAS_PYARROW):
+            continue
+        try:
+            with phase('read.cache') as p:
+                df = _read_entry(path)
+                p['rows'] = len(df)
+        except Exception:
+            # Bozuk ya da uyumsuz girdi: sil ve dosyadan yeniden oku
+            os.remove(path)
+            break
+        os.utime(path)  # Son kullanım zamanı (eviction sırası)
+        return df
+
+    df = read_trendyol_export(file_path, sheet_name)
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_entry(df, base_path)
+    evict(cache_dir, max_bytes)
+    return df
@@ -0,0 +1,347 @@
+from array import array
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from pandas.io.parsers import TextParser
+
+from profiling import phase
+
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+# --- Ayarlar ---
+TRENDYOL_SHEET_NAME = 'Ürünler'  # Trendyol dışa aktarımındaki ürün sayfası
+HEADER_MARKERS = ('Barkod', 'Model Kodu')  # Başlık satırında bulunması gereken sütunlar
+HEADER_SCAN_ROWS = 50  # Başlık satırı en fazla bu kadar satır içinde aranır
+CHUNK_ROWS = 10_000  # Okunan tekil değerler bu kadar satırda bir paketlenir
+# Okuma motoru: 'calamine' (python-calamine, Rust), 'openpyxl' ya da None (kuruluysa calamine)
+READER_ENGINE = None
+READER_ENGINES = ('calamine', 'openpyxl')
+
+# Az sayıda farklı değer alan sütunlar kategori (category) tipinde tutulur
+CATEGORY_COLUMNS = ('Marka', 'Kategori İsmi', 'Ürün Rengi', 'Beden', 'KDV Oranı')
+CATEGORY_MAX_RATIO = 0.5  # Tekil değer sayısı satır sayısının bu oranını aşarsa çevrilmez
+# Uzun ve sık tekrar eden metinler de kategoriyle tekilleştirilir (her metin bir kez tutulur)
+INTERN_COLUMNS = ('Ürün Açıklaması',)
+INTERN_MAX_RATIO = 0.9
+# Araya karışan başlık satırları yüzünden metin okunabilen sayısal sütunlar
+NUMERIC_COLUMNS = ('Piyasa Satış Fiyatı (KDV Dahil)', "Trendyol'da Satılacak Fiyat (KDV Dahil)",
+                   'Ürün Stok Adedi', 'KDV Oranı', 'Desi')
+
+# --- Yardımcı Fonksiyonlar ---
+
+def _convert_cell(cell):
+    """
+    Hücre değerini pd.read_excel (openpyxl motoru) ile aynı şekilde dönüştürür:
+    boş hücre '' olur, tam sayı değerli sayılar int'e çevrilir.
+    """
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    if cell.value is None:
+        return ''
+    elif cell.data_type == TYPE_ERROR:
+        return float('nan')
+    elif cell.data_type == TYPE_NUMERIC:
+        val = int(cell.value)
+        if val == cell.value:
+            return val
+        return float(cell.value)
+    return cell.value
+
+def _convert_calamine_value(value):
+    """
+    calamine değerini _convert_cell ile aynı tipe getirir: tam sayı değerli float int
+    olur, saatsiz tarih (date) openpyxl'deki gibi datetime olur. Hata hücrelerini
+    calamine '' (boş) olarak verir; openpyxl'de NaN'dır, ikisi de boş değer sayılır.
+    """
+    if type(value) is float:
+        val = int(value)
+        if val == value:
+            return val
+    elif type(value) is date:
+        return datetime(value.year, value.month, value.day)
+    return value
+
+def select_engine(engine=None):
+    """Kullanılacak okuma motoru: engine, yoksa READER_ENGINE, o da yoksa kuruluysa calamine."""
+    engine = engine or READER_ENGINE or ('calamine' if HAS_CALAMINE else 'openpyxl')
+    if engine not in READER_ENGINES:
+        raise ValueError(f"Bilinmeyen okuma motoru: {engine} (seçenekler: {', '.join(READER_ENGINES)})")
+    if engine == 'calamine' and not HAS_CALAMINE:
+        raise ImportError("'calamine' motoru için python-calamine kurulu değil (pip install python-calamine)")
+    return engine
+
+def _openpyxl_rows(file_path, sheet_name):
+    """Sayfa satırlarını salt-okunur (streaming) openpyxl ile dönüştürülmüş değer listeleri olarak verir."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        if sheet_name not in wb.sheetnames:
+            raise ValueError(f"'{sheet_name}' isimli sayfa dosyada bulunamadı: {file_path}")
+        sheet = wb[sheet_name]
+        sheet.reset_dimensions()  # Trendyol dosyalarında boyut bilgisi hatalı (A1) geliyor
+        for row in sheet.rows:
+            yield [_convert_cell(cell) for cell in row]
+    finally:
+        wb.close()
+
+def _calamine_rows(file_path, sheet_name):
+    """
+    Sayfa satırlarını python-calamine ile verir. calamine sayfayı tek seferde (Rust
+    tarafında) ayrıştırır; satırlar Python'a tek tek aktarılır.
+    """
+    from python_calamine import CalamineWorkbook
+
+    wb = CalamineWorkbook.from_path(file_path)
+    try:
+        if sheet_name not in wb.sheet_names:
+            raise ValueError(f"'{sheet_name}' isimli sayfa dosyada bulunamadı: {file_path}")
+        sheet = wb.get_sheet_by_name(sheet_name)
+        if sheet.start is None:  # Boş sayfa
+            return
+        # iter_rows satırları ilk satırdan, sütunları ise ilk dolu sütundan başlatır
+        lead = [''] * sheet.start[1]
+        for row in sheet.iter_rows():
+            yield lead + [_convert_calamine_value(v) for v in row]
+    finally:
+        wb.close()
+
+def iter_sheet_rows(file_path, sheet_name, engine=None):
+    """
+    Sayfa satırlarını seçilen motorla (bkz. select_engine) pd.read_excel'in openpyxl
+    motoruyla aynı değer ve tiplerde verir: boş hücre '', tam sayı değerli sayılar int.
+    """
+    if select_engine(engine) == 'calamine':
+        return _calamine_rows(file_path, sheet_name)
+    return _openpyxl_rows(file_path, sheet_name)
+
+def _is_header_row(row, markers):
+    row_str = [str(v) for v in row]
+    return all(m in row_str for m in markers)
+
+def find_header_row(rows, markers=HEADER_MARKERS, max_rows=HEADER_SCAN_ROWS):
+    """Başlık satırının indeksini döndürür, ilk max_rows satırda bulunamazsa -1."""
+    for i, row in enumerate(rows):
+        if i >= max_rows:
+            break
+        if _is_header_row(row, markers):
+            return i
+    return -1
+
+def _pack_values(values):
+    """
+    Yalnızca metin içeren listeyi tek UTF-8 bayt dizisi ve bitiş konumlarına paketler
+    (Python str nesneleri bellekte tutulmaz); başka tip içeren liste olduğu gibi kalır.
+    """
+    if not all(type(v) is str for v in values):
+        return values
+    encoded = [v.encode('utf-8', 'surrogatepass') for v in values]
+    return b''.join(encoded), np.cumsum([len(e) for e in encoded], dtype=np.int64)
+
+def _unpack_values(packed):
+    if not isinstance(packed, tuple):
+        return packed
+    blob, ends = packed
+    starts = np.concatenate(([0], ends[:-1]))
+    return [blob[a:b].decode('utf-8', 'surrogatepass') for a, b in zip(starts.tolist(), ends.tolist())]
+
+def read_sheet_columns(file_path, sheet_name, markers=HEADER_MARKERS, max_rows=HEADER_SCAN_ROWS,
+                       chunk_rows=CHUNK_ROWS, engine=None):
+    """
+    Sayfayı tek geçişte okur; başlık satırından sonraki hücreleri satır listesi kurmadan
+    sütun sütun sözlük kodlamasıyla saklar: her sütun için tekil değerler ve satır başına
+    int32 kod. Tekrar eden metinler (açıklama, marka, kategori ...) bir kez tutulur.
+    Tekil değerler chunk_rows satırda bir _pack_values ile paketlenir; tekilleştirme
+    parça içindedir, farklı parçalarda aynı değer yeniden saklanabilir.
+    (başlık indeksi, genişlik, başlık satırı, [(kodlar, paketler)]) döndürür; başlık ilk
+    max_rows satırda yoksa başlık indeksi -1 olur.
+    Sondaki boş hücreler/satırlar pd.read_excel'deki gibi kırpılır; kısa satırlar ''
+    ile tamamlanır (her sütunda kod 0 '' değeridir, paketlerde yer almaz).
+    Satırlar iter_sheet_rows ile engine motorundan okunur.
+    """
+    rows = iter_sheet_rows(file_path, sheet_name, engine)
+    try:
+        header_idx, header, width = -1, [], 0
+        # Sütun başına: bu parçadaki {değer: kod}, parçada yeni görülen değerler,
+        # önceki parçaların paketleri, önceki parçalardaki değer sayısı ('' dahil) ve kod dizisi
+        lookups, pending, packed, counts, codes = [], [], [], [], []
+        n_rows = n_kept = 0  # başlıktan sonraki satırlar / son dolu satıra kadar olanlar
+
+        def flush():
+            for i in range(len(lookups)):
+                if pending[i]:
+                    packed[i].append(_pack_values(pending[i]))
+                    counts[i] += len(pending[i])
+                lookups[i], pending[i] = {'': 0}, []
+
+        for row_number, values in enumerate(rows):
+            while values and values[-1] == '':
+                values.pop()
+            if header_idx == -1:
+                width = max(width, len(values))
+                if _is_header_row(values, markers):
+                    header_idx, header = row_number, values
+                elif row_number + 1 >= max_rows:
+                    break
+                continue
+
+            for _ in range(len(lookups), len(values)):
+                lookups.append({'': 0})
+                pending.append([])
+                packed.append([])
+                counts.append(1)
+                codes.append(array('i', bytes(4 * n_rows)))
+            for i, value in enumerate(values):
+                # 1, 1.0 ve True eşit sayılmasın diye sayılar tipleriyle anahtarlanır
+                key = value if type(value) is str else (type(value), value)
+                code = lookups[i].get(key)
+                if code is None:
+                    code = lookups[i][key] = counts[i] + len(pending[i])
+                    pending[i].append(value)
+                codes[i].append(code)
+            for i in range(len(values), len(lookups)):
+                codes[i].append(0)
+            n_rows += 1
+            if values:
+                n_kept = n_rows
+            if n_rows % chunk_rows == 0:
+                flush()
+        flush()
+    finally:
+        rows.close()
+
+    for column_codes in codes:
+        del column_codes[n_kept:]
+    return header_idx, max(width, len(codes)), header, list(zip(codes, packed))
+
+def _decode_column(column_codes, packed):
+    """
+    Tekil değerlerin tipini TextParser ile (tüm sütun okunuyormuş gibi) çıkarır ve
+    kodlarla satırlara dağıtır. Tip çıkarımı yalnızca hangi değerlerin bulunduğuna
+    bağlı olduğundan sonuç tüm satırlar üzerinden yapılan çıkarımla aynıdır.
+    """
+    codes = np.frombuffer(column_codes, dtype=np.int32)
+    uniques = ['']
+    for chunk in packed:
+        uniques += _unpack_values(chunk)
+    if not (codes == 0).any():
+        # Hiç boş hücre yoksa '' tip çıkarımına katılmamalı (int sütun float olmasın)
+        uniques, codes = uniques[1:], codes - 1
+    parser = TextParser([[u] for u in uniques], header=None, skip_blank_lines=False)
+    typed = parser.read()[0]
+    parser.close()
+    return typed.array.take(codes)
+
+def locate_header(file_path, sheet_name=TRENDYOL_SHEET_NAME, markers=HEADER_MARKERS, max_rows=HEADER_SCAN_ROWS):
+    """
+    Çalışma kitabını salt-okunur (streaming) modda açar ve yalnızca ilk max_rows
+    satırı tarayarak (başlık indeksi, {sütun adı: sütun sırası}) döndürür.
+    Sayfanın geri kalanı okunmaz; başlık bulunamazsa (-1, {}) döner. calamine sayfayı
+    tümüyle ayrıştırdığı için bu yoklama her zaman openpyxl ile yapılır.
+    """
+    from openpyxl import load_workbook
+
+    with phase('header_probe'):
+        wb = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            if sheet_name not in wb.sheetnames:
+                raise ValueError(f"'{sheet_name}' isimli sayfa dosyada bulunamadı: {file_path}")
+            sheet = wb[sheet_name]
+            sheet.reset_dimensions()
+            rows = (['' if v is None else v for v in row]
+                    for row in sheet.iter_rows(max_row=max_rows, values_only=True))
+            for i, row in enumerate(rows):
+                row_str = [str(v) for v in row]
+                if all(m in row_str for m in markers):
+                    column_map = {name: pos for pos, name in enumerate(row_str) if name != ''}
+                    return i, column_map
+        finally:
+            wb.close()
+    return -1, {}
+
+def clean_trendyol_frame(df):
+    """
+    Barkodu olmayan satırları, tekrar eden başlık satırlarını ve tamamen boş satırları atar.
+    Tüm koşullar tek maskede birleştirilir; DataFrame en fazla bir kez kopyalanır.
+    """
+    keep = df['Barkod'].notna().to_numpy(dtype=bool, copy=True)
+    if 'Partner ID' in df.columns:
+        keep &= ~df['Partner ID'].astype(str).str.contains('Partner ID', na=False).to_numpy(dtype=bool)
+    keep &= df.notna().any(axis=1).to_numpy()
+    return df if keep.all() else df[keep]
+
+def dense_column(s):
+    """Kategori sütununu okumadaki asıl tipine (str, int64, float64, object) geri çevirir."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.astype(s.cat.categories.dtype)
+    return s
+
+def compact_catalog(df):
+    """
+    Kataloğu daha az bellek kullanan tiplere çevirir:
+    - NUMERIC_COLUMNS metin okunmuşsa (temizlenen başlık satırları yüzünden) ve tüm
+      değerleri sayıysa sayısal tipe,
+    - CATEGORY_COLUMNS az sayıda farklı değer alıyorsa, INTERN_COLUMNS (açıklama)
+      satırların en az onda birinde tekrar ediyorsa category tipine.
+    Kategori sütunları dense_column ile birebir eski tiplerine döner; dönüştürücüler
+    sütunlara mapping.source_column üzerinden eriştiği için çıktılar değişmez.
+    pyarrow kuruluysa pandas metin sütunlarını zaten Arrow belleğinde tutar.
+    """
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns and not is_numeric_dtype(df[col].dtype):
+            numeric = pd.to_numeric(df[col], errors='coerce')
+            if numeric.isna().sum() == df[col].isna().sum():
+                df[col] = numeric
+    for columns, ratio in ((CATEGORY_COLUMNS, CATEGORY_MAX_RATIO), (INTERN_COLUMNS, INTERN_MAX_RATIO)):
+        for col in columns:
+            if col in df.columns and df[col].nunique() <= max(1, len(df) * ratio):
+                df[col] = df[col].astype('category')
+    return df
+
+# --- Ana Okuma ---
+
+def read_trendyol_export(file_path, sheet_name=TRENDYOL_SHEET_NAME, engine=None):
+    """
+    Trendyol 'Ürünleriniz_*.xlsx' dosyasını tek seferde okur ve temizlenmiş katalog
+    DataFrame'ini döndürür. Başlık satırı aynı okumadan bulunur; dosya ikinci kez
+    açılmaz. Değerler pd.read_excel(header=...) ile birebir aynıdır; sütunlar ardından
+    compact_catalog ile sıkıştırılır (kategori ve sayısal tipler).
+    Başlık satırının indeksi df.attrs['header_row']'da saklanır; satır indeksi i olan
+    ürün dosyanın (1'den başlayan) i + header_row + 2. satırındadır.
+    engine okuma motorudur (bkz. select_engine); iki motorun sonucu aynıdır.
+    """
+    with phase('read') as p:
+        with phase('read.rows') as q:
+            header_idx, width, header, columns = read_sheet_columns(file_path, sheet_name, engine=engine)
+            q['rows'] = len(columns[0][0]) if columns else 0
+        if header_idx == -1:
+            raise ValueError("Trendyol dosyasında başlık satırı ('Barkod', 'Model Kodu') bulunamadı.")
+
+        with phase('read.parse', rows=q['rows']):
+            # Sütun adları (tekrar eden ve boş adlar) TextParser'daki gibi üretilir
+            parser = TextParser([header + [''] * (width - len(header))], header=0, skip_blank_lines=False)
+            df = parser.read()
+            parser.close()
+            if q['rows']:
+                # Başlıkta olup hiç verisi olmayan sütunlar tamamen boştur
+                columns += [(array('i', bytes(4 * q['rows'])), [])] * (width - len(columns))
+                decoded = {}
+                for pos, name in enumerate(df.columns):
+                    decoded[name] = _decode_column(*columns[pos])
+                    columns[pos] = None  # Paketler sütun açılır açılmaz bırakılır
+                df = pd.DataFrame(decoded, columns=df.columns)
+                del decoded
+            del columns  # Kodlar temizleme ve sıkıştırma sırasında bellekte kalmasın
+        with phase('read.clean', rows=len(df)):
+            df = clean_trendyol_frame(df)
+        with phase('read.compact', rows=len(df)):
+            df = compact_catalog(df)
+        df.attrs['header_row'] = header_idx
+        p['rows'] = len(df)
+    return df
@@ -1,6 +1,14 @@
 import pandas as pd
-import re
 import os
+from functools import partial
+
+from catalog import read_trendyol_export
+from kernels import strip_text, unique_skus, variant_group_ids
+from mapping import apply_spec, source_column
+from profiling import enable_from_argv, phase
+from sharding import write_shards
+from templates import hepsiburada_template
+from xlsx_writer import write_frames
 
 # --- Configuration ---
 trendyol_file = 'Ürünleriniz_10.12.2025-19.47.xlsx' # Input Excel file
@@ -10,189 +18,141 @@ hepsiburada_template_file = '3D-Baski-Parcalar.xlsx' # Template Excel file
 hepsiburada_sheet_name = '3D Baskı Parçalar' # Sheet name for Hepsiburada template
 
 output_file = 'hepsiburada_urunler_unique_skus.xlsx' # Output Excel file
+max_rows_per_file = None # Max data rows per file; if set, the output is split into shards (see sharding.py)
 
 # --- Functions ---
 
-def generate_variant_group_id(model_kodu):
+def _hb_brand(df):
+    """Stripped brand, with the Trendyol spelling 'hivhestın' normalized to 'Hivhestin'."""
+    brand = strip_text(source_column(df, 'Marka'))
+    return brand.where(brand.str.lower() != 'hivhestın', 'Hivhestin')
+
+def _hb_product_name(df):
+    """Brand prepended to the product name."""
+    product_name_tr = strip_text(source_column(df, 'Ürün Adı'))
+    return (_hb_brand(df) + ' ' + product_name_tr).str.strip()
+
+def _hb_unique_skus(df):
+    return unique_skus(strip_text(source_column(df, 'Model Kodu')))
+
+def _hb_variant_group_ids(df):
+    # Based on the ORIGINAL Model Kodu
+    return variant_group_ids(source_column(df, 'Model Kodu'))
+
+# Hepsiburada column -> mapping rule (see mapping.py for the rule kinds)
+hepsiburada_spec = {
+    'Ürün Adı': _hb_product_name,
+    'Satıcı Stok Kodu': _hb_unique_skus,
+    'Barkod': ('strip', 'Barkod'),
+    'Varyant Grup Id': _hb_variant_group_ids,
+    'Ürün Açıklaması': ('oneline', 'Ürün Açıklaması'), # Handle potential multi-line descriptions
+    'Marka': _hb_brand,
+    'Desi': ('number', 'Desi'),
+    'KDV': ('int_or_empty', 'KDV Oranı'),
+    'Garanti Süresi (Ay)': ('const', 0),
+    **{f'Görsel{i}': ('strip', f'Görsel {i}') for i in range(1, 9)},
+    'Fiyat': ('number', "Trendyol'da Satılacak Fiyat (KDV Dahil)"),
+    'Stok': ('int_or_empty', 'Ürün Stok Adedi'),
+    'Renk': ('strip', 'Ürün Rengi'),
+    'Beden': ('strip', 'Beden'),
+    'Seçenek': ('strip', 'Boyut/Ebat'),
+    'Malzeme': ('const', 'PLA'),
+    'Kullanım Amacı': ('strip', 'Kategori İsmi'),
+}
+
+def map_data(trendyol_df, hepsiburada_cols, sku_registry=None):
     """
-    Generates a Variant Grup Id based on the Model Kodu.
-    Removes common suffixes like '-1', '-2', etc.
-    Returns empty string if input is NaN.
+    Maps data from Trendyol DataFrame to Hepsiburada format, ensuring unique SKUs.
+    If sku_registry (SkuRegistry) is given, SKU suffixes are taken from the registry.
     """
-    if pd.isna(model_kodu):
-        return ''
-    base_id = re.sub(r'-\w+$', '', str(model_kodu))
-    return base_id if base_id else ''
-
-def make_sku_unique(sku, sku_counts):
+    with phase('hepsiburada.map', rows=len(trendyol_df)):
+        df_output = apply_spec(trendyol_df, hepsiburada_spec, hepsiburada_cols)
+        if sku_registry is not None:
+            model_kodu = strip_text(source_column(trendyol_df, 'Model Kodu')).reset_index(drop=True)
+            df_output['Satıcı Stok Kodu'] = sku_registry.assign('hepsiburada', df_output['Barkod'], model_kodu)
+
+    with phase('hepsiburada.dtype_fixup', rows=len(df_output)):
+        # Convert potential numeric columns back to object type if they contain empty strings
+        for col in ['Desi', 'KDV', 'Fiyat', 'Stok']:
+             # Check if the column exists and handle potential errors
+             if col in df_output.columns:
+                # Convert to string, check for empty string, then convert back to object if needed
+                is_object = False
+                try:
+                    if '' in df_output[col].astype(str).unique():
+                        is_object = True
+                except Exception: # Handle cases where conversion fails (e.g., all values are None)
+                    pass
+                if is_object:
+                    df_output[col] = df_output[col].astype(object)
+
+        return df_output.fillna('') # Final catch-all for any remaining NaNs
+
+def read_hepsiburada_template(template_file, sheet_name):
     """
-    Checks if SKU exists in counts. If yes, increments count and appends suffix.
-    Updates the count dictionary.
-    Returns the unique SKU.
+    Returns (column list, first two banner rows) of the Hepsiburada template.
+    The template is parsed once and reused until the file changes (see templates.py).
     """
-    original_sku = str(sku).strip() if pd.notna(sku) else ''
-    if not original_sku: # Handle empty SKUs if necessary
-        return ''
+    with phase('hepsiburada.template'):
+        return hepsiburada_template(template_file, sheet_name)
 
-    if original_sku in sku_counts:
-        sku_counts[original_sku] += 1
-        unique_sku = f"{original_sku}-{sku_counts[original_sku]-1}" # Start suffix from -1
-    else:
-        sku_counts[original_sku] = 1
-        unique_sku = original_sku # First occurrence keeps original SKU
-
-    return unique_sku
-
-
-def map_data(trendyol_df, hepsiburada_cols):
-    """Maps data from Trendyol DataFrame to Hepsiburada format, ensuring unique SKUs."""
-    hepsiburada_data = []
-    sku_counts = {} # Dictionary to track SKU occurrences
-
-    for index, row in trendyol_df.iterrows():
-        # Handle potential multi-line descriptions
-        description = str(row.get('Ürün Açıklaması', '')).replace('\n', ' ').replace('\r', '') if pd.notna(row.get('Ürün Açıklaması')) else ''
-
-        # Prepend brand to product name
-        brand = str(row.get('Marka', '')).strip() if pd.notna(row.get('Marka')) else ''
-        if brand.lower() == 'hivhestın':
-            brand = 'Hivhestin'
-        product_name_tr = str(row.get('Ürün Adı', '')).strip() if pd.notna(row.get('Ürün Adı')) else ''
-        product_name_hb = f"{brand} {product_name_tr}".strip() if brand or product_name_tr else ''
-
-        # Get original Model Kodu (source for SKU)
-        original_model_kodu = row.get('Model Kodu')
-
-        # Generate UNIQUE Satıcı Stok Kodu
-        satıcı_stok_kodu = make_sku_unique(original_model_kodu, sku_counts)
-
-        # Generate Variant Group ID based on ORIGINAL Model Kodu
-        variant_group_id = generate_variant_group_id(original_model_kodu)
-
-        # Create the data dictionary for the Hepsiburada row
-        hb_row = {col: '' for col in hepsiburada_cols} # Initialize ALL with empty strings
-
-        hb_row['Ürün Adı'] = product_name_hb
-        hb_row['Satıcı Stok Kodu'] = satıcı_stok_kodu # Use the unique SKU
-        hb_row['Barkod'] = str(row.get('Barkod', '')).strip() if pd.notna(row.get('Barkod')) else ''
-        hb_row['Varyant Grup Id'] = variant_group_id
-        hb_row['Ürün Açıklaması'] = description
-        hb_row['Marka'] = brand
-        desi_val = pd.to_numeric(row.get('Desi'), errors='coerce')
-        hb_row['Desi'] = '' if pd.isna(desi_val) else desi_val
-        kdv_val = pd.to_numeric(row.get('KDV Oranı'), errors='coerce')
-        hb_row['KDV'] = '' if pd.isna(kdv_val) else int(kdv_val)
-        hb_row['Garanti Süresi (Ay)'] = 0
-        hb_row['Görsel1'] = str(row.get('Görsel 1', '')).strip() if pd.notna(row.get('Görsel 1')) else ''
-        hb_row['Görsel2'] = str(row.get('Görsel 2', '')).strip() if pd.notna(row.get('Görsel 2')) else ''
-        hb_row['Görsel3'] = str(row.get('Görsel 3', '')).strip() if pd.notna(row.get('Görsel 3')) else ''
-        hb_row['Görsel4'] = str(row.get('Görsel 4', '')).strip() if pd.notna(row.get('Görsel 4')) else ''
-        hb_row['Görsel5'] = str(row.get('Görsel 5', '')).strip() if pd.notna(row.get('Görsel 5')) else ''
-        hb_row['Görsel6'] = str(row.get('Görsel 6', '')).strip() if pd.notna(row.get('Görsel 6')) else ''
-        hb_row['Görsel7'] = str(row.get('Görsel 7', '')).strip() if pd.notna(row.get('Görsel 7')) else ''
-        hb_row['Görsel8'] = str(row.get('Görsel 8', '')).strip() if pd.notna(row.get('Görsel 8')) else ''
-        fiyat_val = pd.to_numeric(row.get("Trendyol'da Satılacak Fiyat (KDV Dahil)"), errors='coerce')
-        hb_row['Fiyat'] = '' if pd.isna(fiyat_val) else fiyat_val
-        stok_val = pd.to_numeric(row.get('Ürün Stok Adedi'), errors='coerce')
-        hb_row['Stok'] = '' if pd.isna(stok_val) else int(stok_val)
-
-        hb_row['Renk'] = str(row.get('Ürün Rengi', '')).strip() if pd.notna(row.get('Ürün Rengi')) else ''
-        hb_row['Beden'] = str(row.get('Beden', '')).strip() if pd.notna(row.get('Beden')) else ''
-        hb_row['Seçenek'] = str(row.get('Boyut/Ebat', '')).strip() if pd.notna(row.get('Boyut/Ebat')) else ''
-
-        # Add default/inferred values
-        if 'pla ' in description.lower() or '(pla)' in description.lower() or 'pla(' in description.lower():
-             hb_row['Malzeme'] = 'PLA'
-        else:
-             hb_row['Malzeme'] = 'PLA'
-
-        kategori = str(row.get('Kategori İsmi', '')).strip() if pd.notna(row.get('Kategori İsmi')) else ''
-        if kategori:
-            hb_row['Kullanım Amacı'] = kategori
-
-        hepsiburada_data.append(hb_row)
-
-    df_output = pd.DataFrame(hepsiburada_data)
-    # Convert potential numeric columns back to object type if they contain empty strings
-    for col in ['Desi', 'KDV', 'Fiyat', 'Stok']:
-         # Check if the column exists and handle potential errors
-         if col in df_output.columns:
-            # Convert to string, check for empty string, then convert back to object if needed
-            is_object = False
-            try:
-                if '' in df_output[col].astype(str).unique():
-                    is_object = True
-            except Exception: # Handle cases where conversion fails (e.g., all values are None)
-                pass
-            if is_object:
-                df_output[col] = df_output[col].astype(object)
+def _write_hepsiburada_shard(header_rows_hb, sheet_name, hepsiburada_df, output_file):
+    write_hepsiburada(hepsiburada_df, header_rows_hb, output_file, sheet_name)
 
-    return df_output.fillna('') # Final catch-all for any remaining NaNs
+def write_hepsiburada(hepsiburada_df, header_rows_hb, output_file, sheet_name=hepsiburada_sheet_name, max_rows=None):
+    """
+    Writes the template banner rows followed by the mapped data.
+    If max_rows is given, the data is split into shards that keep each Varyant Grup Id
+    together, every shard with its own banner rows; the shard manifest path is returned.
+    """
+    if max_rows:
+        return write_shards(hepsiburada_df, output_file, partial(_write_hepsiburada_shard, header_rows_hb, sheet_name),
+                            'Varyant Grup Id', max_rows)
+    # Streamed in write-only mode: banner rows first, then the header row and the data
+    with phase('hepsiburada.write', rows=len(hepsiburada_df)):
+        write_frames(output_file, sheet_name, [(header_rows_hb, False), (hepsiburada_df, True)])
+    return output_file
 
 # --- Main Execution ---
 
-# Check if input files exist
-if not os.path.exists(trendyol_file):
-    print(f"Hata: Trendyol dosyası bulunamadı: {trendyol_file}")
-elif not os.path.exists(hepsiburada_template_file):
-    print(f"Hata: Hepsiburada şablon dosyası bulunamadı: {hepsiburada_template_file}")
-else:
-    try:
-        # Read Trendyol data from Excel sheet
-        excel_file_tr = pd.ExcelFile(trendyol_file)
-        if trendyol_sheet_name not in excel_file_tr.sheet_names:
-             raise ValueError(f"'{trendyol_sheet_name}' isimli sayfa Trendyol dosyasında bulunamadı.")
-
-        df_tr_check = pd.read_excel(trendyol_file, sheet_name=trendyol_sheet_name, header=None)
-        header_row_index_tr = -1
-        for i, row in df_tr_check.iterrows():
-            if any(col_name in row.astype(str).tolist() for col_name in ['Partner ID', 'Barkod', 'Model Kodu']):
-                header_row_index_tr = i
-                break
-        if header_row_index_tr == -1:
-             raise ValueError("Trendyol dosyasında başlık satırı ('Partner ID', 'Barkod' vb.) bulunamadı.")
-
-        trendyol_df = pd.read_excel(trendyol_file, sheet_name=trendyol_sheet_name, header=header_row_index_tr)
-
-        # Drop rows that might be header remnants or fully empty
-        trendyol_df = trendyol_df.dropna(subset=['Barkod'])
-        trendyol_df = trendyol_df[trendyol_df['Partner ID'].astype(str).str.contains('Partner ID', na=False) == False]
-        trendyol_df = trendyol_df.dropna(how='all')
-
-
-        # Read Hepsiburada template columns from Excel sheet
-        excel_file_hb = pd.ExcelFile(hepsiburada_template_file)
-        if hepsiburada_sheet_name not in excel_file_hb.sheet_names:
-             raise ValueError(f"'{hepsiburada_sheet_name}' isimli sayfa Hepsiburada şablon dosyasında bulunamadı.")
-
-        hb_cols_df = pd.read_excel(hepsiburada_template_file, sheet_name=hepsiburada_sheet_name, header=2, nrows=0)
-        hepsiburada_cols = hb_cols_df.columns.tolist()
-
-        # Read the first two header rows from the template
-        header_rows_hb = pd.read_excel(hepsiburada_template_file, sheet_name=hepsiburada_sheet_name, header=None, nrows=2).fillna('')
-
-
-        # Map the data, ensuring unique SKUs
-        hepsiburada_df = map_data(trendyol_df, hepsiburada_cols)
-
-        # --- Generate Output Excel ---
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            header_rows_hb.to_excel(writer, sheet_name=hepsiburada_sheet_name, index=False, header=False, startrow=0)
-            hepsiburada_df.to_excel(writer, sheet_name=hepsiburada_sheet_name, index=False, header=True, startrow=2)
-
-        print(f"Dönüştürme tamamlandı. Tekrarlanan Satıcı Stok Kodları'na '-1', '-2' vb. eklenmiştir. Dosya '{output_file}' olarak kaydedildi.")
-        # Provide file download tag (specific to Google Colab)
+def main():
+    # Check if input files exist
+    if not os.path.exists(trendyol_file):
+        print(f"Hata: Trendyol dosyası bulunamadı: {trendyol_file}")
+    elif not os.path.exists(hepsiburada_template_file):
+        print(f"Hata: Hepsiburada şablon dosyası bulunamadı: {hepsiburada_template_file}")
+    else:
         try:
-            from google.colab import files
-            files.download(output_file)
-        except ImportError:
-            print(f"'{output_file}' dosyası geçerli dizine kaydedildi. Google Colab ortamında değilseniz manuel olarak alın.")
-
-
-    except FileNotFoundError as fnf_error:
-        print(f"Dosya bulunamadı hatası: {fnf_error}")
-    except ValueError as val_error:
-        print(f"Değer hatası: {val_error}")
-    except Exception as e:
-        print(f"Beklenmeyen bir hata oluştu: {e}")
-        print("Lütfen dosya yollarının, sayfa adlarının ve formatlarının doğru olduğundan emin olun.")
\ No newline at end of file
+            # Read Trendyol data (header row detection and cleanup happen in a single pass)
+            trendyol_df = read_trendyol_export(trendyol_file, trendyol_sheet_name)
+
+            # Read Hepsiburada template columns and banner rows
+            hepsiburada_cols, header_rows_hb = read_hepsiburada_template(hepsiburada_template_file, hepsiburada_sheet_name)
+
+            # Map the data, ensuring unique SKUs
+            hepsiburada_df = map_data(trendyol_df, hepsiburada_cols)
+
+            # --- Generate Output Excel ---
+            written = write_hepsiburada(hepsiburada_df, header_rows_hb, output_file, hepsiburada_sheet_name,
+                                        max_rows_per_file)
+
+            print(f"Dönüştürme tamamlandı. Tekrarlanan Satıcı Stok Kodları'na '-1', '-2' vb. eklenmiştir. Dosya '{written}' olarak kaydedildi.")
+            # Provide file download tag (specific to Google Colab)
+            try:
+                from google.colab import files
+                files.download(written)
+            except ImportError:
+                print(f"'{written}' dosyası geçerli dizine kaydedildi. Google Colab ortamında değilseniz manuel olarak alın.")
+
+
+        except FileNotFoundError as fnf_error:
+            print(f"Dosya bulunamadı hatası: {fnf_error}")
+        except ValueError as val_error:
+            print(f"Değer hatası: {val_error}")
+        except Exception as e:
+            print(f"Beklenmeyen bir hata oluştu: {e}")
+            print("Lütfen dosya yollarının, sayfa adlarının ve formatlarının doğru olduğundan emin olun.")
+
+if __name__ == '__main__':
+    enable_from_argv()
+    main()
@@ -0,0 +1,133 @@
+"""
+Artımlı (delta) dışa aktarım.
+
+Güncel Trendyol kataloğunu son işlenen anlık görüntüyle (snapshot) barkod üzerinden
+karşılaştırır. Her satır için pazaryerlerinin kullandığı sütunlardan iki özet (hash)
+çıkarılır: ürün içeriği ve fiyat/stok. Barkod anahtarlı birleştirme (hash join) ile
+satırlar yeni, içeriği değişen, yalnızca fiyatı/stoğu değişen ve silinen olarak ayrılır.
+
+Anlık görüntü, işlenen katalog DataFrame'inin pickle dosyasıdır; karşılaştırma için
+doğrudan eski bir 'Ürünleriniz_*.xlsx' dosyası da verilebilir.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype
+
+from catalog import dense_column, read_trendyol_export
+from kernels import strip_text
+
+# --- Karşılaştırılan Sütunlar ---
+
+PRICE_STOCK_COLUMNS = [
+    'Piyasa Satış Fiyatı (KDV Dahil)',
+    "Trendyol'da Satılacak Fiyat (KDV Dahil)",
+    'Ürün Stok Adedi',
+]
+
+# Dönüştürücülerin okuduğu diğer sütunlar (Durum, BuyBox vb. değişimleri yükleme gerektirmez)
+CONTENT_COLUMNS = [
+    'Model Kodu', 'Ürün Rengi', 'Beden', 'Boyut/Ebat', 'Marka', 'Kategori İsmi',
+    'Ürün Adı', 'Ürün Açıklaması', 'KDV Oranı', 'Desi',
+    'Görsel 1', 'Görsel 2', 'Görsel 3', 'Görsel 4', 'Görsel 5', 'Görsel 6', 'Görsel 7', 'Görsel 8',
+    'Parti/Lot/SKT Bilgisi',
+]
+
+NUMERIC_COLUMNS = set(PRICE_STOCK_COLUMNS) | {'KDV Oranı', 'Desi'}
+
+# --- Anlık Görüntü ---
+
+def load_snapshot(path):
+    """Pickle anlık görüntüsünü ya da eski bir Trendyol dışa aktarımını okur."""
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        return read_trendyol_export(path)
+    return pd.read_pickle(path)
+
+def save_snapshot(catalog_df, path):
+    tmp_path = f"{path}.tmp"
+    catalog_df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)  # Yarım kalan yazma eski görüntüyü bozmasın
+
+# --- Özetler ---
+
+def _canonical(s, column):
+    """
+    Dosyadan dosyaya değişebilen sütun tiplerinden (int64/float64/object) bağımsız,
+    karşılaştırılabilir değer: sayısal alanlar float, diğerleri kırpılmış metin.
+    """
+    s = dense_column(s)
+    if column in NUMERIC_COLUMNS:
+        return pd.to_numeric(s, errors='coerce').astype('float64')
+    if is_float_dtype(s.dtype):
+        # Boş hücre yüzünden float okunan metin sütunu (örn. Beden 42.0) int gibi yazılsın
+        s = s.map(lambda v: int(v) if v == v and float(v).is_integer() else v)
+    return strip_text(s)
+
+def row_hashes(df, columns):
+    """Verilen sütunlardan satır başına uint64 özet; eksik sütunlar boş sayılır."""
+    frame = pd.DataFrame({col: (_canonical(df[col], col) if col in df.columns else pd.Series('', index=df.index))
+                          for col in columns}, index=df.index)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+def _keys(df):
+    """Barkod + aynı barkodun kaçıncı tekrarı olduğu: satır anahtarı."""
+    barcode = strip_text(df['Barkod']).to_numpy(dtype=object)
+    dup = pd.Series(barcode).groupby(barcode, sort=False).cumcount().to_numpy()
+    return pd.MultiIndex.from_arrays([barcode, dup], names=['Barkod', 'dup'])
+
+# --- Karşılaştırma ---
+
+def compute_delta(previous_df, current_df):
+    """
+    Güncel katalog satırlarının konumlarını (iloc) ve silinen satırları döndürür:
+    {'new', 'changed', 'price_stock', 'unchanged'}: güncel katalogdaki konum dizileri,
+    'deleted': önceki katalogdan silinen satırların DataFrame'i,
+    'deleted_pos': bu satırların önceki katalogdaki konumları.
+    'changed' içerik değişenleri, 'price_stock' yalnızca fiyatı/stoğu değişenleri kapsar.
+    """
+    prev = pd.DataFrame({'content': row_hashes(previous_df, CONTENT_COLUMNS),
+                         'price_stock': row_hashes(previous_df, PRICE_STOCK_COLUMNS)},
+                        index=_keys(previous_df))
+    curr = pd.DataFrame({'content': row_hashes(current_df, CONTENT_COLUMNS),
+                         'price_stock': row_hashes(current_df, PRICE_STOCK_COLUMNS),
+                         'pos': np.arange(len(current_df))},
+                        index=_keys(current_df))
+
+    joined = curr.join(prev, how='left', rsuffix='_prev')
+    is_new = joined['content_prev'].isna().to_numpy()
+    content_changed = ~is_new & (joined['content'] != joined['content_prev']).to_numpy()
+    price_stock_changed = ~is_new & ~content_changed & (joined['price_stock'] != joined['price_stock_prev']).to_numpy()
+    pos = joined['pos'].to_numpy()
+
+    deleted_pos = np.flatnonzero(~prev.index.isin(curr.index))
+    return {
+        'new': pos[is_new],
+        'changed': pos[content_changed],
+        'price_stock': pos[price_stock_changed],
+        'unchanged': pos[~is_new & ~content_changed & ~price_stock_changed],
+        'deleted': previous_df.iloc[deleted_pos],
+        'deleted_pos': deleted_pos,
+    }
+
+def upload_positions(delta):
+    """Pazaryeri dosyasına tam satır olarak girmesi gereken konumlar (yeni + içeriği değişen), sıralı."""
+    return np.sort(np.concatenate([delta['new'], delta['changed']]))
+
+def price_stock_feed(frame, delta, previous_frame, columns, stock_column):
+    """
+    Yalnızca fiyat/stok değişen ürünler ve stoğu 0'a çekilecek silinen ürünler için
+    pazaryerine özgü sade güncelleme tablosu. frame güncel kataloğun, previous_frame
+    önceki kataloğun aynı dönüştürücüyle eşlenmiş halidir (satırlar katalog sırasında);
+    silinen ürün yoksa previous_frame None olabilir. columns pazaryerinin stok kodu,
+    barkod, fiyat ve stok (stock_column) sütunlarıdır.
+    """
+    changed = frame.reindex(columns=columns).iloc[delta['price_stock']]
+    parts = [changed.assign(Durum='fiyat/stok')]
+    if len(delta['deleted_pos']):
+        deleted = previous_frame.reindex(columns=columns).iloc[delta['deleted_pos']]
+        parts.append(deleted.assign(**{stock_column: 0, 'Durum': 'silindi'}))
+    return pd.concat(parts, ignore_index=True)
+
+def summary(delta):
+    return {name: len(delta[name]) for name in ('new', 'changed', 'price_stock', 'deleted', 'unchanged')}
@@ -0,0 +1,235 @@
+"""
+Çevrimdışı deneme için sahte pazaryeri API sunucusu.
+
+upload.py'nin konuştuğu toplu iş sözleşmesini uygular:
+
+    POST /<pazaryeri>/batches        -> 202 {"batchId": "..."}
+    GET  /<pazaryeri>/batches/<id>   -> {"status": "PROCESSING" | "COMPLETED", "items": n, "failed": [...]}
+
+Fiyat/stok güncellemeleri aynı yolların /<pazaryeri>/price-stock/ altındaki karşılığına
+gelir; hız sınırını pazaryerinin ürün yolu ile paylaşır, paketleri ayrı tutulur
+(stats['items']'ta '<pazaryeri>/price-stock' adıyla).
+
+Gerçek API'lerdeki zorlukları da taklit eder:
+- Pazaryeri başına hız sınırı: sınır aşılırsa 429 ve 'Retry-After' döner.
+- fail_rate olasılıkla geçici 503 hatası.
+- Aynı Idempotency-Key ile gelen paket tekrar işlenmez, aynı batchId döner.
+- Paketler processing_seconds sonra tamamlanır; reject_every > 0 ise her N. satır
+  'reddedildi' olarak işaretlenir.
+- chunked True ise yanıt gövdeleri Content-Length yerine 'Transfer-Encoding: chunked'
+  ile parça parça gönderilir. Açılan bağlantılar stats['connections']'ta sayılır.
+
+Kullanım:
+    python fake_marketplace.py --port 8089 --rate 5 --fail-rate 0.05
+
+Betik içinden (arka planda çalışır):
+    with FakeMarketplace(rate=50) as server:
+        upload.upload_frames(frames, base_url=server.url)
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+
+# --- Ayarlar ---
+DEFAULT_PORT = 8089
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_REASONS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 429: 'Too Many Requests', 503: 'Service Unavailable'}
+
+class FakeMarketplace:
+    """Arka planda (ayrı iş parçacığında) ya da run() ile ön planda çalışan sahte API."""
+
+    def __init__(self, host='127.0.0.1', port=0, rate=10.0, burst=None, fail_rate=0.0,
+                 processing_seconds=0.5, reject_every=0, seed=None, chunked=False):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.burst = burst or rate
+        self.fail_rate = fail_rate
+        self.processing_seconds = processing_seconds
+        self.reject_every = reject_every
+        self.chunked = chunked
+        self.random = random.Random(seed)
+        self.batches = {}  # batchId -> paket
+        self.keys = {}  # (pazaryeri, Idempotency-Key) -> batchId
+        self.buckets = {}  # pazaryeri -> [jeton, son güncelleme]
+        self.stats = {'connections': 0, 'requests': 0, 'rate_limited': 0, 'transient_errors': 0, 'duplicates': 0,
+                      'batches': 0, 'items': {}}
+        self._ready = threading.Event()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    # --- İstek İşleme ---
+
+    def _allow(self, marketplace):
+        now = time.monotonic()
+        tokens, updated = self.buckets.get(marketplace, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        self.buckets[marketplace] = [tokens - 1 if allowed else tokens, now]
+        return allowed
+
+    def _create_batch(self, marketplace, key, body):
+        if key and (marketplace, key) in self.keys:
+            self.stats['duplicates'] += 1
+            return 202, {'batchId': self.keys[(marketplace, key)]}
+        try:
+            items = json.loads(body)['items']
+        except (ValueError, KeyError, TypeError):
+            return 400, {'error': "gövde {'items': [...]} biçiminde olmalı"}
+        batch_id = uuid.uuid4().hex
+        failed = ([{'index': i, 'reason': 'reddedildi (sahte sunucu)'}
+                   for i in range(self.reject_every - 1, len(items), self.reject_every)]
+                  if self.reject_every else [])
+        self.batches[batch_id] = {'marketplace': marketplace, 'items': len(items), 'failed': failed,
+                                  'created': time.monotonic()}
+        if key:
+            self.keys[(marketplace, key)] = batch_id
+        self.stats['batches'] += 1
+        self.stats['items'][marketplace] = self.stats['items'].get(marketplace, 0) + len(items)
+        return 202, {'batchId': batch_id}
+
+    def _batch_status(self, marketplace, batch_id):
+        batch = self.batches.get(batch_id)
+        if batch is None or batch['marketplace'] != marketplace:
+            return 404, {'error': 'paket bulunamadı'}
+        if time.monotonic() - batch['created'] < self.processing_seconds:
+            return 200, {'status': 'PROCESSING', 'items': batch['items']}
+        return 200, {'status': 'COMPLETED', 'items': batch['items'], 'failed': batch['failed']}
+
+    def _route(self, method, path, headers, body):
+        self.stats['requests'] += 1
+        parts = [p for p in path.split('?')[0].split('/') if p]
+        price_stock = len(parts) > 1 and parts[1] == 'price-stock'
+        if price_stock:
+            del parts[1]
+        if len(parts) < 2 or parts[1] != 'batches':
+            return 404, {'error': 'bilinmeyen yol'}, {}
+        marketplace = parts[0]
+        channel = f"{marketplace}/price-stock" if price_stock else marketplace
+        if not self._allow(marketplace):
+            self.stats['rate_limited'] += 1
+            return 429, {'error': 'hız sınırı aşıldı'}, {'Retry-After': '1'}
+        if self.fail_rate and self.random.random() < self.fail_rate:
+            self.stats['transient_errors'] += 1
+            return 503, {'error': 'geçici hata (sahte)'}, {}
+        if method == 'POST' and len(parts) == 2:
+            return (*self._create_batch(channel, headers.get('idempotency-key'), body), {})
+        if method == 'GET' and len(parts) == 3:
+            return (*self._batch_status(channel, parts[2]), {})
+        return 405, {'error': 'desteklenmeyen istek'}, {}
+
+    def _response(self, status, payload, extra):
+        content = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json; charset=utf-8\r\n"
+        if self.chunked:
+            # Gövde iki parça ve boş son parça olarak gönderilir
+            middle = len(content) // 2
+            body = b''.join(b'%x\r\n%s\r\n' % (len(part), part)
+                            for part in (content[:middle], content[middle:]) if part) + b'0\r\n\r\n'
+            head += 'Transfer-Encoding: chunked\r\n'
+        else:
+            body = content
+            head += f"Content-Length: {len(content)}\r\n"
+        head += ''.join(f"{k}: {v}\r\n" for k, v in extra.items())
+        return (head + '\r\n').encode('latin-1') + body
+
+    async def _handle(self, reader, writer):
+        self.stats['connections'] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    status, payload, extra = 413, {'error': 'gövde çok büyük'}, {'Connection': 'close'}
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload, extra = self._route(method, path, headers, body)
+                writer.write(self._response(status, payload, extra))
+                await writer.drain()
+                if extra.get('Connection') == 'close':
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # Bozuk istek ya da kapanışta iptal edilen bağlantı
+        finally:
+            writer.close()
+
+    # --- Çalıştırma ---
+
+    async def _start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def run(self):
+        """Ön planda çalıştırır (Ctrl+C ile durur)."""
+        async def serve():
+            await self._start()
+            print(f"Sahte pazaryeri API'si: {self.url}")
+            async with self._server:
+                await self._server.serve_forever()
+        asyncio.run(serve())
+
+    def _run_thread(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._start())
+        self._ready.set()
+        self.loop.run_forever()
+        self.loop.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run_thread, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self._thread.join(timeout=5)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='upload.py için sahte pazaryeri API sunucusu')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--rate', type=float, default=10.0, help='Pazaryeri başına istek/sn sınırı')
+    parser.add_argument('--burst', type=float, default=None)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Geçici 503 olasılığı')
+    parser.add_argument('--processing-seconds', type=float, default=0.5)
+    parser.add_argument('--reject-every', type=int, default=0, help='Her N. satırı reddet (0: hiçbiri)')
+    parser.add_argument('--chunked', action='store_true', help="Yanıtları 'Transfer-Encoding: chunked' ile gönder")
+    args = parser.parse_args(argv)
+    try:
+        FakeMarketplace(args.host, args.port, args.rate, args.burst, args.fail_rate,
+                        args.processing_seconds, args.reject_every, chunked=args.chunked).run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
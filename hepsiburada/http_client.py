@@ -0,0 +1,217 @@
+"""
+Bağlantı havuzlu asyncio HTTP/1.1 istemcisi.
+
+Görsel denetimi (image_check.py) ve pazaryeri yüklemesi (upload.py) tarafından
+kullanılır; ek bağımlılık gerektirmez.
+
+- Her sunucu (scheme, host, port) için açık bağlantılar havuzda tutulur ve keep-alive
+  ile yeniden kullanılır; sunucu başına eşzamanlı istek sayısı per_host ile sınırlıdır.
+- Sunucu adı (DNS) havuz başına bir kez çözülür; çözülemezse o sunucunun tüm
+  istekleri hemen aynı hatayla düşer.
+- Sunucunun boşta kapattığı keep-alive bağlantısı fark edilirse istek bir kez yeni
+  bağlantıyla tekrarlanır (yanıt alınmaya başlanmışsa tekrarlanmaz).
+
+Kullanım:
+    async with Client(per_host=8) as client:
+        response = await client.request('POST', url, body=b'{...}', headers={'Content-Type': 'application/json'})
+        response.status, response.json()
+"""
+import asyncio
+import json
+import socket
+import ssl
+from urllib.parse import quote, urlsplit
+
+# --- Ayarlar ---
+USER_AGENT = 'marketplace-converter/1.0'
+PER_HOST_LIMIT = 16
+TOTAL_LIMIT = 256
+TIMEOUT_SECONDS = 10
+
+_SAFE_URL_CHARS = "/%?=&:+,;@!$'()*~-._#[]"
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers  # Küçük harfli başlık adları
+        self.body = body  # max_body aşıldıysa None
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+class _StaleConnection(ConnectionResetError):
+    """Havuzdan alınan bağlantıyı sunucu kapatmış; istek hiç işlenmedi."""
+
+# --- Bağlantı Havuzu ---
+
+class _HostPool:
+    """Tek sunucuya açık keep-alive bağlantıları ve eşzamanlılık sınırı."""
+
+    def __init__(self, scheme, host, port, limit):
+        self.host = host
+        self.port = port
+        self.ssl = ssl.create_default_context() if scheme == 'https' else None
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle = []
+        self._address = None
+
+    async def address(self):
+        if self._address is None:
+            self._address = asyncio.ensure_future(asyncio.get_running_loop().getaddrinfo(
+                self.host, self.port, type=socket.SOCK_STREAM))
+        infos = await asyncio.shield(self._address)
+        return infos[0][4][0]
+
+    async def acquire(self):
+        """(reader, writer, yeniden_kullanıldı) döndürür."""
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.open_connection(
+            await self.address(), self.port, ssl=self.ssl, server_hostname=self.host if self.ssl else None)
+        return reader, writer, False
+
+    def release(self, reader, writer, reusable):
+        if reusable:
+            self.idle.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+# --- İstek ---
+
+def _over(total, max_body):
+    return max_body is not None and total > max_body
+
+async def _read_chunked(reader, max_body=None):
+    """Parçalı gövde; toplam max_body'yi aşarsa okuma bırakılır ve None döner."""
+    chunks, total = [], 0
+    while True:
+        size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+        if size == 0:
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # trailer başlıkları
+            return b''.join(chunks)
+        total += size
+        if _over(total, max_body):
+            return None
+        chunks.append((await reader.readexactly(size + 2))[:-2])
+
+async def _read_until_close(reader, max_body=None):
+    """Bağlantı kapanana kadar süren gövde; toplam max_body'yi aşarsa None döner."""
+    chunks, total = [], 0
+    while True:
+        chunk = await reader.read(64 * 1024)
+        if not chunk:
+            return b''.join(chunks)
+        total += len(chunk)
+        if _over(total, max_body):
+            return None
+        chunks.append(chunk)
+
+async def _send(pool, method, target, headers, body, max_body):
+    reader, writer, reused = await pool.acquire()
+    reusable = False
+    try:
+        head = f"{method} {target} HTTP/1.1\r\n" + ''.join(f"{k}: {v}\r\n" for k, v in headers.items())
+        if body is not None:
+            head += f"Content-Length: {len(body)}\r\n"
+        writer.write((head + '\r\n').encode('latin-1') + (body or b''))
+        try:
+            await writer.drain()
+            status_line = await reader.readline()
+        except (ConnectionResetError, BrokenPipeError):
+            if reused:
+                raise _StaleConnection()
+            raise
+        if not status_line:
+            if reused:
+                raise _StaleConnection()
+            raise ConnectionResetError('sunucu yanıt vermeden bağlantıyı kapattı')
+
+        status = int(status_line.split(None, 2)[1])
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        content = b''
+        length = response_headers.get('content-length')
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            reusable = True
+        elif 'chunked' in response_headers.get('transfer-encoding', '').lower():
+            content = await _read_chunked(reader, max_body)
+            reusable = content is not None  # Yarım bırakılan gövde: bağlantı kapatılır
+        elif length is not None:
+            if not _over(int(length), max_body):
+                content = await reader.readexactly(int(length))
+                reusable = True
+            else:
+                content = None  # Büyük gövde okunmaz, bağlantı kapatılır
+        else:
+            content = await _read_until_close(reader, max_body)  # Gövde bağlantı kapanana kadar sürer
+        if response_headers.get('connection', '').lower() == 'close':
+            reusable = False
+        return Response(status, response_headers, content)
+    finally:
+        pool.release(reader, writer, reusable)
+
+class Client:
+    """Sunucu başına ve toplamda sınırlı eşzamanlı, bağlantı havuzlu HTTP istemcisi."""
+
+    def __init__(self, per_host=PER_HOST_LIMIT, concurrency=TOTAL_LIMIT, timeout=TIMEOUT_SECONDS, headers=None):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.headers = {'User-Agent': USER_AGENT, **(headers or {})}
+        self.total = asyncio.Semaphore(concurrency)
+        self.pools = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.close()
+
+    def _pool(self, parts):
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        if key not in self.pools:
+            self.pools[key] = _HostPool(parts.scheme, parts.hostname, port, self.per_host)
+        return self.pools[key]
+
+    async def request(self, method, url, headers=None, body=None, max_body=None, timeout=None):
+        """
+        İsteği gönderir ve Response döndürür. max_body verilirse bundan büyük yanıt
+        gövdeleri (Content-Length, parçalı ya da bağlantı kapanana kadar süren) okunmaz,
+        body None olur ve bağlantı kapatılır. Zaman aşımında asyncio.TimeoutError,
+        bağlantı hatalarında OSError yükselir.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"geçersiz URL: {url}")
+        pool = self._pool(parts)
+        target = quote((parts.path or '/') + (f"?{parts.query}" if parts.query else ''), safe=_SAFE_URL_CHARS)
+        all_headers = {'Host': parts.hostname + (f":{parts.port}" if parts.port else ''),
+                       'Connection': 'keep-alive', **self.headers, **(headers or {})}
+
+        async def attempt():
+            try:
+                return await _send(pool, method, target, all_headers, body, max_body)
+            except _StaleConnection:
+                return await _send(pool, method, target, all_headers, body, max_body)
+
+        async with self.total, pool.semaphore:
+            return await asyncio.wait_for(attempt(), self.timeout if timeout is None else timeout)
@@ -1,7 +1,134 @@
 import pandas as pd
+import numpy as np
 import os
 
-def excel_verisini_sablonla_birlestir(xlsx_dosya_yolu, sablon_csv_yolu, cikis_dosya_yolu):
+from catalog import read_trendyol_export, select_engine
+from profiling import enable_from_argv, phase
+from sharding import write_shards
+from templates import idefix_template
+
+# Kodun çalıştırılması (Dosya isimlerini kendi dosyalarınıza göre düzenleyebilirsiniz)
+source_file = "Ürünleriniz_02.01.2026-23.27.xlsx" # veya .xlsx
+template_file = "dekoratif-aksesuarlar-17411-20260102232441(Ürünlerinizi Burada Listeleyin).csv"
+output_file = "Idefix_Urun_Listesi_Hazir.csv"
+chunk_rows = None  # .csv kaynakta parça parça işleme için satır sayısı (örn. 50000); None = tek seferde
+max_rows_per_file = None  # Dosya başına en fazla satır; verilirse çıktı parçalara bölünür (bkz. sharding.py)
+
+# Sütun Eşleştirmeleri (Mapping)
+# Sol taraf: Şablondaki Sütun İsmi (Dosyanızdaki bozuk karakterlere göre ayarlandı: örn 'Ürün Ad?')
+# Sağ taraf: Sizin Excel'deki Sütun İsmi
+mapping = {
+    'Ürün Ad?': 'Ürün Adı',
+    'Barkod': 'Barkod',
+    'Kategori': 'Kategori İsmi',
+    'Marka': 'Marka',
+    'Ürün Aç?klamas?': 'Ürün Açıklaması',
+    'Sat?c? Stok Kodu': 'Barkod',       # Stok kodu olarak Barkod kullanıldı
+    'Varyant Grup Id': 'Model Kodu',    # Varyant grubu olarak Model Kodu
+    'Stok Adedi': 'Ürün Stok Adedi',
+    'Idefix Sat?? Fiyat?': "Trendyol'da Satılacak Fiyat (KDV Dahil)",
+    'Piyasa Sat?? Fiyat?': 'Piyasa Satış Fiyatı (KDV Dahil)',
+    'KDV': 'KDV Oranı',
+    'Desi': 'Desi',
+    'Renk': 'Ürün Rengi',
+    'Boyut/Ebat': 'Beden'
+}
+
+def idefix_sablon_sutunlarini_oku(sablon_csv_yolu):
+    # Şablonun sütunları, kodlaması (latin1/utf-8) ve ayırıcısı bir kez bulunur;
+    # dosya değişmedikçe kayıt defterinden gelir (bkz. templates.py)
+    with phase('idefix.template'):
+        return idefix_template(sablon_csv_yolu)['columns']
+
+def _kaynak_sutunlari(source_columns, target_columns):
+    """Şablonda ve kaynakta bulunan eşleşmeler: {hedef sütun: kaynak sütun}."""
+    target_columns = set(target_columns)
+    source_columns = set(source_columns)
+    pairs = {}
+
+    # Eşleşen sütunlar
+    for target_col, source_col in mapping.items():
+        if target_col in target_columns and source_col in source_columns:
+            pairs[target_col] = source_col
+
+    # Görseller (Görsel 1 ... Görsel 8)
+    for i in range(1, 9):
+        col_name = f'Görsel {i}'
+        if col_name in target_columns and col_name in source_columns:
+            pairs[col_name] = col_name
+
+    # Parti/Lot bilgisi (Varsa)
+    if 'Parti/Lot/SKT' in target_columns and 'Parti/Lot/SKT Bilgisi' in source_columns:
+        pairs['Parti/Lot/SKT'] = 'Parti/Lot/SKT Bilgisi'
+    return pairs
+
+def idefix_verisini_esle(df_source, target_columns):
+    with phase('idefix.map', rows=len(df_source)):
+        pairs = _kaynak_sutunlari(df_source.columns, target_columns)
+        if not pairs:
+            # Hiçbir sütun eşleşmezse boş şablon
+            return pd.DataFrame(columns=target_columns)
+
+        # Çıktı tek seferde kurulur; eşleşmeyen sütunlar boş (NaN) kalır
+        empty = pd.Series(np.nan, index=df_source.index, dtype=object)
+        return pd.DataFrame({col: df_source[pairs[col]] if col in pairs else empty for col in target_columns},
+                            columns=target_columns)
+
+def idefix_dosyasini_yaz(df_output, cikis_dosya_yolu, max_rows=None):
+    # max_rows verilirse aynı Varyant Grup Id'deki ürünler bir arada kalacak şekilde
+    # parçalara bölünür; parça listesinin yolu döndürülür
+    if max_rows:
+        return write_shards(df_output, cikis_dosya_yolu, idefix_dosyasini_yaz, 'Varyant Grup Id', max_rows)
+    # Türkçe karakterler için utf-8-sig ve ayırıcı olarak noktalı virgül (;) kullanıldı
+    with phase('idefix.write', rows=len(df_output)):
+        df_output.to_csv(cikis_dosya_yolu, sep=';', index=False, encoding='utf-8-sig')
+    return cikis_dosya_yolu
+
+def _ortak_tipler(kaynak_csv_yolu, usecols, chunk_rows):
+    """
+    Parça parça okumada sütun tipleri parçadan parçaya değişebilir (örn. bir parçada
+    int64, boş hücreli parçada float64). Tek seferde okumayla aynı çıktı için tüm
+    parçalarda float görülen sayısal sütunlar döndürülür; bunlar her parçada float64'e çevrilir.
+    """
+    kinds = {}
+    for chunk in pd.read_csv(kaynak_csv_yolu, usecols=usecols, chunksize=chunk_rows):
+        for col, dtype in chunk.dtypes.items():
+            kinds.setdefault(col, set()).add(dtype.kind)
+    return [col for col, k in kinds.items() if 'f' in k and k <= {'i', 'u', 'f'}]
+
+def idefix_csv_akisi(kaynak_csv_yolu, sablon_csv_yolu, cikis_dosya_yolu, chunk_rows):
+    """
+    Büyük .csv kaynaklar için parça parça dönüştürme: kaynak chunk_rows satırlık
+    parçalar halinde (yalnızca gereken sütunlar) okunur, eşlenir ve çıktıya eklenir.
+    Bellek kullanımı parça boyutuyla sınırlıdır; çıktı tek seferde işlemeyle aynıdır.
+    """
+    target_columns = idefix_sablon_sutunlarini_oku(sablon_csv_yolu)
+    source_columns = pd.read_csv(kaynak_csv_yolu, nrows=0).columns
+    usecols = sorted(set(_kaynak_sutunlari(source_columns, target_columns).values()))
+
+    with open(cikis_dosya_yolu, 'w', encoding='utf-8-sig', newline='') as f:
+        if not usecols:
+            idefix_verisini_esle(pd.DataFrame(columns=source_columns), target_columns).to_csv(f, sep=';', index=False)
+            return
+
+        float_columns = _ortak_tipler(kaynak_csv_yolu, usecols, chunk_rows)
+        header = True
+        for chunk in pd.read_csv(kaynak_csv_yolu, usecols=usecols, chunksize=chunk_rows):
+            if float_columns:
+                chunk = chunk.astype({col: 'float64' for col in float_columns})
+            df_output = idefix_verisini_esle(chunk, target_columns)
+            with phase('idefix.write', rows=len(df_output)):
+                df_output.to_csv(f, sep=';', index=False, header=header)
+            header = False
+
+def excel_verisini_sablonla_birlestir(xlsx_dosya_yolu, sablon_csv_yolu, cikis_dosya_yolu, chunk_rows=None,
+                                      max_rows=None):
+    # CSV kaynak ve chunk_rows verilmişse parça parça işle
+    if xlsx_dosya_yolu.endswith('.csv') and chunk_rows:
+        idefix_csv_akisi(xlsx_dosya_yolu, sablon_csv_yolu, cikis_dosya_yolu, chunk_rows)
+        print(f"Dosya başarıyla oluşturuldu: {cikis_dosya_yolu}")
+        return
+
     # 1. Kaynak veriyi oku
     # Excel dosyasını okuyoruz (CSV'ye çevrilmiş halini de okuyabiliriz)
     if xlsx_dosya_yolu.endswith('.csv'):
@@ -9,66 +136,20 @@ def excel_verisini_sablonla_birlestir(xlsx_dosya_yolu, sablon_csv_yolu, cikis_do
     else:
         # Excel okuması (Genellikle 'Ürünler' sayfasıdır, yoksa ilk sayfayı okur)
         try:
-            df_source = pd.read_excel(xlsx_dosya_yolu, sheet_name='Ürünler')
-        except:
-            df_source = pd.read_excel(xlsx_dosya_yolu)
-
-    # 2. Şablon dosyasını oku (Sütun isimlerini almak için)
-    # Şablon noktalı virgül (;) ile ayrılmış görünüyor
-    try:
-        df_template = pd.read_csv(sablon_csv_yolu, sep=';', encoding='latin1')
-    except:
-        df_template = pd.read_csv(sablon_csv_yolu, sep=';', encoding='utf-8')
-
-    # Hedef sütun listesini al
-    target_columns = df_template.columns.tolist()
-    
-    # 3. Yeni DataFrame oluştur
-    df_output = pd.DataFrame(columns=target_columns)
-    
-    # 4. Sütun Eşleştirmeleri (Mapping)
-    # Sol taraf: Şablondaki Sütun İsmi (Dosyanızdaki bozuk karakterlere göre ayarlandı: örn 'Ürün Ad?')
-    # Sağ taraf: Sizin Excel'deki Sütun İsmi
-    mapping = {
-        'Ürün Ad?': 'Ürün Adı',
-        'Barkod': 'Barkod',
-        'Kategori': 'Kategori İsmi',
-        'Marka': 'Marka',
-        'Ürün Aç?klamas?': 'Ürün Açıklaması',
-        'Sat?c? Stok Kodu': 'Barkod',       # Stok kodu olarak Barkod kullanıldı
-        'Varyant Grup Id': 'Model Kodu',    # Varyant grubu olarak Model Kodu
-        'Stok Adedi': 'Ürün Stok Adedi',
-        'Idefix Sat?? Fiyat?': "Trendyol'da Satılacak Fiyat (KDV Dahil)",
-        'Piyasa Sat?? Fiyat?': 'Piyasa Satış Fiyatı (KDV Dahil)',
-        'KDV': 'KDV Oranı',
-        'Desi': 'Desi',
-        'Renk': 'Ürün Rengi',
-        'Boyut/Ebat': 'Beden'
-    }
-    
-    # Eşleşen sütunları doldur
-    for target_col, source_col in mapping.items():
-        if target_col in df_output.columns and source_col in df_source.columns:
-            df_output[target_col] = df_source[source_col]
+            df_source = read_trendyol_export(xlsx_dosya_yolu)
+        except ValueError:
+            df_source = pd.read_excel(xlsx_dosya_yolu, engine=select_engine())
 
-    # Görselleri aktar (Görsel 1 ... Görsel 8)
-    for i in range(1, 9):
-        col_name = f'Görsel {i}'
-        if col_name in df_output.columns and col_name in df_source.columns:
-            df_output[col_name] = df_source[col_name]
-            
-    # Parti/Lot bilgisi (Varsa)
-    if 'Parti/Lot/SKT' in df_output.columns and 'Parti/Lot/SKT Bilgisi' in df_source.columns:
-        df_output['Parti/Lot/SKT'] = df_source['Parti/Lot/SKT Bilgisi']
+    # 2. Şablon sütunlarını oku
+    target_columns = idefix_sablon_sutunlarini_oku(sablon_csv_yolu)
 
-    # 5. Dosyayı Kaydet
-    # Türkçe karakterler için utf-8-sig ve ayırıcı olarak noktalı virgül (;) kullanıldı
-    df_output.to_csv(cikis_dosya_yolu, sep=';', index=False, encoding='utf-8-sig')
-    print(f"Dosya başarıyla oluşturuldu: {cikis_dosya_yolu}")
+    # 3. Sütunları eşleştir
+    df_output = idefix_verisini_esle(df_source, target_columns)
 
-# Kodun çalıştırılması (Dosya isimlerini kendi dosyalarınıza göre düzenleyebilirsiniz)
-source_file = "Ürünleriniz_02.01.2026-23.27.xlsx" # veya .xlsx
-template_file = "dekoratif-aksesuarlar-17411-20260102232441(Ürünlerinizi Burada Listeleyin).csv"
-output_file = "Idefix_Urun_Listesi_Hazir.csv"
+    # 4. Dosyayı Kaydet
+    yazilan = idefix_dosyasini_yaz(df_output, cikis_dosya_yolu, max_rows)
+    print(f"Dosya başarıyla oluşturuldu: {yazilan}")
 
-excel_verisini_sablonla_birlestir(source_file, template_file, output_file)
\ No newline at end of file
+if __name__ == '__main__':
+    enable_from_argv()
+    excel_verisini_sablonla_birlestir(source_file, template_file, output_file, chunk_rows, max_rows_per_file)
@@ -0,0 +1,234 @@
+"""
+Görsel URL doğrulama.
+
+Katalogdaki 'Görsel 1..8' sütunlarındaki tekil URL'ler asyncio ile, bağlantı havuzlu
+HTTP istemcisiyle (http_client.py) eşzamanlı denetlenir:
+
+- Sunucu başına eşzamanlı istek sayısı PER_HOST_LIMIT, toplam TOTAL_LIMIT ile sınırlıdır.
+- Önce HEAD gönderilir; HEAD desteklenmiyorsa (405/501) 'Range: bytes=0-0' ile GET.
+- Yönlendirmeler (301/302/303/307/308) MAX_REDIRECTS'e kadar izlenir.
+- 2xx yanıt ve (varsa) 'image/*' içerik tipi geçerli sayılır.
+
+Sonuçlar SQLite önbelleğinde (CACHE_FILE) saklanır; süresi (TTL) dolmamış URL'ler
+yeniden denetlenmez. Geçici hatalar tekrar denensin diye hatalı sonuçların süresi kısadır.
+
+Kullanım:
+    python image_check.py "Ürünleriniz_02.01.2026-23.27.xlsx" --report Gorsel_Kontrol_Raporu.csv
+    python pipeline.py "Ürünleriniz_02.01.2026-23.27.xlsx" --check-images
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import time
+from urllib.parse import urljoin, urlsplit
+
+import pandas as pd
+
+from http_client import PER_HOST_LIMIT, TIMEOUT_SECONDS, TOTAL_LIMIT, Client
+from profiling import phase
+
+# --- Ayarlar ---
+IMAGE_COLUMNS = [f'Görsel {i}' for i in range(1, 9)]
+CACHE_FILE = 'gorsel_kontrol.sqlite'
+TTL_SECONDS = 7 * 24 * 3600  # Geçerli sonuçlar bir hafta saklanır
+ERROR_TTL_SECONDS = 3600  # Hatalı sonuçlar bir saat sonra yeniden denetlenir
+MAX_REDIRECTS = 5
+MAX_DRAIN_BYTES = 64 * 1024  # Range'i yok sayan sunucularda bundan büyük gövde okunmaz, bağlantı kapatılır
+REPORT_FILE = 'Gorsel_Kontrol_Raporu.csv'
+REPORT_COLUMNS = ['Barkod', 'Model Kodu', 'Sütun', 'URL', 'Durum Kodu', 'Hata']
+
+_REDIRECTS = {301, 302, 303, 307, 308}
+
+# --- Sonuç Önbelleği ---
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS image_checks (
+    url          TEXT    PRIMARY KEY,
+    ok           INTEGER NOT NULL,
+    status       INTEGER,
+    content_type TEXT,
+    error        TEXT,
+    checked_at   REAL    NOT NULL
+) WITHOUT ROWID;
+"""
+
+class ResultCache:
+    """URL denetim sonuçlarının SQLite önbelleği."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def fresh(self, urls, ttl=TTL_SECONDS, error_ttl=ERROR_TTL_SECONDS, now=None):
+        """Süresi dolmamış sonuçları {url: sonuç} olarak döndürür."""
+        now = time.time() if now is None else now
+        with self.conn:
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS wanted (url TEXT PRIMARY KEY)')
+            self.conn.execute('DELETE FROM wanted')
+            self.conn.executemany('INSERT OR IGNORE INTO wanted VALUES (?)', ((u,) for u in urls))
+            rows = self.conn.execute(
+                'SELECT c.url, c.ok, c.status, c.content_type, c.error, c.checked_at '
+                'FROM wanted w JOIN image_checks c ON c.url = w.url '
+                'WHERE c.checked_at >= CASE WHEN c.ok THEN ? ELSE ? END',
+                (now - ttl, now - error_ttl)).fetchall()
+            self.conn.execute('DELETE FROM wanted')
+        return {url: _result(url, bool(ok), status, content_type, error, checked_at)
+                for url, ok, status, content_type, error, checked_at in rows}
+
+    def store(self, results):
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO image_checks (url, ok, status, content_type, error, checked_at) '
+                'VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (url) DO UPDATE SET ok = excluded.ok, '
+                'status = excluded.status, content_type = excluded.content_type, '
+                'error = excluded.error, checked_at = excluded.checked_at',
+                ((r['url'], int(r['ok']), r['status'], r['content_type'], r['error'], r['checked_at'])
+                 for r in results))
+
+def _result(url, ok, status=None, content_type=None, error=None, checked_at=None):
+    return {'url': url, 'ok': ok, 'status': status, 'content_type': content_type, 'error': error,
+            'checked_at': time.time() if checked_at is None else checked_at}
+
+# --- Denetleyici ---
+
+class ImageChecker:
+    """Bağlantı havuzlu, sunucu başına sınırlı eşzamanlı URL denetleyicisi."""
+
+    def __init__(self, per_host=PER_HOST_LIMIT, concurrency=TOTAL_LIMIT, timeout=TIMEOUT_SECONDS):
+        self.client = Client(per_host, concurrency, timeout, headers={'Accept': 'image/*,*/*;q=0.8'})
+
+    async def check(self, url):
+        current = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                parts = urlsplit(current)
+                if parts.scheme not in ('http', 'https') or not parts.hostname:
+                    return _result(url, False, error='geçersiz URL')
+                response = await self.client.request('HEAD', current)
+                if response.status in (405, 501):  # HEAD desteklenmiyor
+                    response = await self.client.request('GET', current, headers={'Range': 'bytes=0-0'},
+                                                         max_body=MAX_DRAIN_BYTES)
+                status, headers = response.status, response.headers
+
+                if status in _REDIRECTS and 'location' in headers:
+                    current = urljoin(current, headers['location'])
+                    continue
+                content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+                ok = 200 <= status < 300 and (not content_type or content_type.startswith('image/'))
+                error = None if ok else (f"HTTP {status}" if not 200 <= status < 300 else f"görsel değil ({content_type})")
+                return _result(url, ok, status, content_type or None, error)
+            return _result(url, False, error='çok fazla yönlendirme')
+        except asyncio.TimeoutError:
+            return _result(url, False, error='zaman aşımı')
+        except (OSError, ValueError, asyncio.IncompleteReadError) as exc:
+            return _result(url, False, error=f"{type(exc).__name__}: {exc}")
+
+    async def check_all(self, urls):
+        try:
+            results = await asyncio.gather(*(self.check(url) for url in urls))
+        finally:
+            self.client.close()
+        return {r['url']: r for r in results}
+
+# --- Ana API ---
+
+def distinct_urls(catalog_df, columns=IMAGE_COLUMNS):
+    """Görsel sütunlarındaki boş olmayan tekil URL'ler (ilk görülme sırasıyla)."""
+    present = [col for col in columns if col in catalog_df.columns]
+    if not present:
+        return []
+    values = pd.unique(catalog_df[present].to_numpy(dtype=object).ravel())
+    return list(dict.fromkeys(v.strip() for v in values if isinstance(v, str) and v.strip()))
+
+async def check_urls_async(urls, cache_file=CACHE_FILE, ttl=TTL_SECONDS, error_ttl=ERROR_TTL_SECONDS,
+                           per_host=PER_HOST_LIMIT, concurrency=TOTAL_LIMIT, timeout=TIMEOUT_SECONDS):
+    """check_urls'in çalışan bir olay döngüsü içinden çağrılabilen sürümü."""
+    urls = list(dict.fromkeys(urls))
+    cache = ResultCache(cache_file) if cache_file else None
+    try:
+        results = cache.fresh(urls, ttl, error_ttl) if cache else {}
+        pending = [u for u in urls if u not in results]
+        if pending:
+            checked = await ImageChecker(per_host, concurrency, timeout).check_all(pending)
+            if cache:
+                cache.store(checked.values())
+            results.update(checked)
+    finally:
+        if cache:
+            cache.close()
+    return results
+
+def check_urls(urls, **kwargs):
+    """
+    URL'leri denetler ve {url: sonuç} döndürür. Sonuç sözlüğü: url, ok, status,
+    content_type, error, checked_at. Parametreler için check_urls_async'e bakın.
+    """
+    return asyncio.run(check_urls_async(urls, **kwargs))
+
+def image_report(catalog_df, results, columns=IMAGE_COLUMNS):
+    """Geçersiz görseli olan her (satır, sütun) için rapor satırı döndürür."""
+    rows = []
+    for col in columns:
+        if col not in catalog_df.columns:
+            continue
+        for idx, value in catalog_df[col].items():
+            if not isinstance(value, str) or not value.strip():
+                continue
+            result = results.get(value.strip())
+            if result is None or result['ok']:
+                continue
+            rows.append([catalog_df.at[idx, 'Barkod'] if 'Barkod' in catalog_df.columns else '',
+                         catalog_df.at[idx, 'Model Kodu'] if 'Model Kodu' in catalog_df.columns else '',
+                         col, value.strip(), result['status'], result['error']])
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+def validate_catalog_images(catalog_df, **kwargs):
+    """Katalogdaki görselleri denetler; (rapor DataFrame'i, {url: sonuç}) döndürür."""
+    with phase('image_check') as p:
+        urls = distinct_urls(catalog_df)
+        results = check_urls(urls, **kwargs)
+        p['rows'] = len(urls)
+    return image_report(catalog_df, results), results
+
+def main(argv=None):
+    from catalog import read_trendyol_export
+
+    parser = argparse.ArgumentParser(description='Trendyol dışa aktarımındaki görsel URL\'lerini denetler.')
+    parser.add_argument('trendyol_file')
+    parser.add_argument('--report', default=REPORT_FILE, help='Geçersiz görseller raporu (CSV)')
+    parser.add_argument('--cache', default=CACHE_FILE, help='Sonuç önbelleği (SQLite)')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--per-host', type=int, default=PER_HOST_LIMIT)
+    parser.add_argument('--concurrency', type=int, default=TOTAL_LIMIT)
+    parser.add_argument('--timeout', type=float, default=TIMEOUT_SECONDS)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.trendyol_file):
+        print(f"Hata: '{args.trendyol_file}' dosyası bulunamadı.")
+        return 1
+
+    catalog_df = read_trendyol_export(args.trendyol_file)
+    start = time.perf_counter()
+    report, results = validate_catalog_images(
+        catalog_df, cache_file=None if args.no_cache else args.cache,
+        per_host=args.per_host, concurrency=args.concurrency, timeout=args.timeout)
+    report.to_csv(args.report, sep=';', index=False, encoding='utf-8-sig')
+    broken = sum(not r['ok'] for r in results.values())
+    print(f"{len(results)} tekil görsel denetlendi ({time.perf_counter() - start:.2f} sn), "
+          f"{broken} geçersiz. Rapor: {args.report}")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
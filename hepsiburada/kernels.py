@@ -0,0 +1,132 @@
+"""
+Sütun düzeyinde çalışan dönüşüm çekirdekleri.
+
+Dönüştürücülerin eski satır bazlı yardımcı fonksiyonlarının (clean_text, get_unique_sku /
+make_sku_unique, generate_variant_group_id, parse_dimensions; karşılaştırma için
+tests/baseline.py'de tutulur) bütün sütun üzerinde çalışan karşılıklarıdır ve aynı
+sonuçları üretir. Karşılaştırmalı ölçüm için bench_kernels.py'ye bakın.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# --- Tekil Değer Yardımcısı ---
+
+def _factorize_text(s):
+    """
+    (kodlar, tekil değerlerin metinleri). Boş hücreler (NaN/None/NA) kod -1 alır; metne
+    yalnızca tekil değerler çevrilir, böylece pandas'ın metin tipi ayarından (infer_string)
+    bağımsız olarak NaN 'nan' metnine dönüşmez.
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    return codes, np.array([str(v) for v in np.asarray(uniques, dtype=object)], dtype=object)
+
+def _per_unique(s, transform, na_value=''):
+    """
+    Sütunu factorize edip tekil değerleri metne çevirir, transform'u yalnızca bunlara uygular
+    ve sonucu kodlarla geri dağıtır (NaN -> na_value). Pazaryeri kataloglarında renk,
+    beden, boyut ve açıklamalar çok tekrar ettiği için iş tekil değer sayısıyla ölçeklenir.
+    transform bir object dizisi alır ve aynı uzunlukta liste/dizi döndürür.
+    """
+    codes, uniques = _factorize_text(s)
+    values = np.empty(len(uniques) + 1, dtype=object)
+    values[:-1] = transform(uniques)
+    values[-1] = na_value  # kod -1 (NaN) son elemana düşer
+    return pd.Series(values.take(codes), index=s.index)
+
+# --- Metin ---
+
+def _strip_values(values):
+    return [v.strip() for v in values]
+
+def _clean_values(values):
+    return [v.strip() if '\n' not in v and '\r' not in v
+            else v.strip().replace('\n', ' ').replace('\r', '')
+            for v in values]
+
+def _oneline_values(values):
+    return [v if '\n' not in v and '\r' not in v
+            else v.replace('\n', ' ').replace('\r', '')
+            for v in values]
+
+def strip_text(s):
+    """NaN -> '', diğerleri str(x).strip()."""
+    return _per_unique(s, _strip_values)
+
+def clean_text(s):
+    """Satır bazlı clean_text: NaN -> '', kırpma ve satır sonlarını boşluğa çevirme."""
+    return _per_unique(s, _clean_values)
+
+def oneline_text(s):
+    """NaN -> '', satır sonları temizlenir ama kırpma yapılmaz (Hepsiburada açıklaması)."""
+    return _per_unique(s, _oneline_values)
+
+# --- Stok Kodu ---
+
+def unique_skus(skus):
+    """
+    Tekrarlanan stok kodlarına sırasıyla '-1', '-2' ... ekler; ilk geçen kod aynen kalır.
+    Boş kodlar '' döner ve sayılmaz. Girdi zaten kırpılmış metin olmalıdır
+    (strip_text / clean_text çıktısı).
+    """
+    codes, uniques = pd.factorize(skus.fillna(''), use_na_sentinel=True)
+    values = np.asarray(uniques, dtype=object).take(codes)
+    # Aynı koddan kaçıncı kez geçtiği (0 = ilk)
+    occurrence = pd.Series(codes).groupby(codes, sort=False).cumcount().to_numpy()
+    repeated = np.flatnonzero((occurrence > 0) & (values != ''))
+
+    out = values.copy()
+    out[repeated] = [f"{sku}-{k}" for sku, k in zip(values[repeated], occurrence[repeated].tolist())]
+    return pd.Series(out, index=skus.index)
+
+# --- Varyant Grubu ---
+
+_VARIANT_SUFFIX = re.compile(r'-\w+$')
+
+def _variant_values(values):
+    sub = _VARIANT_SUFFIX.sub
+    return [sub('', v) if '-' in v else v for v in values]
+
+def variant_group_ids(model_kodu):
+    """Model Kodu'nun sonundaki '-xxx' ekini atar; NaN -> ''."""
+    return _per_unique(model_kodu, _variant_values)
+
+# --- Boyut/Ebat ---
+
+def parse_dimensions(text):
+    """
+    Boyut/Ebat sütununu (örn. 18x20, 10*15*5) (Uzunluk, Genişlik, Yükseklik)
+    sütunlarına ayırır. Tek değer Yükseklik kabul edilir; boş değerler '' olur.
+    Ayrıştırma tekil değerler üzerinde Series.str ile yapılır.
+    """
+    codes, uniques = _factorize_text(text)
+    raw = pd.Series(uniques, dtype=object)
+    blank = (raw.str.strip() == '').to_numpy(dtype=bool)
+
+    clean = (raw.str.lower()
+             .str.replace('cm', '', regex=False)
+             .str.replace(',', '.', regex=False)
+             .str.strip()
+             .str.replace('*', 'x', regex=False)
+             .str.replace(' ', '', regex=False))
+    n_parts = clean.str.count('x').to_numpy(dtype='int64') + 1
+    parts = clean.str.split('x', n=3, expand=True).reindex(columns=range(3)).fillna('')
+
+    first = parts[0].to_numpy(dtype=object)
+    second = parts[1].to_numpy(dtype=object)
+    third = parts[2].to_numpy(dtype=object)
+    empty = np.full(len(clean), '', dtype=object)
+
+    multi = (n_parts >= 2) & ~blank
+    columns = (np.where(multi, first, empty),
+               np.where(multi, second, empty),
+               np.where(blank, empty, np.where(n_parts >= 3, third, np.where(n_parts == 1, first, empty))))
+
+    result = []
+    for column in columns:
+        values = np.empty(len(uniques) + 1, dtype=object)
+        values[:-1] = column
+        values[-1] = ''  # NaN
+        result.append(pd.Series(values.take(codes), index=text.index))
+    return tuple(result)
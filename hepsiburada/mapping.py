@@ -0,0 +1,158 @@
+"""
+Bildirimsel (declarative) sütun eşleştirme motoru.
+
+Her pazaryeri, hedef sütun -> kural sözlüğü olarak bir eşleştirme tanımı (spec)
+verir. Kurallar satır satır değil, bütün sütun üzerinde pandas/NumPy işlemleriyle
+uygulanır. Kural biçimleri:
+
+    ('const', değer)                  Sabit değer (örn. FIXED_BRAND)
+    ('clean', kaynak)                 clean_text: boşluk kırpma + satır sonlarını temizleme
+    ('strip', kaynak)                 Yalnızca boşluk kırpma
+    ('oneline', kaynak)               Satır sonlarını temizleme (kırpma yok)
+    ('clean_or', [kaynaklar], yedek)  Boş olmayan ilk kaynak, hiçbiri yoksa yedek değer
+    ('float', kaynak, varsayılan)     float(x); dönüşmezse varsayılan
+    ('int', kaynak, varsayılan)       int(float(x)); dönüşmezse varsayılan
+    ('number', kaynak)                pd.to_numeric(x); boşsa ''
+    ('int_or_empty', kaynak)          int(pd.to_numeric(x)); boşsa ''
+    callable                          df -> Series (türetilmiş alanlar için)
+
+Birden çok sütunu birlikte üreten kurallarda anahtar bir demet (tuple) olur ve
+callable aynı sırada Series demeti döndürür, örn. ('Uzunluk', 'Genişlik', 'Yükseklik').
+
+Sonuçlar eski iterrows döngüleriyle hücre hücre (değer ve tip) aynıdır.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+from catalog import dense_column
+from kernels import clean_text, oneline_text, strip_text
+
+# --- Kaynak Sütun Yardımcıları ---
+
+def source_column(df, source, default=np.nan):
+    """
+    Kaynak sütunu (kategori sütunlarını asıl tipinde) döndürür; sütun yoksa
+    row.get(source, default) gibi davranır.
+    """
+    if source in df.columns:
+        return dense_column(df[source])
+    return pd.Series(default, index=df.index, dtype=object)
+
+def _is_numeric(s):
+    return is_float_dtype(s.dtype) or is_integer_dtype(s.dtype) or is_bool_dtype(s.dtype)
+
+def _empty_if_na(s):
+    """NaN içeren sayısal sütunu '' ile doldurulmuş object sütuna çevirir."""
+    if s.isna().any():
+        return s.astype(object).where(s.notna(), '')
+    return s
+
+# --- Sayısal Dönüşümler ---
+
+def _scalar_float(value, default):
+    try: return float(value)
+    except: return default
+
+def _scalar_int(value, default):
+    try: return int(float(value))
+    except: return default
+
+def _scalar_number(value):
+    val = pd.to_numeric(value, errors='coerce')
+    return '' if pd.isna(val) else val
+
+def _scalar_int_or_empty(value):
+    val = pd.to_numeric(value, errors='coerce')
+    return '' if pd.isna(val) else int(val)
+
+def to_float(s, default):
+    if _is_numeric(s):
+        return s.astype('float64')
+    return s.map(lambda v: _scalar_float(v, default))
+
+def to_int(s, default):
+    if is_integer_dtype(s.dtype) or is_bool_dtype(s.dtype):
+        return s.astype('int64')
+    if is_float_dtype(s.dtype):
+        values = s.to_numpy(dtype='float64')
+        bad = ~np.isfinite(values)
+        out = np.trunc(np.where(bad, 0, values)).astype('int64')
+        out[bad] = default
+        return pd.Series(out, index=s.index)
+    return s.map(lambda v: _scalar_int(v, default))
+
+def to_number(s):
+    if _is_numeric(s):
+        return _empty_if_na(s)
+    return s.map(_scalar_number)
+
+def to_int_or_empty(s):
+    if is_integer_dtype(s.dtype) or is_bool_dtype(s.dtype):
+        return s.astype('int64')
+    if is_float_dtype(s.dtype):
+        values = s.to_numpy(dtype='float64')
+        bad = np.isnan(values)
+        if not bad.any():
+            return pd.Series(np.trunc(values).astype('int64'), index=s.index)
+        out = pd.Series(np.trunc(np.where(bad, 0, values)).astype('int64'), index=s.index).astype(object)
+        return out.where(~bad, '')
+    return s.map(_scalar_int_or_empty)
+
+# --- Kural Derleyici ---
+
+def _clean_or(df, sources, fallback):
+    result = clean_text(source_column(df, sources[0]))
+    for source in sources[1:]:
+        result = result.where(result != '', clean_text(source_column(df, source)))
+    return result.where(result != '', fallback)
+
+TRANSFORMS = {
+    'const': lambda df, value: value,
+    'clean': lambda df, source: clean_text(source_column(df, source)),
+    'strip': lambda df, source: strip_text(source_column(df, source)),
+    'oneline': lambda df, source: oneline_text(source_column(df, source)),
+    'clean_or': _clean_or,
+    'float': lambda df, source, default=0: to_float(source_column(df, source, default), default),
+    'int': lambda df, source, default=0: to_int(source_column(df, source, default), default),
+    'number': lambda df, source: to_number(source_column(df, source)),
+    'int_or_empty': lambda df, source: to_int_or_empty(source_column(df, source)),
+}
+
+def compile_spec(spec, columns=None):
+    """
+    Eşleştirme tanımını DataFrame -> DataFrame fonksiyonuna derler.
+    columns verilirse çıktı bu sırada olur ve tanımda olmayan sütunlar '' ile doldurulur;
+    tanımda olup columns'ta olmayan alanlar sona eklenir.
+    """
+    steps = []
+    for target, rule in spec.items():
+        if callable(rule):
+            steps.append((target, rule))
+        else:
+            kind, *args = rule
+            transform = TRANSFORMS[kind]
+            steps.append((target, lambda df, transform=transform, args=args: transform(df, *args)))
+
+    targets = [t for target, _ in steps for t in (target if isinstance(target, tuple) else (target,))]
+    output_columns = list(columns) if columns is not None else []
+    output_columns += [t for t in targets if t not in output_columns]
+
+    def run(df):
+        n = len(df)
+        values = {}
+        for target, fn in steps:
+            result = fn(df)
+            if isinstance(target, tuple):
+                pairs = zip(target, result)
+            else:
+                pairs = [(target, result)]
+            for t, r in pairs:
+                values[t] = r.reset_index(drop=True) if isinstance(r, pd.Series) else [r] * n
+        data = {col: values[col] if col in values else [''] * n for col in output_columns}
+        return pd.DataFrame(data, columns=output_columns)
+
+    return run
+
+def apply_spec(df, spec, columns=None):
+    return compile_spec(spec, columns)(df)
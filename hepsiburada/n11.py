@@ -1,12 +1,19 @@
-import pandas as pd
 import os
-import re
+
+from catalog import read_trendyol_export
+import kernels
+from mapping import compile_spec, source_column
+from profiling import enable_from_argv, phase
+from sharding import write_shards
+from xlsx_writer import write_frame
 
 # --- Dosya Ayarları ---
 # Girdi Dosyası
 trendyol_file = 'Ürünleriniz_05.12.2025-15.08.xlsx' 
 # Çıktı Dosyası
 output_file = 'N11_Yukleme_Final_V5.xlsx'
+# Dosya başına en fazla satır; verilirse çıktı parçalara bölünür (bkz. sharding.py). None = tek dosya
+max_rows_per_file = None
 
 # --- Sabit Değerler ---
 FIXED_CATEGORY_ID = "1000662"
@@ -29,126 +36,88 @@ n11_columns = [
     "Renk", "Seçenekler"
 ]
 
-# --- Yardımcı Fonksiyonlar ---
-
-def clean_text(text):
-    if pd.isna(text): return ''
-    return str(text).strip().replace('\n', ' ').replace('\r', '')
-
-def get_unique_sku(sku, sku_counts):
-    sku = str(sku).strip()
-    if not sku: return ''
-    if sku in sku_counts:
-        sku_counts[sku] += 1
-        return f"{sku}-{sku_counts[sku]-1}"
-    else:
-        sku_counts[sku] = 1
-        return sku
+# --- Eşleştirme Tanımı ---
+
+def _unique_skus(df):
+    return kernels.unique_skus(kernels.clean_text(source_column(df, 'Model Kodu')))
+
+n11_spec = {
+    "Stok Kodu": _unique_skus,
+    "Model Kodu": ('clean', 'Model Kodu'),
+    "Marka": ('const', FIXED_BRAND),
+    "Kategori": ('const', FIXED_CATEGORY_ID),
+    "Para Birimi": ('const', FIXED_CURRENCY),
+    "Ürün Adı": ('clean', 'Ürün Adı'),
+    "Ürün Açıklaması": ('clean', 'Ürün Açıklaması'),
+    "Piyasa Satış Fiyatı (KDV Dahil)": ('float', 'Piyasa Satış Fiyatı (KDV Dahil)', 0),
+    "N11 Satış Fiyatı (KDV Dahil)": ('float', "Trendyol'da Satılacak Fiyat (KDV Dahil)", 0),
+    "Stok": ('int', 'Ürün Stok Adedi', 0),
+    "KDV Oranı": ('int', 'KDV Oranı', 20),
+    **{f"Görsel {i}": ('clean', f'Görsel {i}') for i in range(1, 9)},
+    "Hazırlık Süresi": ('const', FIXED_PREP_TIME),
+    "Teslimat Şablonu İsmi": ('const', FIXED_DELIVERY_TEMPLATE),
+    "Barkod (GTIN,EAN)": ('clean', 'Barkod'),
+    "Renk": ('clean_or', ['Ürün Rengi'], "Diğer"),  # Renk boşsa "Diğer"
+    "Seçenekler": ('clean_or', ['Beden', 'Boyut/Ebat'], ""),  # Beden yoksa Boyut/Ebat
+}
+
+# --- Dönüştürme ---
+
+_map_n11 = compile_spec(n11_spec, n11_columns)
+
+def build_n11(df_trendyol, sku_registry=None):
+    """
+    Trendyol katalog DataFrame'ini N11 sütun düzenine dönüştürür.
+    sku_registry (SkuRegistry) verilirse Stok Kodu ekleri kayıttan alınır.
+    """
+    with phase('n11.map', rows=len(df_trendyol)):
+        df_output = _map_n11(df_trendyol)
+        if sku_registry is not None:
+            df_output['Stok Kodu'] = sku_registry.assign('n11', df_output['Barkod (GTIN,EAN)'], df_output['Model Kodu'])
+    return df_output
+
+def write_n11(df_output, output_file, max_rows=None):
+    """
+    N11 yükleme dosyasını yazar. max_rows verilirse aynı Model Kodu'ndaki ürünler bir
+    arada kalacak şekilde parçalara bölünür; parça listesinin yolu döndürülür.
+    """
+    if max_rows:
+        return write_shards(df_output, output_file, write_n11, 'Model Kodu', max_rows)
+    with phase('n11.write', rows=len(df_output)):
+        write_frame(output_file, 'N11 Ürün Yükleme', df_output)
+    return output_file
 
 # --- Ana İşlem ---
 
-if not os.path.exists(trendyol_file):
-    print(f"Hata: '{trendyol_file}' dosyası bulunamadı.")
-else:
+def main():
+    if not os.path.exists(trendyol_file):
+        print(f"Hata: '{trendyol_file}' dosyası bulunamadı.")
+        return
     try:
         print("Trendyol dosyası okunuyor...")
-        
-        # Başlık satırını bulma
-        df_check = pd.read_excel(trendyol_file, sheet_name='Ürünler', header=None)
-        header_idx = -1
-        for i, row in df_check.iterrows():
-            row_str = row.astype(str).tolist()
-            if 'Barkod' in row_str and 'Model Kodu' in row_str:
-                header_idx = i
-                break
-        
-        if header_idx == -1: raise ValueError("Başlık satırı bulunamadı.")
-
-        df_trendyol = pd.read_excel(trendyol_file, sheet_name='Ürünler', header=header_idx)
-        df_trendyol = df_trendyol.dropna(subset=['Barkod'])
 
-        n11_data = []
-        sku_counts = {}
+        # Başlık satırı bulma ve okuma tek geçişte yapılır
+        df_trendyol = read_trendyol_export(trendyol_file)
 
         print("Veriler N11 formatına dönüştürülüyor...")
 
-        for index, row in df_trendyol.iterrows():
-            
-            # Veri Hazırlığı
-            raw_model_kodu = clean_text(row.get('Model Kodu'))
-            unique_sku = get_unique_sku(raw_model_kodu, sku_counts)
-            
-            try: piyasa_fiyati = float(row.get('Piyasa Satış Fiyatı (KDV Dahil)', 0))
-            except: piyasa_fiyati = 0
-            
-            try: satis_fiyati = float(row.get("Trendyol'da Satılacak Fiyat (KDV Dahil)", 0))
-            except: satis_fiyati = 0
-            
-            try: stok = int(float(row.get('Ürün Stok Adedi', 0)))
-            except: stok = 0
-            
-            try: kdv = int(float(row.get('KDV Oranı', 20)))
-            except: kdv = 20
-
-            # Renk Kontrolü
-            renk_degeri = clean_text(row.get('Ürün Rengi'))
-            if not renk_degeri: # Eğer renk boşsa
-                renk_degeri = "Diğer"
-
-            # Seçenekler
-            secenek = clean_text(row.get('Beden'))
-            if not secenek:
-                secenek = clean_text(row.get('Boyut/Ebat'))
-
-            new_row = {
-                "Stok Kodu": unique_sku,
-                "Model Kodu": raw_model_kodu,
-                "Marka": FIXED_BRAND, 
-                "Kategori": FIXED_CATEGORY_ID, 
-                "Para Birimi": FIXED_CURRENCY,
-                "Ürün Adı": clean_text(row.get('Ürün Adı')),
-                "Ürün Açıklaması": clean_text(row.get('Ürün Açıklaması')),
-                "Piyasa Satış Fiyatı (KDV Dahil)": piyasa_fiyati,
-                "N11 Satış Fiyatı (KDV Dahil)": satis_fiyati,
-                "Stok": stok,
-                "KDV Oranı": kdv,
-                "Görsel 1": clean_text(row.get('Görsel 1')),
-                "Görsel 2": clean_text(row.get('Görsel 2')),
-                "Görsel 3": clean_text(row.get('Görsel 3')),
-                "Görsel 4": clean_text(row.get('Görsel 4')),
-                "Görsel 5": clean_text(row.get('Görsel 5')),
-                "Görsel 6": clean_text(row.get('Görsel 6')),
-                "Görsel 7": clean_text(row.get('Görsel 7')),
-                "Görsel 8": clean_text(row.get('Görsel 8')),
-                "Görsel 9": "", "Görsel 10": "", "Görsel 11": "", "Görsel 12": "",
-                "Hazırlık Süresi": FIXED_PREP_TIME,
-                "Teslimat Şablonu İsmi": FIXED_DELIVERY_TEMPLATE,
-                "Katalog ID": "",
-                "Barkod (GTIN,EAN)": clean_text(row.get('Barkod')),
-                "Maksimum Satış Adedi": "",
-                "Renk": renk_degeri,  # Güncellenen Renk Değeri
-                "Seçenekler": secenek
-            }
-            
-            ordered_row = {col: new_row.get(col, "") for col in n11_columns}
-            n11_data.append(ordered_row)
-
-        df_output = pd.DataFrame(n11_data)
-        df_output = df_output[n11_columns]
-
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df_output.to_excel(writer, index=False, sheet_name='N11 Ürün Yükleme')
-
-        print(f"İşlem Başarılı! Dosya kaydedildi: {output_file}")
+        df_output = build_n11(df_trendyol)
+        written = write_n11(df_output, output_file, max_rows_per_file)
+
+        print(f"İşlem Başarılı! Dosya kaydedildi: {written}")
         
         # İndirme (Google Colab için)
         try:
             from google.colab import files
-            files.download(output_file)
+            files.download(written)
         except ImportError:
             pass
 
     except Exception as e:
         print(f"Bir hata oluştu: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+
+if __name__ == '__main__':
+    enable_from_argv()
+    main()
@@ -1,10 +1,17 @@
-import pandas as pd
 import os
-import re
+
+from catalog import read_trendyol_export
+import kernels
+from mapping import compile_spec, source_column
+from profiling import enable_from_argv, phase
+from sharding import write_shards
+from xlsx_writer import write_frame
 
 # --- Dosya İsimleri ---
 trendyol_file = 'Ürünleriniz_28.11.2025-16.43.xlsx' 
 output_file = 'Pazarama_Yukleme_Final.xlsx'
+# Dosya başına en fazla satır; verilirse çıktı parçalara bölünür (bkz. sharding.py). None = tek dosya
+max_rows_per_file = None
 
 # --- Sabit Değerler ---
 FIXED_CATEGORY_ID = "ac9982d3-3e82-4efc-86fe-6792bb3931ee"
@@ -22,146 +29,94 @@ pazarama_columns = [
     "Ağırlık", "Uzunluk", "Genişlik", "Yükseklik", "Tema"
 ]
 
-# --- Yardımcı Fonksiyonlar ---
-
-def clean_text(text):
-    if pd.isna(text): return ''
-    return str(text).strip().replace('\n', ' ').replace('\r', '')
-
-def get_unique_sku(sku, sku_counts):
-    sku = str(sku).strip()
-    if not sku: return ''
-    if sku in sku_counts:
-        sku_counts[sku] += 1
-        return f"{sku}-{sku_counts[sku]-1}"
-    else:
-        sku_counts[sku] = 1
-        return sku
+# --- Eşleştirme Tanımı ---
+
+def _unique_skus(df):
+    return kernels.unique_skus(kernels.clean_text(source_column(df, 'Model Kodu')))
+
+def _dimensions(df):
+    return kernels.parse_dimensions(source_column(df, 'Boyut/Ebat'))
+
+pazarama_spec = {
+    "Barkod": ('clean', 'Barkod'),
+    "Marka": ('const', FIXED_BRAND),  # ---> BURASI "HIVHESTİN" OLARAK AYARLANDI
+    "Grup Kodu": ('clean', 'Model Kodu'),
+    "Kategori": ('const', FIXED_CATEGORY_ID),
+    "Para Birimi": ('const', FIXED_CURRENCY),
+    "Ürün Adı": ('clean', 'Ürün Adı'),
+    "Ürün Açıklama": ('clean', 'Ürün Açıklaması'),
+    "Satış Fiyatı": ('float', 'Piyasa Satış Fiyatı (KDV Dahil)', 0),
+    "İndirimli Satış Fiyatı": ('float', "Trendyol'da Satılacak Fiyat (KDV Dahil)", 0),
+    "Stok Adedi": ('int', 'Ürün Stok Adedi', 0),
+    "Stok Kodu": _unique_skus,
+    "KDV Oranı": ('int', 'KDV Oranı', 20),
+    "Görsel Linki-1": ('clean', 'Görsel 1'),
+    "Görsel Linki-2": ('clean', 'Görsel 2'),
+    "Görsel Linki-3": ('clean', 'Görsel 3'),
+    "Görsel Linki-4": ('clean', 'Görsel 4'),
+    "Görsel Linki-5": ('clean', 'Görsel 5'),
+    "renk seçimi": ('const', "Çok Renkli"), # Sabit Değer
+    "Renk": ('clean', 'Ürün Rengi'),
+    "Materyal": ('const', "Plastik"),       # Sabit Değer (PLA yerine)
+    "Ölçü": ('const', "Tekli"),             # Sabit Değer
+    ("Uzunluk", "Genişlik", "Yükseklik"): _dimensions,
+}
+
+# --- Dönüştürme ---
+
+_map_pazarama = compile_spec(pazarama_spec, pazarama_columns)
+
+def build_pazarama(df_trendyol, sku_registry=None):
+    """
+    Trendyol katalog DataFrame'ini Pazarama sütun düzenine dönüştürür.
+    sku_registry (SkuRegistry) verilirse Stok Kodu ekleri kayıttan alınır.
+    """
+    with phase('pazarama.map', rows=len(df_trendyol)):
+        df_output = _map_pazarama(df_trendyol)
+        if sku_registry is not None:
+            df_output['Stok Kodu'] = sku_registry.assign('pazarama', df_output['Barkod'], df_output['Grup Kodu'])
+    return df_output
 
-def parse_dimensions(text):
+def write_pazarama(df_output, output_file, max_rows=None):
     """
-    Boyut/Ebat verisini (Örn: 18x20, 10*15*5) Uzunluk, Genişlik, Yükseklik olarak ayırır.
+    Pazarama yükleme dosyasını yazar. max_rows verilirse aynı Grup Kodu'ndaki ürünler
+    bir arada kalacak şekilde parçalara bölünür; parça listesinin yolu döndürülür.
     """
-    if pd.isna(text) or not str(text).strip():
-        return "", "", ""
-    
-    # Metni temizle
-    clean = str(text).lower().replace('cm', '').replace(',', '.').strip()
-    clean = clean.replace('*', 'x').replace(' ', '')
-    
-    parts = clean.split('x')
-    l, w, h = "", "", ""
-    
-    try:
-        if len(parts) >= 3:
-            l, w, h = parts[0], parts[1], parts[2]
-        elif len(parts) == 2:
-            l, w = parts[0], parts[1]
-        elif len(parts) == 1:
-            h = parts[0] # Tek boyut ise Yükseklik olarak kabul ediyoruz
-    except:
-        pass
-        
-    return l, w, h
+    if max_rows:
+        return write_shards(df_output, output_file, write_pazarama, 'Grup Kodu', max_rows)
+    with phase('pazarama.write', rows=len(df_output)):
+        write_frame(output_file, 'Ürün Listesi', df_output)
+    return output_file
 
 # --- Ana İşlem ---
 
-if not os.path.exists(trendyol_file):
-    print(f"Hata: '{trendyol_file}' dosyası bulunamadı.")
-else:
+def main():
+    if not os.path.exists(trendyol_file):
+        print(f"Hata: '{trendyol_file}' dosyası bulunamadı.")
+        return
     try:
         print("Dosya okunuyor ve dönüştürülüyor...")
-        
-        # Başlık satırını bulma
-        df_check = pd.read_excel(trendyol_file, sheet_name='Ürünler', header=None)
-        header_idx = -1
-        for i, row in df_check.iterrows():
-            row_str = row.astype(str).tolist()
-            if 'Barkod' in row_str and 'Model Kodu' in row_str:
-                header_idx = i
-                break
-        
-        if header_idx == -1: raise ValueError("Başlık satırı bulunamadı.")
-
-        df_trendyol = pd.read_excel(trendyol_file, sheet_name='Ürünler', header=header_idx)
-        df_trendyol = df_trendyol.dropna(subset=['Barkod'])
-
-        pazarama_data = []
-        sku_counts = {}
-
-        for index, row in df_trendyol.iterrows():
-            
-            # Veri Hazırlığı
-            model_kodu = clean_text(row.get('Model Kodu'))
-            unique_stok_kodu = get_unique_sku(model_kodu, sku_counts)
-            
-            # Fiyatlar
-            try: satis_fiyati = float(row.get('Piyasa Satış Fiyatı (KDV Dahil)', 0))
-            except: satis_fiyati = 0
-            
-            try: indirimli_fiyat = float(row.get("Trendyol'da Satılacak Fiyat (KDV Dahil)", 0))
-            except: indirimli_fiyat = 0
-            
-            try: stok = int(float(row.get('Ürün Stok Adedi', 0)))
-            except: stok = 0
-            
-            try: kdv = int(float(row.get('KDV Oranı', 20)))
-            except: kdv = 20
-
-            # Boyut Ayrıştırma
-            raw_boyut = row.get('Boyut/Ebat')
-            uzunluk, genislik, yukseklik = parse_dimensions(raw_boyut)
-
-            new_row = {
-                "Barkod": clean_text(row.get('Barkod')),
-                "Marka": FIXED_BRAND,  # ---> BURASI "HIVHESTİN" OLARAK AYARLANDI
-                "Grup Kodu": model_kodu,
-                "Kategori": FIXED_CATEGORY_ID,
-                "Para Birimi": FIXED_CURRENCY,
-                "Ürün Adı": clean_text(row.get('Ürün Adı')),
-                "Ürün Açıklama": clean_text(row.get('Ürün Açıklaması')),
-                "Satış Fiyatı": satis_fiyati,
-                "İndirimli Satış Fiyatı": indirimli_fiyat,
-                "Stok Adedi": stok,
-                "Stok Kodu": unique_stok_kodu,
-                "KDV Oranı": kdv,
-                "Görsel Linki-1": clean_text(row.get('Görsel 1')),
-                "Görsel Linki-2": clean_text(row.get('Görsel 2')),
-                "Görsel Linki-3": clean_text(row.get('Görsel 3')),
-                "Görsel Linki-4": clean_text(row.get('Görsel 4')),
-                "Görsel Linki-5": clean_text(row.get('Görsel 5')),
-                "Maksimum Ürün Satış Adedi Kısıtı": "",
-                "Ürün Bilgi Formu": "",
-                "renk seçimi": "Çok Renkli", # Sabit Değer
-                "Renk": clean_text(row.get('Ürün Rengi')),
-                "Materyal": "Plastik",       # Sabit Değer (PLA yerine)
-                "Ölçü": "Tekli",             # Sabit Değer
-                "Ağırlık": "",
-                "Uzunluk": uzunluk,
-                "Genişlik": genislik,
-                "Yükseklik": yukseklik,
-                "Tema": ""
-            }
-            
-            ordered_row = {col: new_row.get(col, "") for col in pazarama_columns}
-            pazarama_data.append(ordered_row)
 
-        # Kaydetme
-        df_output = pd.DataFrame(pazarama_data)
-        df_output = df_output[pazarama_columns]
+        # Başlık satırı bulma ve okuma tek geçişte yapılır
+        df_trendyol = read_trendyol_export(trendyol_file)
 
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-            df_output.to_excel(writer, index=False, sheet_name='Ürün Listesi')
+        # Kaydetme
+        df_output = build_pazarama(df_trendyol)
+        written = write_pazarama(df_output, output_file, max_rows_per_file)
 
-        print(f"Başarılı! '{output_file}' dosyası oluşturuldu.")
+        print(f"Başarılı! '{written}' dosyası oluşturuldu.")
         
         try:
             from google.colab import files
-            files.download(output_file)
+            files.download(written)
         except ImportError:
             pass
 
     except Exception as e:
         print(f"Bir hata oluştu: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+
+if __name__ == '__main__':
+    enable_from_argv()
+    main()
@@ -0,0 +1,294 @@
+"""
+Tek okuma, çoklu pazaryeri dönüştürme hattı.
+
+Trendyol 'Ürünleriniz_*.xlsx' dosyası bir kez okunur; Hepsiburada, Pazarama, N11
+ve Idefix çıktıları aynı katalogdan üretilip eşzamanlı olarak yazılır.
+
+Kullanım:
+    python pipeline.py "Ürünleriniz_02.01.2026-23.27.xlsx" --output-dir cikti
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cache
+from catalog import locate_header, read_trendyol_export
+import profiling
+from profiling import phase
+import convert
+import delta
+import idefix
+import image_check
+import n11
+import pazarama
+import pricing
+from sharding import manifest_path
+from sku_registry import SkuRegistry
+import validation
+import variants
+
+MARKETPLACES = ('hepsiburada', 'pazarama', 'n11', 'idefix')
+PRICE_STOCK_FEED_FILE = 'Fiyat_Stok_Guncelleme_{marketplace}.csv'
+
+# --- Pazaryeri İşleri ---
+
+def _output(df, output_dir, file_name, options):
+    """Delta modunda yalnızca yeni/değişen satırları ve '_delta' ekli dosya yolunu döndürür."""
+    rows = options.get('rows')
+    if rows is None:
+        return df, os.path.join(output_dir, file_name)
+    stem, ext = os.path.splitext(file_name)
+    return df.iloc[rows], os.path.join(output_dir, f"{stem}_delta{ext}")
+
+def _hepsiburada_frame(catalog_df, options):
+    cols, header_rows = convert.read_hepsiburada_template(options['hepsiburada_template'], convert.hepsiburada_sheet_name)
+    df = convert.map_data(catalog_df, cols, options['sku_registry'])
+    return df, convert.output_file, lambda df, path, max_rows=None: convert.write_hepsiburada(df, header_rows, path,
+                                                                                              max_rows=max_rows)
+
+def _pazarama_frame(catalog_df, options):
+    return pazarama.build_pazarama(catalog_df, options['sku_registry']), pazarama.output_file, pazarama.write_pazarama
+
+def _n11_frame(catalog_df, options):
+    return n11.build_n11(catalog_df, options['sku_registry']), n11.output_file, n11.write_n11
+
+def _idefix_frame(catalog_df, options):
+    target_columns = idefix.idefix_sablon_sutunlarini_oku(options['idefix_template'])
+    df = idefix.idefix_verisini_esle(catalog_df, target_columns)
+    return df, idefix.output_file, idefix.idefix_dosyasini_yaz
+
+# Pazaryeri -> (katalog, seçenekler) ile (eşlenmiş DataFrame, çıktı dosya adı, yazıcı(df, yol, max_rows))
+FRAMES = {
+    'hepsiburada': _hepsiburada_frame,
+    'pazarama': _pazarama_frame,
+    'n11': _n11_frame,
+    'idefix': _idefix_frame,
+}
+
+# Pazaryeri -> fiyat/stok akışının eşlenmiş çıktıdaki sütunları (stok kodu, barkod, fiyatlar, stok)
+# ve stok sütunu; akış pazaryerinin kendi stok koduyla eşleşir
+PRICE_STOCK_FEEDS = {
+    'hepsiburada': (['Satıcı Stok Kodu', 'Barkod', 'Fiyat', 'Stok'], 'Stok'),
+    'pazarama': (['Stok Kodu', 'Barkod', 'Satış Fiyatı', 'İndirimli Satış Fiyatı', 'Stok Adedi'], 'Stok Adedi'),
+    'n11': (['Stok Kodu', 'Barkod (GTIN,EAN)', 'Piyasa Satış Fiyatı (KDV Dahil)', 'N11 Satış Fiyatı (KDV Dahil)',
+             'Stok'], 'Stok'),
+    'idefix': (['Sat?c? Stok Kodu', 'Barkod', 'Idefix Sat?? Fiyat?', 'Piyasa Sat?? Fiyat?', 'Stok Adedi'],
+               'Stok Adedi'),
+}
+
+def _frame(name, catalog_df, options):
+    if options.get('pricing_rules'):
+        catalog_df = pricing.reprice(catalog_df, options['pricing_rules'], name)
+    return FRAMES[name](catalog_df, options)
+
+def price_stock_feed_path(output_dir, name):
+    return os.path.join(output_dir, PRICE_STOCK_FEED_FILE.format(marketplace=name))
+
+def price_stock_frame(name, df, options):
+    """
+    Pazaryerinin eşlenmiş çıktısından (df) fiyat/stok akışı; seçeneklerde 'changes'
+    (delta.compute_delta) ve 'previous_df' olmalı. Silinen ürünler önceki katalogdan eşlenir.
+    """
+    changes = options['changes']
+    previous = _frame(name, options['previous_df'], options)[0] if len(changes['deleted_pos']) else None
+    columns, stock_column = PRICE_STOCK_FEEDS[name]
+    return delta.price_stock_feed(df, changes, previous, columns, stock_column)
+
+def _job(name):
+    def job(catalog_df, output_dir, options):
+        df, file_name, write = _frame(name, catalog_df, options)
+        feed = price_stock_frame(name, df, options) if options.get('changes') is not None else None
+        df, path = _output(df, output_dir, file_name, options)
+        max_rows = options.get('max_rows')
+
+        def write_all():
+            write(df, path, max_rows=max_rows)
+            if feed is not None:
+                feed.to_csv(price_stock_feed_path(output_dir, name), sep=';', index=False, encoding='utf-8-sig')
+
+        return write_all, manifest_path(path) if max_rows else path
+    return job
+
+# Pazaryeri -> (katalog, çıktı klasörü, seçenekler) ile (yazma fonksiyonu, çıktı yolu)
+# Seçeneklerde 'max_rows' varsa çıktı parçalara bölünür ve yol parça listesini gösterir;
+# 'pricing_rules' varsa katalog pazaryeri için önce yeniden fiyatlanır (bkz. pricing.py);
+# 'changes' (delta.compute_delta) ve 'previous_df' varsa yazma fonksiyonu pazaryerinin
+# fiyat/stok akışını da price_stock_feed_path'e yazar
+JOBS = {name: _job(name) for name in FRAMES}
+
+# --- Ana İşlem ---
+
+def convert_catalog(catalog_df, output_dir='.', marketplaces=MARKETPLACES,
+                    hepsiburada_template=convert.hepsiburada_template_file,
+                    idefix_template=idefix.template_file, max_workers=None, sku_registry_file=None,
+                    previous_df=None, image_cache=None, validate=False, max_rows=None, pricing_rules=None):
+    """
+    Okunmuş kataloğu seçilen pazaryerleri için dönüştürür ve dosyaları paralel yazar.
+    {pazaryeri: çıktı yolu} döndürür. previous_df (önceki katalog) verilirse yalnızca
+    yeni ve değişen ürünler '_delta' dosyalarına, fiyat/stok değişimleri ve silinen
+    ürünler her pazaryeri için ayrı PRICE_STOCK_FEED_FILE'a yazılır. Diğer parametreler
+    için run_pipeline'a bakın.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    if validate:
+        report = validation.validate_catalog(catalog_df)
+        validation.write_report(report, os.path.join(output_dir, validation.REPORT_FILE))
+        print(f"Doğrulama: {validation.summary(report)}")
+        if validation.has_errors(report):
+            raise validation.CatalogValidationError(report)
+
+    sku_registry = SkuRegistry(sku_registry_file) if sku_registry_file else None
+    options = {'hepsiburada_template': hepsiburada_template, 'idefix_template': idefix_template,
+               'sku_registry': sku_registry, 'max_rows': max_rows, 'pricing_rules': pricing_rules}
+
+    changes = None
+    if previous_df is not None:
+        with phase('delta', rows=len(catalog_df)):
+            changes = delta.compute_delta(previous_df, catalog_df)
+            options.update(rows=delta.upload_positions(changes), changes=changes, previous_df=previous_df)
+        print(f"Delta: {delta.summary(changes)}")
+
+    image_report = None
+    if image_cache:
+        image_report, results = image_check.validate_catalog_images(catalog_df, cache_file=image_cache)
+        print(f"Görsel kontrolü: {len(results)} tekil URL, {len(image_report)} geçersiz görsel")
+
+    writers = {}
+    try:
+        for name in marketplaces:
+            write, path = JOBS[name](catalog_df, output_dir, options)
+            writers[name] = (write, path)
+    finally:
+        if sku_registry is not None:
+            sku_registry.close()
+
+    outputs = {name: path for name, (_, path) in writers.items()}
+    if changes is not None:
+        outputs.update({f"fiyat_stok_{name}": price_stock_feed_path(output_dir, name) for name in marketplaces})
+
+    if image_report is not None:
+        report_path = os.path.join(output_dir, image_check.REPORT_FILE)
+        writers['gorsel_kontrol'] = (lambda: image_report.to_csv(report_path, sep=';', index=False, encoding='utf-8-sig'),
+                                     report_path)
+
+    with phase('write_all'), ThreadPoolExecutor(max_workers=max_workers or len(writers) or 1) as pool:
+        futures = {name: pool.submit(write) for name, (write, _) in writers.items()}
+        for future in futures.values():
+            future.result()
+
+    return outputs
+
+def run_pipeline(trendyol_file, output_dir='.', marketplaces=MARKETPLACES,
+                 hepsiburada_template=convert.hepsiburada_template_file,
+                 idefix_template=idefix.template_file, max_workers=None, sku_registry_file=None,
+                 delta_from=None, cache_dir=None, image_cache=None, validate=False, max_rows=None,
+                 pricing_rules=None, fill_variant_groups=False):
+    """
+    Trendyol dosyasını tek sefer okur, seçilen pazaryerleri için çıktıları hazırlar
+    ve dosyaları paralel yazar. {pazaryeri: çıktı yolu} döndürür.
+    sku_registry_file verilirse stok kodu ekleri bu kalıcı kayıttan alınır.
+    delta_from (anlık görüntü .pkl ya da eski Trendyol .xlsx) verilirse yalnızca yeni ve
+    değişen ürünler '_delta' dosyalarına, fiyat/stok değişimleri ve silinen ürünler
+    pazaryerinin kendi stok kodlarıyla PRICE_STOCK_FEED_FILE'a (pazaryeri başına bir dosya)
+    yazılır. .pkl anlık görüntü her çalıştırmadan sonra güncellenir.
+    cache_dir verilirse ayrıştırılmış katalog bu klasörde önbelleğe alınır (bkz. cache.py).
+    image_cache verilirse görsel URL'leri denetlenir (sonuçlar bu SQLite dosyasında
+    saklanır) ve geçersiz görseller image_check.REPORT_FILE'a yazılır.
+    validate True ise katalog önce doğrulanır (bkz. validation.py), rapor
+    validation.REPORT_FILE'a yazılır; hata varsa hiçbir çıktı yazılmadan
+    validation.CatalogValidationError yükselir.
+    max_rows verilirse her çıktı en fazla max_rows satırlık parçalara bölünür; varyant
+    grupları bölünmez, parçalar paralel yazılır ve dönen yol parça listesidir (bkz. sharding.py).
+    pricing_rules (pricing.load_rules sözlüğü) verilirse her pazaryerinin fiyatları kurallara
+    göre yeniden hesaplanır; fiyat/stok akışları da yeniden fiyatlanmış çıktılardan kurulur.
+    fill_variant_groups True ise görselleri ya da açıklaması boş varyantlar grubun ilk dolu
+    satırından doldurulur (bkz. variants.py); delta anlık görüntüsü de doldurulmuş katalogdur.
+    """
+    if cache_dir:
+        catalog_df = cache.read_trendyol_export_cached(trendyol_file, cache_dir=cache_dir)
+    else:
+        catalog_df = read_trendyol_export(trendyol_file)
+    if fill_variant_groups:
+        catalog_df = variants.fill_variant_groups(catalog_df)
+
+    previous_df = None
+    if delta_from and os.path.exists(delta_from):
+        previous_df = delta.load_snapshot(delta_from)
+
+    outputs = convert_catalog(catalog_df, output_dir, marketplaces, hepsiburada_template, idefix_template,
+                              max_workers, sku_registry_file, previous_df, image_cache, validate, max_rows,
+                              pricing_rules)
+
+    # Başarılı çalıştırmadan sonra bir sonraki delta için anlık görüntüyü güncelle
+    if delta_from and not delta_from.lower().endswith(('.xlsx', '.xlsm')):
+        delta.save_snapshot(catalog_df, delta_from)
+
+    return outputs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Trendyol dışa aktarımını tüm pazaryeri formatlarına dönüştürür.')
+    parser.add_argument('trendyol_file', help="Trendyol 'Ürünleriniz_*.xlsx' dosyası")
+    parser.add_argument('--output-dir', default='.', help='Çıktı klasörü')
+    parser.add_argument('--marketplaces', nargs='+', choices=MARKETPLACES, default=list(MARKETPLACES))
+    parser.add_argument('--hepsiburada-template', default=convert.hepsiburada_template_file)
+    parser.add_argument('--idefix-template', default=idefix.template_file)
+    parser.add_argument('--sku-registry', help="Kalıcı stok kodu kaydı (SQLite), örn. sku_registry.sqlite")
+    parser.add_argument('--delta-from', help="Son işlenen anlık görüntü (.pkl) ya da eski Trendyol dosyası; "
+                                             "verilirse yalnızca değişen ürünler yazılır")
+    parser.add_argument('--cache-dir', default=cache.CACHE_DIR, help='Ayrıştırılmış katalog önbelleği klasörü')
+    parser.add_argument('--no-cache', action='store_true', help='Önbelleği kullanma, dosyayı her seferinde ayrıştır')
+    parser.add_argument('--check-images', nargs='?', const=image_check.CACHE_FILE, metavar='ONBELLEK',
+                        help='Görsel URL\'lerini denetle ve geçersizleri rapora yaz (sonuç önbelleği SQLite)')
+    parser.add_argument('--validate', action='store_true',
+                        help='Yazmadan önce kataloğu doğrula; hata varsa rapor yazıp dur')
+    parser.add_argument('--max-rows', type=int, metavar='SATIR',
+                        help='Dosya başına en fazla satır; aşan çıktılar varyant grupları bölünmeden parçalanır')
+    parser.add_argument('--fill-variant-groups', action='store_true',
+                        help='Görseli/açıklaması boş varyantları grubun ilk dolu satırından doldur')
+    parser.add_argument('--pricing-rules', metavar='JSON',
+                        help='Pazaryeri/kategori fiyatlandırma kuralları dosyası (bkz. pricing.py)')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='DOSYA',
+                        help='Aşama sürelerini JSON satırı olarak DOSYA\'ya (verilmezse stderr\'e) yaz')
+    args = parser.parse_args(argv)
+
+    if args.profile is not None:
+        profiling.enable(None if args.profile == '-' else args.profile)
+
+    pricing_rules = None
+    if args.pricing_rules:
+        try:
+            pricing_rules = pricing.load_rules(args.pricing_rules)
+        except (OSError, ValueError) as exc:
+            print(f"Hata: fiyat kuralları okunamadı ({args.pricing_rules}): {exc}")
+            return 1
+
+    if not os.path.exists(args.trendyol_file):
+        print(f"Hata: '{args.trendyol_file}' dosyası bulunamadı.")
+        return 1
+
+    # Başlık satırını yalnızca ilk satırları tarayarak kontrol et; tam okumaya geçmeden hata ver
+    header_idx, _ = locate_header(args.trendyol_file)
+    if header_idx == -1:
+        print(f"Hata: '{args.trendyol_file}' dosyasında başlık satırı ('Barkod', 'Model Kodu') bulunamadı.")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        outputs = run_pipeline(args.trendyol_file, args.output_dir, args.marketplaces,
+                               args.hepsiburada_template, args.idefix_template,
+                               sku_registry_file=args.sku_registry, delta_from=args.delta_from,
+                               cache_dir=None if args.no_cache else args.cache_dir,
+                               image_cache=args.check_images, validate=args.validate, max_rows=args.max_rows,
+                               pricing_rules=pricing_rules, fill_variant_groups=args.fill_variant_groups)
+    except validation.CatalogValidationError as exc:
+        print(f"Hata: {exc}. Rapor: {os.path.join(args.output_dir, validation.REPORT_FILE)}")
+        return 1
+    for name, path in outputs.items():
+        print(f"{name}: {path}")
+    print(f"Dönüştürme tamamlandı ({time.perf_counter() - start:.2f} sn).")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
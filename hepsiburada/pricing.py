@@ -0,0 +1,209 @@
+"""
+Pazaryeri ve kategori bazlı fiyatlandırma kuralları.
+
+Dönüştürücüler fiyatları Trendyol kataloğundan olduğu gibi kopyalar: liste fiyatı
+'Piyasa Satış Fiyatı', satış/indirimli fiyat Trendyol fiyatıdır. Bir kural dosyası
+verildiğinde her pazaryerinin kataloğu dönüştürmeden önce yeniden fiyatlanır;
+dönüştürücülerin eşleştirme tanımları değişmez. Dosya çıktıları, delta fiyat/stok
+akışları (pipeline.py) ve API yüklemesi (upload.py) aynı kurallarla fiyatlanır.
+
+Kural dosyası (JSON), pazaryeri -> kategori ('Kategori İsmi') -> kural biçimindedir.
+'*' anahtarı varsayılan kuraldır: en üstteki '*' bütün pazaryerlerine, pazaryeri
+içindeki '*' o pazaryerinin tüm kategorilerine uygulanır. Kategori kuralı yalnızca
+verdiği alanları ezer, diğerlerini üst kuraldan alır:
+
+    {
+      "*":   {"commission_pct": 0, "ending": 0.9},
+      "n11": {"*": {"markup_pct": 10, "commission_pct": 18, "min": 100},
+              "Karakter Figür Oyuncak": {"markup_pct": 15, "round_step": 10, "ending": 9.9}},
+      "pazarama": {"*": {"markup_fixed": 25, "applies_to": ["sale"]}}
+    }
+
+Kural alanları (RULE_FIELDS) şu sırayla uygulanır:
+
+    fiyat = taban * (1 + markup_pct / 100) + markup_fixed     Yüzde ve sabit kâr
+    fiyat = fiyat / (1 - commission_pct / 100)                  Komisyon sonrası net korunur
+    fiyat = ceil((fiyat - ending) / round_step) * round_step + ending
+                                                                Psikolojik yuvarlama (yukarı);
+                                                                ending verilip round_step verilmezse adım 1
+    fiyat = min(max(fiyat, min), max)                           Alt/üst sınır
+    fiyat = round(fiyat, 2)
+
+applies_to kuralın hangi fiyatlara ('list', 'sale'; bkz. PRICE_COLUMNS) uygulanacağını
+seçer. Kurallar compile_rules ile kategori başına parametre tablolarına derlenir;
+fiyatlama her satırın parametresini kategori koduyla toplayıp tüm katalog üzerinde
+tek NumPy ifadesiyle yapılır. Fiyatı boş/sayı olmayan satırlar değişmez.
+"""
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from catalog import dense_column
+from mapping import source_column, to_float
+from profiling import phase
+
+# --- Ayarlar ---
+MARKETPLACES = ('hepsiburada', 'pazarama', 'n11', 'idefix')
+DEFAULT_KEY = '*'
+CATEGORY_COLUMN = 'Kategori İsmi'
+# Kurallardaki fiyat adı -> kataloğun fiyat sütunu
+PRICE_COLUMNS = {
+    'list': 'Piyasa Satış Fiyatı (KDV Dahil)',
+    'sale': "Trendyol'da Satılacak Fiyat (KDV Dahil)",
+}
+# Kural alanı -> etkisiz (kural yokken geçerli) değer
+RULE_FIELDS = {
+    'markup_pct': 0.0,
+    'markup_fixed': 0.0,
+    'commission_pct': 0.0,
+    'round_step': 0.0,
+    'ending': 0.0,
+    'min': math.nan,
+    'max': math.nan,
+}
+NUMERIC_FIELDS = tuple(RULE_FIELDS)
+
+class PricingRuleError(ValueError):
+    """Kural dosyası geçersiz."""
+
+# --- Kural Dosyası ---
+
+def _check_bounds(rule, where):
+    if 'min' in rule and 'max' in rule and rule['min'] > rule['max']:
+        raise PricingRuleError(f"{where}: 'min' ({rule['min']:g}) 'max' değerinden ({rule['max']:g}) büyük")
+
+def _check_rule(rule, where):
+    if not isinstance(rule, dict):
+        raise PricingRuleError(f"{where}: kural bir sözlük olmalı")
+    unknown = set(rule) - set(RULE_FIELDS) - {'applies_to'}
+    if unknown:
+        raise PricingRuleError(f"{where}: bilinmeyen alan(lar): {', '.join(sorted(unknown))}")
+    for field in NUMERIC_FIELDS:
+        if field in rule and (isinstance(rule[field], bool) or not isinstance(rule[field], (int, float))):
+            raise PricingRuleError(f"{where}: '{field}' sayı olmalı")
+    if not 0 <= rule.get('commission_pct', 0) < 100:
+        raise PricingRuleError(f"{where}: 'commission_pct' 0 ile 100 arasında olmalı")
+    if rule.get('round_step', 0) < 0:
+        raise PricingRuleError(f"{where}: 'round_step' negatif olamaz")
+    _check_bounds(rule, where)
+    if 'applies_to' in rule:
+        names = rule['applies_to']
+        if isinstance(names, str) or not set(names) <= set(PRICE_COLUMNS):
+            raise PricingRuleError(f"{where}: 'applies_to' {list(PRICE_COLUMNS)} listesinden seçilmeli")
+
+def validate_rules(rules):
+    """Kural sözlüğünü denetler; geçersizse PricingRuleError yükseltir."""
+    if not isinstance(rules, dict):
+        raise PricingRuleError("Kural dosyası pazaryeri -> kategori -> kural sözlüğü olmalı")
+    for marketplace, categories in rules.items():
+        if marketplace == DEFAULT_KEY:
+            _check_rule(categories, DEFAULT_KEY)
+            continue
+        if marketplace not in MARKETPLACES:
+            raise PricingRuleError(f"Bilinmeyen pazaryeri: {marketplace} (seçenekler: {', '.join(MARKETPLACES)})")
+        if not isinstance(categories, dict):
+            raise PricingRuleError(f"{marketplace}: kategori -> kural sözlüğü olmalı")
+        for category, rule in categories.items():
+            _check_rule(rule, f"{marketplace}/{category}")
+    # Birleşmiş kurallar da denetlenir: min üst kuraldan, max kategori kuralından gelebilir
+    for marketplace in MARKETPLACES:
+        _resolved_rules(rules, marketplace)
+    return rules
+
+def load_rules(path):
+    """JSON kural dosyasını okur ve denetler."""
+    with open(path, encoding='utf-8') as f:
+        return validate_rules(json.load(f))
+
+# --- Derleme ---
+
+def _resolve(*rules):
+    """Üstten alta kuralları birleştirir; ending verilip adım verilmemişse adım 1 olur."""
+    merged = {}
+    for rule in rules:
+        merged.update(rule)
+    if merged.get('ending') and not merged.get('round_step'):
+        merged['round_step'] = 1.0
+    return merged
+
+def _category_codes(catalog_df):
+    """Satırların kategori kodları ve kod -> kategori; category tipinde kodlar doğrudan kullanılır."""
+    column = catalog_df[CATEGORY_COLUMN] if CATEGORY_COLUMN in catalog_df.columns else None
+    if column is not None and isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories
+    return pd.factorize(source_column(catalog_df, CATEGORY_COLUMN))
+
+def _resolved_rules(rules, marketplace):
+    """(varsayılan kural, {kategori: birleşmiş kural}); birleşmiş sınırlar tutarsızsa hata."""
+    marketplace_rules = dict(rules.get(marketplace, {}))
+    base = _resolve(rules.get(DEFAULT_KEY, {}), marketplace_rules.pop(DEFAULT_KEY, {}))
+    _check_bounds(base, f"{marketplace}/{DEFAULT_KEY}")
+    resolved = {}
+    for category, rule in marketplace_rules.items():
+        resolved[category] = _resolve(base, rule)
+        _check_bounds(resolved[category], f"{marketplace}/{category}")
+    return base, resolved
+
+def compile_rules(rules, marketplace):
+    """
+    Pazaryerinin kurallarını katalog -> katalog fonksiyonuna derler. Pazaryeri için
+    kural yoksa katalog olduğu gibi döner. Dönen katalog sığ kopyadır; yalnızca
+    PRICE_COLUMNS sütunları yeniden fiyatlanmış değerlerle değişir.
+    """
+    base, category_rules = _resolved_rules(rules, marketplace)
+    if not base and not category_rules:
+        return lambda catalog_df: catalog_df
+
+    # Parametre tablosu: 0. satır varsayılan kural, sonrakiler kategoriler
+    categories = pd.Index(list(category_rules))
+    resolved = [base] + [category_rules[c] for c in categories]
+    tables = {}
+    for price in PRICE_COLUMNS:
+        applies = np.array([price in r.get('applies_to', PRICE_COLUMNS) and bool(set(r) - {'applies_to'})
+                            for r in resolved])
+        params = {field: np.array([float(r.get(field, neutral)) for r in resolved])
+                  for field, neutral in RULE_FIELDS.items()}
+        tables[price] = (applies, params)
+
+    def run(catalog_df):
+        with phase(f'pricing.{marketplace}', rows=len(catalog_df)):
+            if len(categories):
+                codes, uniques = _category_codes(catalog_df)
+                # Kategori kodu -> tablo satırı; NaN (-1) ve kuralı olmayan kategoriler 0
+                lookup = np.append(categories.get_indexer(uniques) + 1, 0)
+                row_rule = lookup[codes]
+            else:
+                row_rule = np.zeros(len(catalog_df), dtype=np.intp)
+            repriced = {}
+            for price, column in PRICE_COLUMNS.items():
+                if column not in catalog_df.columns:
+                    continue
+                applies, params = tables[price]
+                if not applies.any():
+                    continue
+                repriced[column] = _reprice(catalog_df[column], applies[row_rule],
+                                            {field: values[row_rule] for field, values in params.items()})
+            return catalog_df.assign(**repriced)
+
+    return run
+
+def _reprice(original, applies, p):
+    """Satır başına parametre dizileriyle (p) tüm sütunu tek ifadede yeniden fiyatlar."""
+    base = to_float(dense_column(original), np.nan).to_numpy(dtype='float64')
+    price = base * (1 + p['markup_pct'] / 100) + p['markup_fixed']
+    price = price / (1 - p['commission_pct'] / 100)
+    step = p['round_step']
+    rounded = np.ceil((price - p['ending']) / np.where(step > 0, step, 1) - 1e-9) * step + p['ending']
+    price = np.where(step > 0, rounded, price)
+    price = np.where(price < p['min'], p['min'], price)  # NaN sınır karşılaştırmada False: sınır yok
+    price = np.where(price > p['max'], p['max'], price)
+    price = np.where(applies & ~np.isnan(base), np.round(price, 2), base)
+    if pd.api.types.is_numeric_dtype(original.dtype):
+        return pd.Series(price, index=original.index)
+    # Metin sütunda sayıya çevrilemeyen hücreler dönüştürücülere olduğu gibi gider
+    return original.astype(object).where(np.isnan(base), pd.Series(price, index=original.index))
+
+def reprice(catalog_df, rules, marketplace):
+    return compile_rules(rules, marketplace)(catalog_df)
@@ -0,0 +1,178 @@
+"""
+Aşama bazlı süre ve bellek ölçümü.
+
+Dönüştürücüler işlerini phase() blokları içinde yapar. Kayıtlı kanca (hook) yoksa
+blokların maliyeti yok denecek kadar azdır; ölçüm açıldığında her aşama için
+şu alanları içeren bir kayıt kancalara iletilir:
+
+    run          Çalıştırma kimliği (aynı süreçteki tüm kayıtlarda aynı)
+    script       Çalıştırılan betik
+    phase        Aşama adı, örn. 'read.rows', 'hepsiburada.map', 'n11.write'
+    parent       Dıştaki aşama (yoksa null)
+    wall_s       Duvar saati süresi
+    cpu_s        Süreç CPU süresi
+    rows         İşlenen satır sayısı (biliniyorsa)
+    rows_per_s   rows / wall_s
+    peak_bytes   Aşama boyunca tracemalloc tepe değeri (izleme kapalıysa null)
+
+Kullanım:
+    python convert.py --profile                 # JSON satırları stderr'e
+    python pipeline.py dosya.xlsx --profile profil.jsonl
+    python profiling.py ozet profil.jsonl       # Çalıştırmalar arası özet
+
+Betik içinden:
+    import profiling
+    profiling.add_hook(lambda record: print(record))
+    profiling.enable('profil.jsonl')
+
+Eşzamanlı çalışan aşamalarda (pipeline'daki paralel yazımlar) CPU süresi ve
+tracemalloc tepe değeri süreç geneli olduğu için birbirine karışır.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+RUN_ID = uuid.uuid4().hex[:12]
+
+_hooks = []
+_local = threading.local()
+
+# --- Kanca API'si ---
+
+def add_hook(hook):
+    """hook(record) her aşama bittiğinde kayıt sözlüğüyle çağrılır."""
+    _hooks.append(hook)
+    return hook
+
+def remove_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+def enabled():
+    return bool(_hooks)
+
+def json_lines_hook(stream):
+    """Kayıtları stream'e JSON satırı olarak yazan kanca."""
+    lock = threading.Lock()
+
+    def hook(record):
+        with lock:
+            stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            stream.flush()
+    return hook
+
+def enable(output=None, trace_memory=True):
+    """
+    Ölçümü açar: kayıtlar output dosyasına (eklenerek) ya da output yoksa stderr'e
+    JSON satırı olarak yazılır. trace_memory ile tracemalloc başlatılır.
+    """
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    stream = open(output, 'a', encoding='utf-8') if output else sys.stderr
+    return add_hook(json_lines_hook(stream))
+
+def enable_from_argv(argv=None):
+    """Betiklerin '--profile [DOSYA]' seçeneği; diğer argümanlara dokunmaz."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--profile', nargs='?', const='-', default=None)
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    if args.profile is not None:
+        enable(None if args.profile == '-' else args.profile)
+
+# --- Aşama Ölçümü ---
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+def _current_peak():
+    return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+
+@contextmanager
+def phase(name, rows=None):
+    """
+    Bir aşamayı ölçer. Dönen sözlüğe blok içinde 'rows' yazılabilir:
+
+        with phase('pazarama.map') as p:
+            df = ...
+            p['rows'] = len(df)
+    """
+    info = {'rows': rows}
+    if not _hooks:
+        yield info
+        return
+
+    stack = _stack()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        # Dıştaki aşamanın tepe değerini koru, bu aşama için sayacı sıfırla
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], _current_peak())
+        tracemalloc.reset_peak()
+    frame = {'name': name, 'peak': 0}
+    stack.append(frame)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield info
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        stack.pop()
+        peak = None
+        if tracing:
+            peak = max(frame['peak'], _current_peak())
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+
+        rows = info.get('rows')
+        record = {
+            'run': RUN_ID,
+            'script': os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None,
+            'phase': name,
+            'parent': stack[-1]['name'] if stack else None,
+            'wall_s': round(wall, 6),
+            'cpu_s': round(cpu, 6),
+            'rows': rows,
+            'rows_per_s': round(rows / wall, 1) if rows and wall > 0 else None,
+            'peak_bytes': peak,
+            'ts': time.time(),
+        }
+        for hook in list(_hooks):
+            hook(record)
+
+# --- Özet ---
+
+def summarize(paths):
+    """JSON satırı dosyalarındaki kayıtları aşama bazında özetler (DataFrame)."""
+    import pandas as pd
+
+    records = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    df = pd.DataFrame(records)
+    return (df.groupby('phase', sort=False)
+              .agg(runs=('run', 'nunique'), wall_median_s=('wall_s', 'median'), wall_max_s=('wall_s', 'max'),
+                   cpu_median_s=('cpu_s', 'median'), rows_per_s_median=('rows_per_s', 'median'),
+                   peak_mb_max=('peak_bytes', lambda s: s.max() / 2**20)))
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Profil kayıtlarını özetler.')
+    parser.add_argument('komut', choices=['ozet'])
+    parser.add_argument('dosyalar', nargs='+', help='JSON satırı profil dosyaları')
+    args = parser.parse_args(argv)
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(summarize(args.dosyalar).round(3))
+
+if __name__ == '__main__':
+    main()
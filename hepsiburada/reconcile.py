@@ -0,0 +1,331 @@
+"""
+Pazaryerleri arası stok uzlaştırma.
+
+Stok, Trendyol dışa aktarımındaki 'Ürün Stok Adedi'nden bir kez bütün pazaryeri
+dosyalarına kopyalanır; N11, Pazarama, Hepsiburada ya da Idefix'teki satışlar geri
+akmadığı için fazla satış olur. Bu modül kanalların sipariş dışa aktarımlarını
+katalogla birleştirip her kanal için yalnızca stok içeren güncelleme dosyası yazar:
+
+1. SkuIndex katalogdan bir kez kurulur: her ürün (katalog satırı) için barkod, eldeki
+   stok ve her kanalın stok kodu (dönüştürücülerin yazdığıyla aynı). Barkod ve kanal
+   stok kodları için bellek içi hash indeksleri (pd.Index) tutulur.
+2. Sipariş satırı önce barkoddan, bulunamazsa o kanalın stok kodundan ürüne eşlenir;
+   iptal/iade satırları atılır, adetler ürün başına np.bincount ile toplanır.
+3. Kullanılabilir stok = max(0, eldeki stok - tüm kanallardaki satışlar - SAFETY_STOCK).
+   Siparişler Trendyol dışa aktarımı alındıktan sonra verilmiş olmalıdır (Trendyol'un
+   kendi siparişleri dahil); daha eskileri stokta zaten düşülmüştür.
+4. Eşleşmeyen sipariş satırları UNMATCHED_FILE'a yazılır.
+
+Kalıcı stok kodu kaydı (--sku-registry) verilirse kodlar kayıttan yalnızca okunur
+(SkuRegistry.lookup_many); uzlaştırma kayda yeni kod yazmaz. Kayıtta olmayan barkodlar o
+kanalın stok dosyasına girmez, UNREGISTERED_FILE'da eşleşmeyen ürün olarak raporlanır.
+
+Sipariş dosyalarında sütunlar ORDER_COLUMNS'taki adaylardan ilk bulunanla okunur;
+kanalın dışa aktarımı farklı ad kullanıyorsa aday listesine eklenmelidir. Barkodu boş olan
+ve stok kodu sütunu bulunmayan satırlar eşleşmeyen olarak raporlanır.
+
+Kullanım:
+    python reconcile.py "Ürünleriniz_02.01.2026-23.27.xlsx" \\
+        --orders n11=N11_Siparisler.xlsx --orders hepsiburada=HB_Siparisler.csv --output-dir stok
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import cache
+from catalog import dense_column, read_trendyol_export, select_engine
+from kernels import clean_text, strip_text, unique_skus
+from profiling import enable, phase
+from sku_registry import SkuRegistry
+from xlsx_writer import write_frame
+
+# --- Ayarlar ---
+CHANNELS = ('trendyol', 'hepsiburada', 'n11', 'pazarama', 'idefix')
+SAFETY_STOCK = 0  # Her üründe satışa kapalı tutulacak adet
+STOCK_COLUMN = 'Ürün Stok Adedi'
+UNMATCHED_FILE = 'Eslesmeyen_Siparisler.csv'
+UNREGISTERED_FILE = 'Kayitsiz_Stok_Kodlari.csv'
+REGISTRY_CHANNELS = ('hepsiburada', 'n11', 'pazarama')  # Stok kodu SkuRegistry'den gelen kanallar
+SUMMARY_FILE = 'Stok_Uzlastirma.csv'
+
+# Sipariş dışa aktarımlarındaki sütun adayları (ilk bulunan kullanılır). 'Model Kodu' bir varyant
+# grubunu gösterdiği için stok kodu yerine kullanılmaz.
+ORDER_COLUMNS = {
+    'barcode': ('Barkod', 'Barkod (GTIN,EAN)', 'Ürün Barkodu'),
+    'sku': ('Stok Kodu', 'Satıcı Stok Kodu', 'Sat?c? Stok Kodu', 'Tedarikçi Stok Kodu'),
+    'quantity': ('Adet', 'Miktar', 'Sipariş Adedi', 'Ürün Adedi'),
+    'status': ('Sipariş Statüsü', 'Sipariş Durumu', 'Durum', 'Statü'),
+}
+CANCELLED_PATTERN = r'[iİ]ptal|[iİ]ade|cancel|return'  # Bu durumlardaki satırlar stoktan düşülmez
+
+# Kanal -> (dosya adı, [(çıktı sütunu, kaynak)]) ; kaynak 'barcode', 'sku' ya da 'stock'
+STOCK_FILES = {
+    'trendyol': ('Trendyol_Stok_Guncelleme.xlsx', [('Barkod', 'barcode'), ('Ürün Stok Adedi', 'stock')]),
+    'hepsiburada': ('Hepsiburada_Stok_Guncelleme.xlsx',
+                    [('Satıcı Stok Kodu', 'sku'), ('Barkod', 'barcode'), ('Stok', 'stock')]),
+    'n11': ('N11_Stok_Guncelleme.xlsx', [('Stok Kodu', 'sku'), ('Barkod (GTIN,EAN)', 'barcode'), ('Stok', 'stock')]),
+    'pazarama': ('Pazarama_Stok_Guncelleme.xlsx', [('Barkod', 'barcode'), ('Stok Kodu', 'sku'), ('Stok Adedi', 'stock')]),
+    'idefix': ('Idefix_Stok_Guncelleme.csv', [('Barkod', 'barcode'), ('Stok Adedi', 'stock')]),
+}
+
+# --- Kanal Stok Kodları ---
+# Dönüştürücülerin yazdığı stok kodlarıyla aynı (convert.py, n11.py, pazarama.py, idefix.py)
+
+def channel_skus(catalog_df, sku_registry=None):
+    """
+    {kanal: stok kodu dizisi}; sku_registry verilirse REGISTRY_CHANNELS için kayıttaki
+    kodlar okunur (kayda yazılmaz), kayıtsız barkodların kodu '' olur.
+    """
+    barcode = strip_text(dense_column(catalog_df['Barkod'])).reset_index(drop=True)
+    model_kodu = dense_column(catalog_df['Model Kodu']).reset_index(drop=True)
+    skus = {
+        'trendyol': strip_text(dense_column(catalog_df['Tedarikçi Stok Kodu'])).reset_index(drop=True)
+        if 'Tedarikçi Stok Kodu' in catalog_df.columns else pd.Series('', index=barcode.index),
+        'hepsiburada': unique_skus(strip_text(model_kodu)),
+        'n11': unique_skus(clean_text(model_kodu)),
+        'pazarama': unique_skus(clean_text(model_kodu)),
+        'idefix': barcode,  # Idefix'te stok kodu olarak barkod kullanılıyor
+    }
+    if sku_registry is not None:
+        skus['hepsiburada'] = sku_registry.lookup_many('hepsiburada', barcode, strip_text(model_kodu))
+        for name in ('n11', 'pazarama'):
+            skus[name] = sku_registry.lookup_many(name, barcode, clean_text(model_kodu))
+    return {name: s.to_numpy(dtype=object) for name, s in skus.items()}
+
+# --- İndeks ---
+
+def _hash_index(keys):
+    """Boş olmayan anahtarların ilk geçtiği konuma hash indeksi: (pd.Index, konum dizisi)."""
+    keys = np.asarray(keys, dtype=object)
+    positions = np.flatnonzero(keys != '')
+    index = pd.Index(keys[positions])
+    if not index.is_unique:
+        first = ~index.duplicated()
+        index, positions = index[first], positions[first]
+    return index, positions
+
+class SkuIndex:
+    """
+    Katalog ürünleri için barkod ve kanal stok kodu hash indeksleri. Bir kez kurulur,
+    her uzlaştırmada yeniden kullanılır; arama maliyeti sorgu satırı sayısıyla ölçeklenir.
+    """
+
+    def __init__(self, catalog_df, sku_registry=None):
+        with phase('reconcile.index', rows=len(catalog_df)):
+            self.barcodes = strip_text(dense_column(catalog_df['Barkod'])).to_numpy(dtype=object)
+            self.model_kodu = strip_text(dense_column(catalog_df['Model Kodu'])).to_numpy(dtype=object)
+            stock = pd.to_numeric(dense_column(catalog_df[STOCK_COLUMN]), errors='coerce')
+            self.stock = stock.fillna(0).clip(lower=0).to_numpy(dtype='int64')
+            self.skus = channel_skus(catalog_df, sku_registry)
+            # Kanal -> kayıtta stok kodu bulunmayan ürünler (yalnızca kayıt verildiyse)
+            self.unregistered = {}
+            if sku_registry is not None:
+                listed = (self.barcodes != '') & (self.model_kodu != '')
+                self.unregistered = {name: listed & (self.skus[name] == '') for name in REGISTRY_CHANNELS}
+            self._barcode_index = _hash_index(self.barcodes)
+            self._sku_indexes = {name: _hash_index(skus) for name, skus in self.skus.items()}
+
+    def __len__(self):
+        return len(self.barcodes)
+
+    def locate(self, channel, barcodes=None, skus=None):
+        """
+        Sorgu satırlarının katalog konumları (int64, bulunamayan -1). Barkod önce,
+        eşleşmeyen satırlar için kanalın stok kodu denenir.
+        """
+        n = len(barcodes if barcodes is not None else skus)
+        positions = np.full(n, -1, dtype='int64')
+        for keys, (index, targets) in ((barcodes, self._barcode_index), (skus, self._sku_indexes[channel])):
+            if keys is None:
+                continue
+            missing = np.flatnonzero(positions < 0)
+            if not len(missing):
+                break
+            found = index.get_indexer(np.asarray(keys, dtype=object)[missing])
+            hit = found >= 0
+            positions[missing[hit]] = targets[found[hit]]
+        return positions
+
+# --- Sipariş Dosyaları ---
+
+def _pick_column(columns, candidates):
+    return next((c for c in candidates if c in columns), None)
+
+def read_orders(path):
+    """Sipariş dışa aktarımını (.xlsx/.csv) tüm hücreler metin olacak şekilde okur."""
+    if path.lower().endswith('.csv'):
+        with open(path, encoding='utf-8-sig', errors='replace') as f:
+            first_line = f.readline()
+        sep = ';' if first_line.count(';') > first_line.count(',') else ','
+        return pd.read_csv(path, sep=sep, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    return pd.read_excel(path, dtype=str, keep_default_na=False, engine=select_engine())
+
+def normalize_orders(orders):
+    """
+    Sipariş tablosunu ORDER_COLUMNS'a göre (barcode, sku, quantity) sütunlarına indirger.
+    Adet sütunu yoksa her satır 1 adet sayılır; iptal/iade satırları atılır. Barkod ya da
+    stok kodu sütunu yoksa o alan boş kalır ve satır uzlaştırmada eşleşmeyen sayılır.
+    """
+    barcode_col = _pick_column(orders.columns, ORDER_COLUMNS['barcode'])
+    sku_col = _pick_column(orders.columns, ORDER_COLUMNS['sku'])
+    quantity_col = _pick_column(orders.columns, ORDER_COLUMNS['quantity'])
+    status_col = _pick_column(orders.columns, ORDER_COLUMNS['status'])
+
+    empty = pd.Series('', index=orders.index)
+    out = pd.DataFrame({
+        'barcode': strip_text(orders[barcode_col]) if barcode_col else empty,
+        'sku': strip_text(orders[sku_col]) if sku_col else empty,
+        'quantity': (pd.to_numeric(orders[quantity_col], errors='coerce').fillna(0).astype('int64')
+                     if quantity_col else pd.Series(1, index=orders.index, dtype='int64')),
+    })
+    if status_col:
+        cancelled = orders[status_col].astype(str).str.contains(CANCELLED_PATTERN, case=False, regex=True)
+        out = out[~cancelled.to_numpy(dtype=bool)]
+    return out.reset_index(drop=True)
+
+# --- Uzlaştırma ---
+
+def reconcile(index, orders_by_channel, safety_stock=SAFETY_STOCK):
+    """
+    orders_by_channel: {kanal: normalize_orders çıktısı}. (özet DataFrame, eşleşmeyen
+    siparişler DataFrame) döndürür. Özet ürün başına eldeki stok, kanal satışları ve
+    'Kullanılabilir Stok' içerir.
+    """
+    with phase('reconcile.match', rows=sum(len(o) for o in orders_by_channel.values())):
+        sold = {}
+        unmatched = []
+        for channel, orders in orders_by_channel.items():
+            if channel not in CHANNELS:
+                raise ValueError(f"Bilinmeyen kanal: {channel} (seçenekler: {', '.join(CHANNELS)})")
+            positions = index.locate(channel, orders['barcode'].to_numpy(dtype=object),
+                                     orders['sku'].to_numpy(dtype=object))
+            quantity = orders['quantity'].to_numpy(dtype='int64')
+            found = positions >= 0
+            sold[channel] = np.bincount(positions[found], weights=quantity[found],
+                                        minlength=len(index)).astype('int64')
+            if not found.all():
+                unmatched.append(orders[~found].assign(channel=channel))
+
+    with phase('reconcile.stock', rows=len(index)):
+        total_sold = sum(sold.values()) if sold else np.zeros(len(index), dtype='int64')
+        available = np.maximum(index.stock - total_sold - safety_stock, 0)
+        summary = pd.DataFrame({'Barkod': index.barcodes, 'Model Kodu': index.model_kodu,
+                                'Eldeki Stok': index.stock,
+                                **{f"Satış {name}": values for name, values in sold.items()},
+                                'Kullanılabilir Stok': available})
+
+    unmatched_df = (pd.concat(unmatched, ignore_index=True) if unmatched
+                    else pd.DataFrame(columns=['barcode', 'sku', 'quantity', 'channel']))
+    unmatched_df = unmatched_df.rename(columns={'barcode': 'Barkod', 'sku': 'Stok Kodu', 'quantity': 'Adet',
+                                                'channel': 'Kanal'})
+    return summary, unmatched_df
+
+def stock_update_frame(index, channel, available):
+    """Kanalın yalnızca stok içeren güncelleme tablosu (STOCK_FILES düzeninde)."""
+    _, columns = STOCK_FILES[channel]
+    sources = {'barcode': index.barcodes, 'sku': index.skus[channel], 'stock': available}
+    df = pd.DataFrame({name: sources[source] for name, source in columns})
+    keep = index.barcodes != ''
+    if channel in index.unregistered:
+        keep &= ~index.unregistered[channel]
+    return df[keep]
+
+def unregistered_report(index):
+    """Kayıtta stok kodu olmayan (stok dosyasına girmeyen) ürünler: Kanal, Barkod, Model Kodu."""
+    parts = [pd.DataFrame({'Kanal': channel, 'Barkod': index.barcodes[mask], 'Model Kodu': index.model_kodu[mask]})
+             for channel, mask in index.unregistered.items() if mask.any()]
+    if not parts:
+        return pd.DataFrame(columns=['Kanal', 'Barkod', 'Model Kodu'])
+    return pd.concat(parts, ignore_index=True)
+
+def write_stock_updates(index, summary, output_dir='.', channels=CHANNELS):
+    """Her kanal için stok güncelleme dosyasını yazar; {kanal: yol} döndürür."""
+    os.makedirs(output_dir, exist_ok=True)
+    available = summary['Kullanılabilir Stok'].to_numpy()
+    paths = {}
+    for channel in channels:
+        file_name, _ = STOCK_FILES[channel]
+        path = os.path.join(output_dir, file_name)
+        df = stock_update_frame(index, channel, available)
+        with phase(f'reconcile.write.{channel}', rows=len(df)):
+            if path.endswith('.csv'):
+                df.to_csv(path, sep=';', index=False, encoding='utf-8-sig')
+            else:
+                write_frame(path, 'Stok', df)
+        paths[channel] = path
+    return paths
+
+# --- Ana İşlem ---
+
+def _parse_orders_arg(value):
+    channel, sep, path = value.partition('=')
+    if not sep or channel not in CHANNELS:
+        raise argparse.ArgumentTypeError(f"KANAL=DOSYA bekleniyor, kanal: {', '.join(CHANNELS)}")
+    return channel, path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Kanal siparişlerini katalog stoğuyla uzlaştırır.')
+    parser.add_argument('trendyol_file', help="Trendyol 'Ürünleriniz_*.xlsx' dosyası (eldeki stok)")
+    parser.add_argument('--orders', action='append', type=_parse_orders_arg, default=[], metavar='KANAL=DOSYA',
+                        help='Kanalın sipariş dışa aktarımı (.xlsx/.csv); birden çok kez verilebilir')
+    parser.add_argument('--output-dir', default='.', help='Çıktı klasörü')
+    parser.add_argument('--channels', nargs='+', choices=CHANNELS, default=list(CHANNELS),
+                        help='Stok güncelleme dosyası yazılacak kanallar')
+    parser.add_argument('--safety-stock', type=int, default=SAFETY_STOCK, help='Ürün başına ayrılacak güvenlik stoğu')
+    parser.add_argument('--sku-registry', help='Dönüştürmede kullanılan kalıcı stok kodu kaydı (SQLite)')
+    parser.add_argument('--cache-dir', default=cache.CACHE_DIR, help='Ayrıştırılmış katalog önbelleği klasörü')
+    parser.add_argument('--no-cache', action='store_true', help='Önbelleği kullanma')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='DOSYA',
+                        help='Aşama sürelerini JSON satırı olarak DOSYA\'ya (verilmezse stderr\'e) yaz')
+    args = parser.parse_args(argv)
+
+    if args.profile is not None:
+        enable(None if args.profile == '-' else args.profile)
+    # Kayıt yalnızca okunur: olmayan dosya oluşturulmaz
+    for path in [args.trendyol_file] + [p for _, p in args.orders] + ([args.sku_registry] if args.sku_registry else []):
+        if not os.path.exists(path):
+            print(f"Hata: '{path}' dosyası bulunamadı.")
+            return 1
+
+    if args.no_cache:
+        catalog_df = read_trendyol_export(args.trendyol_file)
+    else:
+        catalog_df = cache.read_trendyol_export_cached(args.trendyol_file, cache_dir=args.cache_dir)
+
+    start = time.perf_counter()
+    registry = SkuRegistry(args.sku_registry) if args.sku_registry else None
+    try:
+        index = SkuIndex(catalog_df, registry)
+    finally:
+        if registry is not None:
+            registry.close()
+    orders = {}
+    for channel, path in args.orders:
+        normalized = normalize_orders(read_orders(path))
+        orders[channel] = pd.concat([orders[channel], normalized], ignore_index=True) if channel in orders else normalized
+
+    summary, unmatched = reconcile(index, orders, args.safety_stock)
+    paths = write_stock_updates(index, summary, args.output_dir, args.channels)
+    summary.to_csv(os.path.join(args.output_dir, SUMMARY_FILE), sep=';', index=False, encoding='utf-8-sig')
+    unmatched.to_csv(os.path.join(args.output_dir, UNMATCHED_FILE), sep=';', index=False, encoding='utf-8-sig')
+
+    reduced = int((summary['Kullanılabilir Stok'] < summary['Eldeki Stok']).sum())
+    print(f"{len(index)} ürün, {sum(len(o) for o in orders.values())} sipariş satırı; "
+          f"{reduced} üründe stok düştü, {len(unmatched)} sipariş satırı eşleşmedi.")
+    if registry is not None:
+        unregistered = unregistered_report(index)
+        unregistered.to_csv(os.path.join(args.output_dir, UNREGISTERED_FILE), sep=';', index=False,
+                            encoding='utf-8-sig')
+        if len(unregistered):
+            print(f"Kayıtta stok kodu olmayan {len(unregistered)} ürün/kanal stok dosyalarına yazılmadı: "
+                  f"{os.path.join(args.output_dir, UNREGISTERED_FILE)}")
+    for channel, path in paths.items():
+        print(f"{channel}: {path}")
+    print(f"Uzlaştırma tamamlandı ({time.perf_counter() - start:.2f} sn).")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
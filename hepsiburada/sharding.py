@@ -0,0 +1,120 @@
+"""
+Çıktı dosyalarını satır sınırına göre parçalara bölme.
+
+Pazaryeri toplu yükleme ekranları dosya boyutunu ve satır sayısını sınırlar. Bir
+çıktıya max_rows verildiğinde dosya en fazla max_rows satırlık parçalara bölünür:
+
+- Aynı varyant grubundaki satırlar (Grup Kodu / Varyant Grup Id) hep aynı parçaya
+  düşer. Gruplar ilk göründükleri sıraya göre parçalara doldurulur; parça içinde
+  satırlar özgün sıralarını korur. Grup anahtarı boş satırlar tek başına bir gruptur.
+- max_rows'tan büyük bir grup bölünmez, tek başına bir parçaya yazılır ve listede
+  'Sınırı Aşıyor' olarak işaretlenir.
+- Parçalar süreç havuzunda paralel yazılır; yazıcı (df, yol) alan, modül düzeyinde
+  (pickle edilebilir) bir fonksiyon olmalıdır. Havuz 'spawn' ile başlatılır: pipeline
+  yazıcıları iş parçacıklarında çalıştırır ve çok iş parçacıklı süreçten fork edilen
+  çocuk, başka bir iş parçacığının tuttuğu kilitte (zipfile, logging, ...) kilitlenebilir.
+
+'N11_Yukleme_Final.xlsx' için parçalar 'N11_Yukleme_Final_parca01.xlsx', ... olarak,
+parça listesi (manifest) 'N11_Yukleme_Final_parcalar.csv' olarak yazılır.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from kernels import strip_text
+from profiling import phase
+
+# --- Ayarlar ---
+SHARD_SUFFIX = '_parca{:02d}'
+MANIFEST_SUFFIX = '_parcalar.csv'
+MANIFEST_COLUMNS = ['Parça', 'Dosya', 'Satır', 'Varyant Grubu', 'Sınırı Aşıyor']
+
+# --- Yollar ---
+
+def shard_path(output_file, number):
+    """number. parçanın (1'den başlar) dosya yolu."""
+    stem, ext = os.path.splitext(output_file)
+    return f"{stem}{SHARD_SUFFIX.format(number)}{ext}"
+
+def manifest_path(output_file):
+    return f"{os.path.splitext(output_file)[0]}{MANIFEST_SUFFIX}"
+
+# --- Bölme ---
+
+def shard_positions(group_keys, max_rows):
+    """
+    Satırların grup anahtarlarından (boş anahtar = tekil grup) parçaları hesaplar.
+    Her parça için sıralı satır konumlarını (int64 dizisi) içeren liste döndürür.
+    """
+    if max_rows < 1:
+        raise ValueError(f"max_rows en az 1 olmalı: {max_rows}")
+    keys = strip_text(pd.Series(group_keys, dtype=object)).to_numpy(dtype=object)
+    n = len(keys)
+    if n == 0:
+        return []
+
+    codes, uniques = pd.factorize(keys)  # Gruplar ilk göründükleri sırada numaralanır
+    blank = np.flatnonzero(keys == '')
+    if len(blank):
+        # Anahtarı boş her satır kendi grubudur
+        codes[blank] = len(uniques) + np.arange(len(blank))
+        codes, _ = pd.factorize(codes)
+    sizes = np.bincount(codes)
+
+    # Gruplar sırayla doldurulur; sığmayan grup yeni parçaya geçer
+    group_shard = np.empty(len(sizes), dtype=np.int64)
+    shard, used = 0, 0
+    for group, size in enumerate(sizes.tolist()):
+        if used and used + size > max_rows:
+            shard, used = shard + 1, 0
+        group_shard[group] = shard
+        used += size
+
+    row_shard = group_shard[codes]
+    order = np.argsort(row_shard, kind='stable')
+    bounds = np.searchsorted(row_shard[order], np.arange(1, shard + 1))
+    return np.split(order, bounds)
+
+def _group_counts(keys, positions):
+    shard_keys = keys[positions]
+    filled = shard_keys[shard_keys != '']
+    return len(pd.unique(filled)) + int((shard_keys == '').sum())
+
+def write_shards(df, output_file, write, group_column, max_rows, max_workers=None):
+    """
+    df'yi shard_positions ile parçalara böler, her parçayı write(parça_df, yol) ile
+    paralel yazar ve parça listesini (MANIFEST_COLUMNS) CSV olarak kaydeder.
+    group_column df'de yoksa her satır ayrı grup sayılır. Liste dosyasının yolunu döndürür.
+    """
+    if group_column in df.columns:
+        keys = strip_text(df[group_column]).to_numpy(dtype=object)
+    else:
+        keys = np.full(len(df), '', dtype=object)
+    with phase('shards.split', rows=len(df)):
+        shards = shard_positions(keys, max_rows) or [np.arange(0)]  # Boş çıktı: tek boş parça
+    paths = [shard_path(output_file, i + 1) for i in range(len(shards))]
+
+    with phase('shards.write', rows=len(df)):
+        if len(shards) <= 1 or max_workers == 1:
+            for positions, path in zip(shards, paths):
+                write(df.iloc[positions], path)
+        else:
+            with ProcessPoolExecutor(max_workers=min(len(shards), max_workers or os.cpu_count()),
+                                     mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [pool.submit(write, df.iloc[positions], path) for positions, path in zip(shards, paths)]
+                for future in futures:
+                    future.result()
+
+    manifest = pd.DataFrame({
+        'Parça': np.arange(1, len(shards) + 1),
+        'Dosya': [os.path.basename(p) for p in paths],
+        'Satır': [len(p) for p in shards],
+        'Varyant Grubu': [_group_counts(keys, p) for p in shards],
+        'Sınırı Aşıyor': ['evet' if len(p) > max_rows else '' for p in shards],
+    }, columns=MANIFEST_COLUMNS)
+    path = manifest_path(output_file)
+    manifest.to_csv(path, sep=';', index=False, encoding='utf-8-sig')
+    return path
@@ -0,0 +1,155 @@
+"""
+Kalıcı stok kodu (SKU) kaydı.
+
+Dönüştürücüler tekrar eden Model Kodu'lara '-1', '-2' ... ekler; bu ekler yalnızca
+o çalıştırmadaki satır sırasına bağlı olduğu için yeni ürün eklendiğinde ya da sıra
+değiştiğinde mevcut ilanların stok kodları kayar. Bu modül, barkod için bir kez
+verilen eki SQLite'ta saklar:
+
+- Daha önce görülen barkod (aynı model koduyla) her zaman aynı stok kodunu alır.
+- Yeni barkodlar, o model kodu için şimdiye kadar verilmiş en büyük ekten devam eder;
+  ekler hiçbir zaman yeniden kullanılmaz.
+- Bütün dosya tek işlemde (transaction) toplu olarak yazılır.
+
+Boş kayıtla ilk çalıştırma, kayıtsız dönüştürmeyle aynı stok kodlarını üretir.
+Her pazaryeri kendi ad alanını (namespace) kullanır.
+"""
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS skus (
+    namespace   TEXT    NOT NULL,
+    barcode     TEXT    NOT NULL,
+    dup         INTEGER NOT NULL,  -- aynı barkodun dosyadaki kaçıncı tekrarı (0 = ilk)
+    model_kodu  TEXT    NOT NULL,
+    suffix      INTEGER NOT NULL,  -- 0 = ek yok, k = '-k'
+    PRIMARY KEY (namespace, barcode, dup)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS skus_model_kodu ON skus (namespace, model_kodu);
+CREATE TABLE IF NOT EXISTS model_counters (
+    namespace   TEXT    NOT NULL,
+    model_kodu  TEXT    NOT NULL,
+    next_suffix INTEGER NOT NULL,
+    PRIMARY KEY (namespace, model_kodu)
+) WITHOUT ROWID;
+"""
+
+def format_sku(model_kodu, suffix):
+    return model_kodu if suffix == 0 else f"{model_kodu}-{suffix}"
+
+class SkuRegistry:
+    """SQLite tabanlı stok kodu kaydı. with bloğu içinde ya da close() ile kullanılır."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, namespace, barcode, dup=0):
+        """Tek barkodun kayıtlı stok kodunu döndürür, yoksa None."""
+        row = self.conn.execute(
+            'SELECT model_kodu, suffix FROM skus WHERE namespace = ? AND barcode = ? AND dup = ?',
+            (namespace, barcode, dup)).fetchone()
+        return format_sku(*row) if row else None
+
+    @staticmethod
+    def _inputs(barcodes, model_kodlari):
+        barcodes = barcodes.fillna('').astype(str).to_numpy(dtype=object)
+        bases = model_kodlari.fillna('').astype(str).to_numpy(dtype=object)
+        dups = pd.Series(barcodes).groupby(barcodes, sort=False).cumcount().to_numpy()
+        return barcodes, bases, dups, bases != ''
+
+    def _known_suffixes(self, namespace, barcodes, bases, dups, has_base):
+        """
+        Girdileri geçici 'incoming' tablosuna koyar ve kayıtlı eklerini (yoksa -1) döndürür.
+        Model kodu değişmiş barkod kayıtlı sayılmaz. Kalıcı tablolara yazmaz.
+        """
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS incoming '
+                          '(pos INTEGER PRIMARY KEY, barcode TEXT, dup INTEGER, model_kodu TEXT)')
+        self.conn.execute('DELETE FROM incoming')
+        self.conn.executemany(
+            'INSERT INTO incoming VALUES (?, ?, ?, ?)',
+            zip(np.flatnonzero(has_base).tolist(), barcodes[has_base].tolist(),
+                dups[has_base].tolist(), bases[has_base].tolist()))
+        suffixes = np.full(len(bases), -1, dtype='int64')
+        known = self.conn.execute(
+            'SELECT i.pos, s.suffix FROM incoming i JOIN skus s '
+            'ON s.namespace = ? AND s.barcode = i.barcode AND s.dup = i.dup AND s.model_kodu = i.model_kodu',
+            (namespace,)).fetchall()
+        if known:
+            known = np.array(known, dtype='int64')
+            suffixes[known[:, 0]] = known[:, 1]
+        return suffixes
+
+    @staticmethod
+    def _format(index, bases, suffixes):
+        out = np.full(len(bases), '', dtype=object)
+        plain = suffixes == 0
+        out[plain] = bases[plain]
+        suffixed = np.flatnonzero(suffixes > 0)
+        out[suffixed] = [f"{m}-{s}" for m, s in zip(bases[suffixed].tolist(), suffixes[suffixed].tolist())]
+        return pd.Series(out, index=index)
+
+    def lookup_many(self, namespace, barcodes, model_kodlari):
+        """
+        assign gibi, ama kayda yazmadan: kayıtlı stok kodları Series olarak döner,
+        kayıtsız barkodlar (ya da model kodu değişmiş olanlar) ''.
+        """
+        inputs = self._inputs(barcodes, model_kodlari)
+        with self.conn:
+            suffixes = self._known_suffixes(namespace, *inputs)
+            self.conn.execute('DELETE FROM incoming')
+        return self._format(model_kodlari.index, inputs[1], suffixes)
+
+    def assign(self, namespace, barcodes, model_kodlari):
+        """
+        Barkod ve (kırpılmış) Model Kodu sütunlarına karşılık gelen kalıcı stok
+        kodlarını Series olarak döndürür. Yeni barkodlara ek verilir ve kayıt
+        tek işlemde güncellenir. Boş Model Kodu '' döner ve kaydedilmez.
+        """
+        barcodes, bases, dups, has_base = self._inputs(barcodes, model_kodlari)
+
+        with self.conn:
+            suffixes = self._known_suffixes(namespace, barcodes, bases, dups, has_base)
+
+            # Yeni barkodlar: model kodunun sayacından devam et
+            new = np.flatnonzero(has_base & (suffixes < 0))
+            if len(new):
+                counters = dict(self.conn.execute(
+                    'SELECT c.model_kodu, c.next_suffix FROM model_counters c '
+                    'WHERE c.namespace = ? AND c.model_kodu IN (SELECT model_kodu FROM incoming)',
+                    (namespace,)).fetchall())
+                new_bases = pd.Series(bases[new])
+                start = new_bases.map(counters).fillna(0).astype('int64').to_numpy()
+                suffixes[new] = start + new_bases.groupby(bases[new], sort=False).cumcount().to_numpy()
+
+                self.conn.executemany(
+                    'INSERT INTO skus (namespace, barcode, dup, model_kodu, suffix) VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT (namespace, barcode, dup) DO UPDATE SET '
+                    'model_kodu = excluded.model_kodu, suffix = excluded.suffix',
+                    ((namespace, b, d, m, s) for b, d, m, s in zip(
+                        barcodes[new].tolist(), dups[new].tolist(), bases[new].tolist(), suffixes[new].tolist())))
+                next_suffix = pd.Series(suffixes[new] + 1).groupby(bases[new], sort=False).max()
+                self.conn.executemany(
+                    'INSERT INTO model_counters (namespace, model_kodu, next_suffix) VALUES (?, ?, ?) '
+                    'ON CONFLICT (namespace, model_kodu) DO UPDATE SET '
+                    'next_suffix = MAX(next_suffix, excluded.next_suffix)',
+                    ((namespace, m, int(s)) for m, s in next_suffix.items()))
+
+            self.conn.execute('DELETE FROM incoming')
+
+        return self._format(model_kodlari.index, bases, suffixes)
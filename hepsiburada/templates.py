@@ -0,0 +1,137 @@
+"""
+Pazaryeri şablonu kayıt defteri.
+
+Her şablon dosyası bir kez ayrıştırılır ve çıkarılan şema (sütun sırası, üst bilgi
+satırları, kodlama, ayırıcı) saklanır. Şema, dosyanın boyutu ve değişiklik zamanı
+değişene kadar yeniden kullanılır; şablon güncellendiğinde yalnızca o girdi yenilenir.
+Şemalar süreç içinde bellekte, süreçler arasında TEMPLATE_CACHE_FILE'da tutulur.
+
+Şablon türleri PARSERS sözlüğüne kayıtlıdır:
+    'hepsiburada'  Excel şablonu: {'columns', 'header_rows'}
+    'idefix'       CSV şablonu:   {'columns', 'encoding', 'sep'}
+"""
+import csv
+import os
+import pickle
+
+import pandas as pd
+
+# --- Ayarlar ---
+# cache.CACHE_DIR altında; uzantısı cache.evict'in sildiği katalog girdilerinden (.parquet/.pkl) farklı
+TEMPLATE_CACHE_FILE = os.path.join('.katalog_onbellek', 'sablonlar.pickle')
+HEPSIBURADA_HEADER_ROW = 2  # Sütun adları 3. satırda; üstündeki iki satır üst bilgi (banner)
+IDEFIX_ENCODINGS = ('latin1', 'utf-8')  # Eski davranışla aynı deneme sırası
+IDEFIX_SEPARATORS = ';,\t'
+IDEFIX_DEFAULT_SEP = ';'
+IDEFIX_EXPECTED_COLUMNS = ('Barkod', 'Kategori', 'Marka', 'Stok Adedi')  # Kodlamadan etkilenmeyen şablon sütunları
+
+# --- Şablon Ayrıştırıcıları ---
+
+def parse_hepsiburada_template(path, sheet_name):
+    """
+    Çalışma kitabını bir kez açar; sütun adlarını (header=2) ve ilk iki üst bilgi
+    satırını aynı ExcelFile üzerinden okur.
+    """
+    with pd.ExcelFile(path) as excel_file:
+        if sheet_name not in excel_file.sheet_names:
+            raise ValueError(f"'{sheet_name}' isimli sayfa Hepsiburada şablon dosyasında bulunamadı.")
+        columns = excel_file.parse(sheet_name, header=HEPSIBURADA_HEADER_ROW, nrows=0).columns.tolist()
+        header_rows = excel_file.parse(sheet_name, header=None, nrows=HEPSIBURADA_HEADER_ROW).fillna('')
+    return {'columns': columns, 'header_rows': header_rows}
+
+def _sniff_separator(path, encoding):
+    with open(path, encoding=encoding, newline='') as f:
+        first_line = f.readline()
+    try:
+        return csv.Sniffer().sniff(first_line, delimiters=IDEFIX_SEPARATORS).delimiter
+    except csv.Error:
+        return IDEFIX_DEFAULT_SEP
+
+def _read_idefix_header(path, encoding, sep):
+    return pd.read_csv(path, sep=sep, encoding=encoding, nrows=0).columns.tolist()
+
+def _has_expected_header(columns):
+    return any(col in columns for col in IDEFIX_EXPECTED_COLUMNS)
+
+def parse_idefix_template(path, sheet_name=None):
+    """
+    CSV şablonunun kodlamasını ve ayırıcısını bulur, yalnızca başlık satırını okur.
+    Ayırıcı eskisi gibi ';' kabul edilir; ';' ile okunan başlıkta beklenen sütunlar
+    yoksa ayırıcı ilk satırdan tahmin edilir.
+    """
+    for encoding in IDEFIX_ENCODINGS:
+        try:
+            sep = IDEFIX_DEFAULT_SEP
+            columns = _read_idefix_header(path, encoding, sep)
+            if not _has_expected_header(columns):
+                sniffed = _sniff_separator(path, encoding)
+                if sniffed != sep:
+                    sniffed_columns = _read_idefix_header(path, encoding, sniffed)
+                    if _has_expected_header(sniffed_columns):
+                        sep, columns = sniffed, sniffed_columns
+            return {'columns': columns, 'encoding': encoding, 'sep': sep}
+        except (UnicodeDecodeError, pd.errors.ParserError):
+            continue
+    raise ValueError(f"Idefix şablonu okunamadı: {path}")
+
+PARSERS = {
+    'hepsiburada': parse_hepsiburada_template,
+    'idefix': parse_idefix_template,
+}
+
+# --- Kayıt Defteri ---
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+class TemplateRegistry:
+    """Şablon şemalarını dosya değişene kadar saklar. cache_file=None ise yalnızca bellekte tutar."""
+
+    def __init__(self, cache_file=TEMPLATE_CACHE_FILE):
+        self.cache_file = cache_file
+        self.entries = {}  # (tür, mutlak yol, sayfa) -> (parmak izi, şema)
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    self.entries = pickle.load(f)
+            except Exception:
+                self.entries = {}  # Bozuk önbellek: şablonlar yeniden ayrıştırılır
+
+    def get(self, kind, path, sheet_name=None):
+        """Şablonun şemasını döndürür; dosya değiştiyse ya da ilk kez görülüyorsa ayrıştırır."""
+        key = (kind, os.path.abspath(path), sheet_name)
+        fingerprint = _fingerprint(path)
+        cached = self.entries.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        schema = PARSERS[kind](path, sheet_name)
+        self.entries[key] = (fingerprint, schema)
+        self._save()
+        return schema
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.entries, f)
+        os.replace(tmp_path, self.cache_file)
+
+_registry = None
+
+def default_registry():
+    global _registry
+    if _registry is None:
+        _registry = TemplateRegistry()
+    return _registry
+
+def hepsiburada_template(path, sheet_name):
+    """(sütun listesi, üst bilgi satırları) döndürür. Üst bilgi DataFrame'i değiştirilmemelidir."""
+    schema = default_registry().get('hepsiburada', path, sheet_name)
+    return schema['columns'], schema['header_rows']
+
+def idefix_template(path):
+    return default_registry().get('idefix', path)
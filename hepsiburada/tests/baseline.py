@@ -0,0 +1,340 @@
+"""
+Dönüştürücülerin satır satır (iterrows) çalışan ilk sürümleri.
+
+Eşleştirme tanımlarına (mapping.py) ve sütun çekirdeklerine (kernels.py) geçmeden
+önceki convert.map_data, pazarama.build_pazarama ve n11.build_n11 burada değiştirilmeden
+tutulur; test_converters.py güncel çıktıların bunlarla hücre hücre aynı olduğunu denetler.
+"""
+import re
+
+import pandas as pd
+
+# --- Hepsiburada (convert.py) ---
+
+def generate_variant_group_id(model_kodu):
+    """
+    Generates a Variant Grup Id based on the Model Kodu.
+    Removes common suffixes like '-1', '-2', etc.
+    Returns empty string if input is NaN.
+    """
+    if pd.isna(model_kodu):
+        return ''
+    base_id = re.sub(r'-\w+$', '', str(model_kodu))
+    return base_id if base_id else ''
+
+def make_sku_unique(sku, sku_counts):
+    """
+    Checks if SKU exists in counts. If yes, increments count and appends suffix.
+    Updates the count dictionary.
+    Returns the unique SKU.
+    """
+    original_sku = str(sku).strip() if pd.notna(sku) else ''
+    if not original_sku: # Handle empty SKUs if necessary
+        return ''
+
+    if original_sku in sku_counts:
+        sku_counts[original_sku] += 1
+        unique_sku = f"{original_sku}-{sku_counts[original_sku]-1}" # Start suffix from -1
+    else:
+        sku_counts[original_sku] = 1
+        unique_sku = original_sku # First occurrence keeps original SKU
+
+    return unique_sku
+
+
+def map_data(trendyol_df, hepsiburada_cols):
+    """Maps data from Trendyol DataFrame to Hepsiburada format, ensuring unique SKUs."""
+    hepsiburada_data = []
+    sku_counts = {} # Dictionary to track SKU occurrences
+
+    for index, row in trendyol_df.iterrows():
+        # Handle potential multi-line descriptions
+        description = str(row.get('Ürün Açıklaması', '')).replace('\n', ' ').replace('\r', '') if pd.notna(row.get('Ürün Açıklaması')) else ''
+
+        # Prepend brand to product name
+        brand = str(row.get('Marka', '')).strip() if pd.notna(row.get('Marka')) else ''
+        if brand.lower() == 'hivhestın':
+            brand = 'Hivhestin'
+        product_name_tr = str(row.get('Ürün Adı', '')).strip() if pd.notna(row.get('Ürün Adı')) else ''
+        product_name_hb = f"{brand} {product_name_tr}".strip() if brand or product_name_tr else ''
+
+        # Get original Model Kodu (source for SKU)
+        original_model_kodu = row.get('Model Kodu')
+
+        # Generate UNIQUE Satıcı Stok Kodu
+        satıcı_stok_kodu = make_sku_unique(original_model_kodu, sku_counts)
+
+        # Generate Variant Group ID based on ORIGINAL Model Kodu
+        variant_group_id = generate_variant_group_id(original_model_kodu)
+
+        # Create the data dictionary for the Hepsiburada row
+        hb_row = {col: '' for col in hepsiburada_cols} # Initialize ALL with empty strings
+
+        hb_row['Ürün Adı'] = product_name_hb
+        hb_row['Satıcı Stok Kodu'] = satıcı_stok_kodu # Use the unique SKU
+        hb_row['Barkod'] = str(row.get('Barkod', '')).strip() if pd.notna(row.get('Barkod')) else ''
+        hb_row['Varyant Grup Id'] = variant_group_id
+        hb_row['Ürün Açıklaması'] = description
+        hb_row['Marka'] = brand
+        desi_val = pd.to_numeric(row.get('Desi'), errors='coerce')
+        hb_row['Desi'] = '' if pd.isna(desi_val) else desi_val
+        kdv_val = pd.to_numeric(row.get('KDV Oranı'), errors='coerce')
+        hb_row['KDV'] = '' if pd.isna(kdv_val) else int(kdv_val)
+        hb_row['Garanti Süresi (Ay)'] = 0
+        hb_row['Görsel1'] = str(row.get('Görsel 1', '')).strip() if pd.notna(row.get('Görsel 1')) else ''
+        hb_row['Görsel2'] = str(row.get('Görsel 2', '')).strip() if pd.notna(row.get('Görsel 2')) else ''
+        hb_row['Görsel3'] = str(row.get('Görsel 3', '')).strip() if pd.notna(row.get('Görsel 3')) else ''
+        hb_row['Görsel4'] = str(row.get('Görsel 4', '')).strip() if pd.notna(row.get('Görsel 4')) else ''
+        hb_row['Görsel5'] = str(row.get('Görsel 5', '')).strip() if pd.notna(row.get('Görsel 5')) else ''
+        hb_row['Görsel6'] = str(row.get('Görsel 6', '')).strip() if pd.notna(row.get('Görsel 6')) else ''
+        hb_row['Görsel7'] = str(row.get('Görsel 7', '')).strip() if pd.notna(row.get('Görsel 7')) else ''
+        hb_row['Görsel8'] = str(row.get('Görsel 8', '')).strip() if pd.notna(row.get('Görsel 8')) else ''
+        fiyat_val = pd.to_numeric(row.get("Trendyol'da Satılacak Fiyat (KDV Dahil)"), errors='coerce')
+        hb_row['Fiyat'] = '' if pd.isna(fiyat_val) else fiyat_val
+        stok_val = pd.to_numeric(row.get('Ürün Stok Adedi'), errors='coerce')
+        hb_row['Stok'] = '' if pd.isna(stok_val) else int(stok_val)
+
+        hb_row['Renk'] = str(row.get('Ürün Rengi', '')).strip() if pd.notna(row.get('Ürün Rengi')) else ''
+        hb_row['Beden'] = str(row.get('Beden', '')).strip() if pd.notna(row.get('Beden')) else ''
+        hb_row['Seçenek'] = str(row.get('Boyut/Ebat', '')).strip() if pd.notna(row.get('Boyut/Ebat')) else ''
+
+        # Add default/inferred values
+        if 'pla ' in description.lower() or '(pla)' in description.lower() or 'pla(' in description.lower():
+             hb_row['Malzeme'] = 'PLA'
+        else:
+             hb_row['Malzeme'] = 'PLA'
+
+        kategori = str(row.get('Kategori İsmi', '')).strip() if pd.notna(row.get('Kategori İsmi')) else ''
+        if kategori:
+            hb_row['Kullanım Amacı'] = kategori
+
+        hepsiburada_data.append(hb_row)
+
+    df_output = pd.DataFrame(hepsiburada_data)
+    # Convert potential numeric columns back to object type if they contain empty strings
+    for col in ['Desi', 'KDV', 'Fiyat', 'Stok']:
+         # Check if the column exists and handle potential errors
+         if col in df_output.columns:
+            # Convert to string, check for empty string, then convert back to object if needed
+            is_object = False
+            try:
+                if '' in df_output[col].astype(str).unique():
+                    is_object = True
+            except Exception: # Handle cases where conversion fails (e.g., all values are None)
+                pass
+            if is_object:
+                df_output[col] = df_output[col].astype(object)
+
+    return df_output.fillna('') # Final catch-all for any remaining NaNs
+
+# --- Pazarama (pazarama.py) ---
+
+PAZARAMA_FIXED_CATEGORY_ID = "ac9982d3-3e82-4efc-86fe-6792bb3931ee"
+PAZARAMA_FIXED_BRAND = "HIVHESTİN"
+FIXED_CURRENCY = "TRY"
+
+pazarama_columns = [
+    "Barkod", "Marka", "Grup Kodu", "Kategori", "Para Birimi", 
+    "Ürün Adı", "Ürün Açıklama", "Satış Fiyatı", "İndirimli Satış Fiyatı", 
+    "Stok Adedi", "Stok Kodu", "KDV Oranı", 
+    "Görsel Linki-1", "Görsel Linki-2", "Görsel Linki-3", "Görsel Linki-4", "Görsel Linki-5",
+    "Maksimum Ürün Satış Adedi Kısıtı", "Ürün Bilgi Formu", 
+    "renk seçimi", "Renk", "Materyal", "Ölçü", 
+    "Ağırlık", "Uzunluk", "Genişlik", "Yükseklik", "Tema"
+]
+
+def clean_text(text):
+    if pd.isna(text): return ''
+    return str(text).strip().replace('\n', ' ').replace('\r', '')
+
+def get_unique_sku(sku, sku_counts):
+    sku = str(sku).strip()
+    if not sku: return ''
+    if sku in sku_counts:
+        sku_counts[sku] += 1
+        return f"{sku}-{sku_counts[sku]-1}"
+    else:
+        sku_counts[sku] = 1
+        return sku
+
+def parse_dimensions(text):
+    """
+    Boyut/Ebat verisini (Örn: 18x20, 10*15*5) Uzunluk, Genişlik, Yükseklik olarak ayırır.
+    """
+    if pd.isna(text) or not str(text).strip():
+        return "", "", ""
+    
+    # Metni temizle
+    clean = str(text).lower().replace('cm', '').replace(',', '.').strip()
+    clean = clean.replace('*', 'x').replace(' ', '')
+    
+    parts = clean.split('x')
+    l, w, h = "", "", ""
+    
+    try:
+        if len(parts) >= 3:
+            l, w, h = parts[0], parts[1], parts[2]
+        elif len(parts) == 2:
+            l, w = parts[0], parts[1]
+        elif len(parts) == 1:
+            h = parts[0] # Tek boyut ise Yükseklik olarak kabul ediyoruz
+    except:
+        pass
+        
+    return l, w, h
+
+# --- Dönüştürme ---
+
+def build_pazarama(df_trendyol):
+    """Trendyol katalog DataFrame'ini Pazarama sütun düzenine dönüştürür."""
+    pazarama_data = []
+    sku_counts = {}
+
+    for index, row in df_trendyol.iterrows():
+        
+        # Veri Hazırlığı
+        model_kodu = clean_text(row.get('Model Kodu'))
+        unique_stok_kodu = get_unique_sku(model_kodu, sku_counts)
+        
+        # Fiyatlar
+        try: satis_fiyati = float(row.get('Piyasa Satış Fiyatı (KDV Dahil)', 0))
+        except: satis_fiyati = 0
+        
+        try: indirimli_fiyat = float(row.get("Trendyol'da Satılacak Fiyat (KDV Dahil)", 0))
+        except: indirimli_fiyat = 0
+        
+        try: stok = int(float(row.get('Ürün Stok Adedi', 0)))
+        except: stok = 0
+        
+        try: kdv = int(float(row.get('KDV Oranı', 20)))
+        except: kdv = 20
+
+        # Boyut Ayrıştırma
+        raw_boyut = row.get('Boyut/Ebat')
+        uzunluk, genislik, yukseklik = parse_dimensions(raw_boyut)
+
+        new_row = {
+            "Barkod": clean_text(row.get('Barkod')),
+            "Marka": PAZARAMA_FIXED_BRAND,  # ---> BURASI "HIVHESTİN" OLARAK AYARLANDI
+            "Grup Kodu": model_kodu,
+            "Kategori": PAZARAMA_FIXED_CATEGORY_ID,
+            "Para Birimi": FIXED_CURRENCY,
+            "Ürün Adı": clean_text(row.get('Ürün Adı')),
+            "Ürün Açıklama": clean_text(row.get('Ürün Açıklaması')),
+            "Satış Fiyatı": satis_fiyati,
+            "İndirimli Satış Fiyatı": indirimli_fiyat,
+            "Stok Adedi": stok,
+            "Stok Kodu": unique_stok_kodu,
+            "KDV Oranı": kdv,
+            "Görsel Linki-1": clean_text(row.get('Görsel 1')),
+            "Görsel Linki-2": clean_text(row.get('Görsel 2')),
+            "Görsel Linki-3": clean_text(row.get('Görsel 3')),
+            "Görsel Linki-4": clean_text(row.get('Görsel 4')),
+            "Görsel Linki-5": clean_text(row.get('Görsel 5')),
+            "Maksimum Ürün Satış Adedi Kısıtı": "",
+            "Ürün Bilgi Formu": "",
+            "renk seçimi": "Çok Renkli", # Sabit Değer
+            "Renk": clean_text(row.get('Ürün Rengi')),
+            "Materyal": "Plastik",       # Sabit Değer (PLA yerine)
+            "Ölçü": "Tekli",             # Sabit Değer
+            "Ağırlık": "",
+            "Uzunluk": uzunluk,
+            "Genişlik": genislik,
+            "Yükseklik": yukseklik,
+            "Tema": ""
+        }
+        
+        ordered_row = {col: new_row.get(col, "") for col in pazarama_columns}
+        pazarama_data.append(ordered_row)
+
+    df_output = pd.DataFrame(pazarama_data)
+    return df_output[pazarama_columns]
+
+# --- N11 (n11.py) ---
+
+N11_FIXED_CATEGORY_ID = "1000662"
+N11_FIXED_BRAND = "HIVHESTİN"
+FIXED_PREP_TIME = "3"
+FIXED_DELIVERY_TEMPLATE = "Varsayılan"
+
+n11_columns = [
+    "Stok Kodu", "Model Kodu", "Marka", "Kategori", "Para Birimi",
+    "Ürün Adı", "Ürün Açıklaması", 
+    "Piyasa Satış Fiyatı (KDV Dahil)", "N11 Satış Fiyatı (KDV Dahil)",
+    "Stok", "KDV Oranı",
+    "Görsel 1", "Görsel 2", "Görsel 3", "Görsel 4", 
+    "Görsel 5", "Görsel 6", "Görsel 7", "Görsel 8", 
+    "Görsel 9", "Görsel 10", "Görsel 11", "Görsel 12",
+    "Hazırlık Süresi", "Teslimat Şablonu İsmi", "Katalog ID", 
+    "Barkod (GTIN,EAN)", "Maksimum Satış Adedi",
+    "Renk", "Seçenekler"
+]
+
+def build_n11(df_trendyol):
+    """Trendyol katalog DataFrame'ini N11 sütun düzenine dönüştürür."""
+    n11_data = []
+    sku_counts = {}
+
+    for index, row in df_trendyol.iterrows():
+        
+        # Veri Hazırlığı
+        raw_model_kodu = clean_text(row.get('Model Kodu'))
+        unique_sku = get_unique_sku(raw_model_kodu, sku_counts)
+        
+        try: piyasa_fiyati = float(row.get('Piyasa Satış Fiyatı (KDV Dahil)', 0))
+        except: piyasa_fiyati = 0
+        
+        try: satis_fiyati = float(row.get("Trendyol'da Satılacak Fiyat (KDV Dahil)", 0))
+        except: satis_fiyati = 0
+        
+        try: stok = int(float(row.get('Ürün Stok Adedi', 0)))
+        except: stok = 0
+        
+        try: kdv = int(float(row.get('KDV Oranı', 20)))
+        except: kdv = 20
+
+        # Renk Kontrolü
+        renk_degeri = clean_text(row.get('Ürün Rengi'))
+        if not renk_degeri: # Eğer renk boşsa
+            renk_degeri = "Diğer"
+
+        # Seçenekler
+        secenek = clean_text(row.get('Beden'))
+        if not secenek:
+            secenek = clean_text(row.get('Boyut/Ebat'))
+
+        new_row = {
+            "Stok Kodu": unique_sku,
+            "Model Kodu": raw_model_kodu,
+            "Marka": N11_FIXED_BRAND, 
+            "Kategori": N11_FIXED_CATEGORY_ID, 
+            "Para Birimi": FIXED_CURRENCY,
+            "Ürün Adı": clean_text(row.get('Ürün Adı')),
+            "Ürün Açıklaması": clean_text(row.get('Ürün Açıklaması')),
+            "Piyasa Satış Fiyatı (KDV Dahil)": piyasa_fiyati,
+            "N11 Satış Fiyatı (KDV Dahil)": satis_fiyati,
+            "Stok": stok,
+            "KDV Oranı": kdv,
+            "Görsel 1": clean_text(row.get('Görsel 1')),
+            "Görsel 2": clean_text(row.get('Görsel 2')),
+            "Görsel 3": clean_text(row.get('Görsel 3')),
+            "Görsel 4": clean_text(row.get('Görsel 4')),
+            "Görsel 5": clean_text(row.get('Görsel 5')),
+            "Görsel 6": clean_text(row.get('Görsel 6')),
+            "Görsel 7": clean_text(row.get('Görsel 7')),
+            "Görsel 8": clean_text(row.get('Görsel 8')),
+            "Görsel 9": "", "Görsel 10": "", "Görsel 11": "", "Görsel 12": "",
+            "Hazırlık Süresi": FIXED_PREP_TIME,
+            "Teslimat Şablonu İsmi": FIXED_DELIVERY_TEMPLATE,
+            "Katalog ID": "",
+            "Barkod (GTIN,EAN)": clean_text(row.get('Barkod')),
+            "Maksimum Satış Adedi": "",
+            "Renk": renk_degeri,  # Güncellenen Renk Değeri
+            "Seçenekler": secenek
+        }
+        
+        ordered_row = {col: new_row.get(col, "") for col in n11_columns}
+        n11_data.append(ordered_row)
+
+    df_output = pd.DataFrame(n11_data)
+    return df_output[n11_columns]
@@ -0,0 +1,32 @@
+"""
+Testler depo kökünden ya da hepsiburada/ içinden çalıştırılır:
+
+    python -m pytest hepsiburada/tests -q
+
+Modüller paket değil, hepsiburada/ klasöründeki betiklerdir; klasör içe aktarma
+yoluna eklenir ve göreli dosya yolları (şablonlar, örnek dışa aktarımlar) BASE_DIR'e
+göre çözülür.
+"""
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from bench_suite import synthetic_export  # noqa: E402
+from catalog import clean_trendyol_frame, compact_catalog, read_trendyol_export  # noqa: E402
+
+SAMPLE_EXPORT = os.path.join(BASE_DIR, 'Ürünleriniz_02.01.2026-23.27.xlsx')
+
+@pytest.fixture(scope='session')
+def sample_catalog():
+    """Depodaki gerçek bir Trendyol dışa aktarımı."""
+    return read_trendyol_export(SAMPLE_EXPORT)
+
+@pytest.fixture(scope='session')
+def synthetic_catalog():
+    """Tekrar eden model kodları, boş/karışık hücreler ve kirli satırlar içeren katalog."""
+    return compact_catalog(clean_trendyol_frame(synthetic_export(3000, seed=7)))
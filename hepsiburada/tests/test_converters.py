@@ -0,0 +1,54 @@
+"""Eşleştirme tanımlı dönüştürücüler satır satır çalışan ilk sürümlerle aynı çıktıyı verir."""
+import os
+
+import pandas as pd
+import pytest
+
+import baseline
+import convert
+import n11
+import pazarama
+from conftest import BASE_DIR
+
+CATALOGS = ['sample_catalog', 'synthetic_catalog']
+
+def _kind(value):
+    """Hücre tipi: NumPy skalerleri Python karşılıklarıyla aynı sayılır."""
+    return type(value.item() if hasattr(value, 'item') else value)
+
+def assert_same_cells(actual, expected):
+    """Sütunlar, sıra ve her hücrenin değeri ile Python tipi aynı olmalı."""
+    assert list(actual.columns) == list(expected.columns)
+    assert len(actual) == len(expected)
+    for col in expected.columns:
+        a = actual[col].astype(object).tolist()
+        e = expected[col].astype(object).tolist()
+        mismatches = [(i, x, y) for i, (x, y) in enumerate(zip(a, e))
+                      if not (x == y or (x != x and y != y)) or _kind(x) != _kind(y)]
+        assert not mismatches, f"{col}: {mismatches[:5]}"
+
+@pytest.fixture(scope='module')
+def hepsiburada_columns():
+    cols, _ = convert.read_hepsiburada_template(os.path.join(BASE_DIR, convert.hepsiburada_template_file),
+                                                convert.hepsiburada_sheet_name)
+    return cols
+
+@pytest.mark.parametrize('catalog', CATALOGS)
+def test_hepsiburada_matches_row_loop(catalog, hepsiburada_columns, request):
+    catalog_df = request.getfixturevalue(catalog)
+    assert_same_cells(convert.map_data(catalog_df, hepsiburada_columns),
+                      baseline.map_data(catalog_df, hepsiburada_columns))
+
+@pytest.mark.parametrize('catalog', CATALOGS)
+def test_pazarama_matches_row_loop(catalog, request):
+    catalog_df = request.getfixturevalue(catalog)
+    assert_same_cells(pazarama.build_pazarama(catalog_df), baseline.build_pazarama(catalog_df))
+
+@pytest.mark.parametrize('catalog', CATALOGS)
+def test_n11_matches_row_loop(catalog, request):
+    catalog_df = request.getfixturevalue(catalog)
+    assert_same_cells(n11.build_n11(catalog_df), baseline.build_n11(catalog_df))
+
+def test_unique_skus_suffix_repeats_in_order():
+    catalog_df = pd.DataFrame({'Model Kodu': ['A', 'B', 'A', ' A ', '', 'A'], 'Barkod': list('123456')})
+    assert n11.build_n11(catalog_df)['Stok Kodu'].tolist() == ['A', 'B', 'A-1', 'A-2', '', 'A-3']
@@ -0,0 +1,71 @@
+"""compute_delta ve pazaryeri başına fiyat/stok akışı."""
+import numpy as np
+import pandas as pd
+
+import delta
+import pipeline
+
+SALE = "Trendyol'da Satılacak Fiyat (KDV Dahil)"
+
+def _catalog(rows):
+    columns = ['Barkod', 'Model Kodu', 'Ürün Adı', SALE, 'Ürün Stok Adedi']
+    return pd.DataFrame(rows, columns=columns)
+
+PREVIOUS = _catalog([
+    ['b1', 'M', 'Figür', 100.0, 5],
+    ['b2', 'M', 'Figür', 120.0, 5],
+    ['b3', 'N', 'Biblo', 80.0, 1],
+    ['b4', 'P', 'Vazo', 60.0, 2],
+])
+
+def test_classifies_rows():
+    current = _catalog([
+        ['b5', 'R', 'Yeni', 10.0, 1],       # yeni
+        ['b1', 'M', 'Figür', 100.0, 5],     # değişmedi
+        ['b2', 'M', 'Figür', 125.0, 5],     # yalnızca fiyat
+        ['b3', 'N', 'Biblo XL', 80.0, 1],   # içerik
+    ])
+    changes = delta.compute_delta(PREVIOUS, current)
+    assert changes['new'].tolist() == [0]
+    assert changes['unchanged'].tolist() == [1]
+    assert changes['price_stock'].tolist() == [2]
+    assert changes['changed'].tolist() == [3]
+    assert changes['deleted']['Barkod'].tolist() == ['b4']
+    assert changes['deleted_pos'].tolist() == [3]
+    assert delta.upload_positions(changes).tolist() == [0, 3]
+
+def test_formatting_differences_are_not_changes():
+    current = PREVIOUS.astype({SALE: str, 'Ürün Stok Adedi': float})
+    current['Ürün Adı'] = current['Ürün Adı'] + '  '
+    changes = delta.compute_delta(PREVIOUS, current)
+    assert delta.summary(changes) == {'new': 0, 'changed': 0, 'price_stock': 0, 'deleted': 0, 'unchanged': 4}
+
+def test_repeated_barcodes_pair_by_occurrence():
+    previous = _catalog([['b1', 'M', 'A', 1.0, 1], ['b1', 'M', 'A', 2.0, 1]])
+    current = _catalog([['b1', 'M', 'A', 1.0, 1], ['b1', 'M', 'A', 3.0, 1], ['b1', 'M', 'A', 4.0, 1]])
+    changes = delta.compute_delta(previous, current)
+    assert changes['price_stock'].tolist() == [1]
+    assert changes['new'].tolist() == [2]
+
+def test_feed_uses_marketplace_stock_codes():
+    current = _catalog([
+        ['b1', 'M', 'Figür', 100.0, 5],
+        ['b2', 'M', 'Figür', 125.0, 3],
+        ['b3', 'N', 'Biblo', 80.0, 1],
+    ])
+    changes = delta.compute_delta(PREVIOUS, current)
+    options = {'sku_registry': None, 'changes': changes, 'previous_df': PREVIOUS}
+    frame = pipeline.FRAMES['n11'](current, options)[0]
+    feed = pipeline.price_stock_frame('n11', frame, options)
+    assert feed['Stok Kodu'].tolist() == ['M-1', 'P']
+    assert feed['N11 Satış Fiyatı (KDV Dahil)'].tolist() == [125.0, 60.0]
+    assert feed['Stok'].tolist() == [3, 0]
+    assert feed['Durum'].tolist() == ['fiyat/stok', 'silindi']
+
+def test_feed_without_deletions_needs_no_previous_frame():
+    changes = delta.compute_delta(PREVIOUS, PREVIOUS)
+    frame = pipeline.FRAMES['pazarama'](PREVIOUS, {'sku_registry': None})[0]
+    columns, stock_column = pipeline.PRICE_STOCK_FEEDS['pazarama']
+    feed = delta.price_stock_feed(frame, changes, None, columns, stock_column)
+    assert feed.empty and list(feed.columns) == columns + ['Durum']
+    assert np.array_equal(changes['unchanged'], np.arange(len(PREVIOUS)))
@@ -0,0 +1,108 @@
+"""http_client.Client, sahte pazaryeri sunucusuna (fake_marketplace.py) karşı."""
+import asyncio
+import json
+
+import pytest
+
+from fake_marketplace import FakeMarketplace
+from http_client import Client
+
+BATCH = json.dumps({'items': [{'barkod': 'b1'}, {'barkod': 'b2'}]}).encode('utf-8')
+
+def run(coro):
+    return asyncio.run(coro)
+
+async def _requests(url, calls, **client_options):
+    """calls: (metot, yol, gövde) listesi; yanıtlar sırayla döner."""
+    async with Client(**client_options) as client:
+        return [await client.request(method, url + path, body=body) for method, path, body in calls]
+
+async def _create_and_poll(url):
+    async with Client() as client:
+        created = await client.request('POST', f"{url}/n11/batches", body=BATCH)
+        status = await client.request('GET', f"{url}/n11/batches/{created.json()['batchId']}")
+        return created, status
+
+@pytest.fixture(params=[False, True], ids=['content-length', 'chunked'])
+def server(request):
+    with FakeMarketplace(rate=1000, processing_seconds=0, reject_every=2, chunked=request.param) as server:
+        yield server
+
+def test_json_bodies(server):
+    created, status = run(_create_and_poll(server.url))
+    assert created.status == 202
+    assert ('transfer-encoding' in created.headers) == server.chunked
+    assert status.status == 200
+    assert status.json() == {'status': 'COMPLETED', 'items': 2,
+                             'failed': [{'index': 1, 'reason': 'reddedildi (sahte sunucu)'}]}
+
+def test_sequential_requests_reuse_one_connection(server):
+    responses = run(_requests(server.url, [('POST', '/n11/batches', BATCH)] * 20))
+    assert all(r.status == 202 for r in responses)
+    assert server.stats['connections'] == 1
+
+def test_concurrency_is_limited_per_host(server):
+    async def burst():
+        async with Client(per_host=3) as client:
+            return await asyncio.gather(*(client.request('POST', f"{server.url}/n11/batches", body=BATCH)
+                                          for _ in range(30)))
+    assert all(r.status == 202 for r in run(burst()))
+    assert server.stats['connections'] <= 3
+
+def test_error_statuses_keep_connection(server):
+    responses = run(_requests(server.url, [
+        ('GET', '/yok', None),
+        ('DELETE', '/n11/batches', None),
+        ('POST', '/n11/batches', b'{}'),
+        ('GET', '/n11/batches/bilinmeyen', None),
+    ]))
+    assert [r.status for r in responses] == [404, 405, 400, 404]
+    assert responses[0].json() == {'error': 'bilinmeyen yol'}
+    assert server.stats['connections'] == 1
+
+def test_rate_limit_and_transient_errors():
+    with FakeMarketplace(rate=1, burst=1) as server:
+        first, limited = run(_requests(server.url, [('POST', '/n11/batches', BATCH)] * 2))
+    assert first.status == 202
+    assert limited.status == 429 and limited.headers['retry-after'] == '1'
+
+    with FakeMarketplace(rate=1000, fail_rate=1.0, chunked=True) as server:
+        failed, = run(_requests(server.url, [('POST', '/n11/batches', BATCH)]))
+    assert failed.status == 503 and failed.json()['error'] == 'geçici hata (sahte)'
+
+def test_oversized_body_is_skipped_and_connection_dropped():
+    with FakeMarketplace(rate=1000) as server:
+        async def fetch():
+            async with Client() as client:
+                skipped = await client.request('POST', f"{server.url}/n11/batches", body=BATCH, max_body=5)
+                read = await client.request('POST', f"{server.url}/n11/batches", body=BATCH)
+                return skipped, read
+        skipped, read = run(fetch())
+    assert skipped.status == 202 and skipped.body is None
+    assert read.json()['batchId']
+    assert server.stats['connections'] == 2
+
+def test_invalid_url_and_refused_connection():
+    with pytest.raises(ValueError):
+        run(_requests('ftp://example.com', [('GET', '/', None)]))
+    with FakeMarketplace() as server:
+        url = server.url
+    with pytest.raises(OSError):
+        run(_requests(url, [('GET', '/n11/batches/x', None)], timeout=5))
+
+@pytest.mark.parametrize('kind', ['chunked', 'stream'])
+def test_max_body_limits_unsized_bodies(kind):
+    from bench_image_check import LARGE_BODY_BYTES, StubServer
+
+    with StubServer(hosts=1) as server:
+        url = f"http://127.0.0.1:{server.ports[0]}/{kind}/1.jpg"
+
+        async def fetch():
+            async with Client() as client:
+                skipped = await client.request('GET', url, max_body=1000)
+                full = await client.request('GET', url)
+                return skipped, full
+        skipped, full = run(fetch())
+    assert skipped.status == 200 and skipped.body is None
+    assert len(full.body) == LARGE_BODY_BYTES
+    assert server.stats['connections'] == 2  # Yarım okunan bağlantı havuza dönmez
@@ -0,0 +1,69 @@
+"""image_check, bench_image_check'teki sahte görsel sunucusuna karşı."""
+import time
+
+import pandas as pd
+import pytest
+
+import image_check
+from bench_image_check import EXPECTED, StubServer
+from image_check import ResultCache
+
+@pytest.fixture(scope='module')
+def server():
+    with StubServer(hosts=1) as server:
+        yield server
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.ports[0]}{path}"
+
+@pytest.mark.parametrize('kind', ['img', 'missing', 'html', 'nohead', 'chunked', 'stream'])
+def test_status_and_content_type(server, kind):
+    url = _url(server, f"/{kind}/1.jpg")
+    result = image_check.check_urls([url], cache_file=None)[url]
+    assert (result['ok'], result['status']) == EXPECTED[kind]
+
+def test_follows_redirects(server):
+    url = _url(server, '/redirect/7')
+    result = image_check.check_urls([url], cache_file=None)[url]
+    assert (result['ok'], result['status'], result['content_type']) == (True, 200, 'image/jpeg')
+
+def test_head_falls_back_to_ranged_get(server):
+    before = server.stats['requests']
+    url = _url(server, '/nohead/2.jpg')
+    assert image_check.check_urls([url], cache_file=None)[url]['ok']
+    assert server.stats['requests'] - before == 2  # HEAD (405) + GET
+
+def test_invalid_and_unreachable_urls(server):
+    results = image_check.check_urls(['ftp://x/y.jpg', 'http://127.0.0.1:1/a.jpg'], cache_file=None)
+    assert results['ftp://x/y.jpg']['error'] == 'geçersiz URL'
+    assert not results['http://127.0.0.1:1/a.jpg']['ok']
+
+def test_cache_skips_fresh_results(server, tmp_path):
+    cache_file = str(tmp_path / 'onbellek.sqlite')
+    urls = [_url(server, '/img/3.jpg'), _url(server, '/missing/3.jpg')]
+    first = image_check.check_urls(urls, cache_file=cache_file)
+    before = server.stats['requests']
+    assert image_check.check_urls(urls, cache_file=cache_file) == first
+    assert server.stats['requests'] == before
+    # TTL dolunca yeniden denetlenir
+    image_check.check_urls(urls, cache_file=cache_file, ttl=0, error_ttl=0)
+    assert server.stats['requests'] == before + 2
+
+def test_error_results_expire_sooner(server, tmp_path):
+    urls = [_url(server, '/img/4.jpg'), _url(server, '/missing/4.jpg')]
+    cache_file = str(tmp_path / 'onbellek.sqlite')
+    image_check.check_urls(urls, cache_file=cache_file)
+    now = time.time()
+    with ResultCache(cache_file) as cache:
+        assert set(cache.fresh(urls, now=now)) == set(urls)
+        assert set(cache.fresh(urls, now=now + image_check.ERROR_TTL_SECONDS + 1)) == {urls[0]}
+        assert cache.fresh(urls, now=now + image_check.TTL_SECONDS + 1) == {}
+
+def test_report_lists_broken_images(server):
+    good, bad = _url(server, '/img/5.jpg'), _url(server, '/missing/5.jpg')
+    catalog_df = pd.DataFrame({'Barkod': ['b1', 'b2'], 'Model Kodu': ['M', 'N'],
+                               'Görsel 1': [good, f" {bad} "], 'Görsel 2': [bad, '']})
+    assert image_check.distinct_urls(catalog_df) == [good, bad]
+    report, _ = image_check.validate_catalog_images(catalog_df, cache_file=None)
+    assert report[['Barkod', 'Sütun', 'Durum Kodu']].values.tolist() == [['b2', 'Görsel 1', 404],
+                                                                       ['b1', 'Görsel 2', 404]]
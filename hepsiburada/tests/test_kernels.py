@@ -0,0 +1,36 @@
+"""Sütun çekirdekleri satır bazlı ilk sürümlerle aynı sonucu verir; boş hücreler boş kalır."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import baseline
+import kernels
+
+VALUES = ['Siyah', ' Beyaz\n', np.nan, None, 'nan', '18x20', '10*15*5 cm', '12,5 X 8', ' ', 'M-1', 'M-S', 42, 2.5]
+
+@pytest.fixture(params=[True, False], ids=['infer_string', 'object'])
+def text_series(request):
+    with pd.option_context('future.infer_string', request.param):
+        yield pd.Series(VALUES, dtype=object)
+
+def test_text_kernels_keep_nulls_empty(text_series):
+    assert kernels.clean_text(text_series).tolist() == [baseline.clean_text(v) for v in VALUES]
+    assert kernels.strip_text(text_series).tolist()[2:4] == ['', '']
+
+def test_variant_group_ids(text_series):
+    assert kernels.variant_group_ids(text_series).tolist() == [baseline.generate_variant_group_id(v) for v in VALUES]
+
+def test_parse_dimensions(text_series):
+    columns = kernels.parse_dimensions(text_series)
+    expected = [baseline.parse_dimensions(v) for v in VALUES]
+    assert list(zip(*(c.tolist() for c in columns))) == expected
+
+def test_unique_skus():
+    skus = ['A', 'B', 'A', '', 'A']
+    counts = {}
+    expected = [baseline.get_unique_sku(v, counts) for v in skus] + ['']
+    assert kernels.unique_skus(pd.Series(skus + [None])).tolist() == expected
+
+def test_categorical_input():
+    s = pd.Series(['x ', np.nan, 'x '], dtype='category')
+    assert kernels.strip_text(s).tolist() == ['x', '', 'x']
@@ -0,0 +1,45 @@
+"""Sipariş satırları barkod ya da kanal stok koduyla eşlenir; Model Kodu ile eşlenmez."""
+import pandas as pd
+
+from reconcile import SkuIndex, normalize_orders, reconcile
+
+def _index():
+    catalog_df = pd.DataFrame({
+        'Barkod': ['111', '222', '333'],
+        'Model Kodu': ['MK1', 'MK1', 'MK2'],
+        'Ürün Stok Adedi': ['5', '5', '5'],
+    })
+    return SkuIndex(catalog_df)
+
+def test_orders_match_by_barcode_then_channel_sku():
+    index = _index()
+    orders = normalize_orders(pd.DataFrame({
+        'Barkod': ['222', '', 'YOK'],
+        'Stok Kodu': ['', 'MK2', ''],
+        'Adet': ['2', '1', '4'],
+        'Sipariş Durumu': ['Teslim Edildi', 'Teslim Edildi', 'Teslim Edildi'],
+    }))
+    summary, unmatched = reconcile(index, {'n11': orders})
+    assert summary['Kullanılabilir Stok'].tolist() == [5, 3, 4]
+    assert unmatched['Barkod'].tolist() == ['YOK']
+
+def test_cancelled_orders_are_not_deducted():
+    orders = normalize_orders(pd.DataFrame({'Barkod': ['111', '111'], 'Adet': ['1', '3'],
+                                            'Durum': ['Teslim Edildi', 'İptal Edildi']}))
+    summary, unmatched = reconcile(_index(), {'pazarama': orders})
+    assert summary['Kullanılabilir Stok'].tolist() == [4, 5, 5]
+    assert unmatched.empty
+
+def test_model_kodu_is_not_a_stock_code():
+    # Model Kodu bütün varyant grubunu gösterir; ilk varyanttan düşmek yerine eşleşmeyen raporlanır
+    orders = normalize_orders(pd.DataFrame({'Barkod': ['', '333'], 'Model Kodu': ['MK1', 'MK2'], 'Adet': ['2', '1']}))
+    summary, unmatched = reconcile(_index(), {'hepsiburada': orders})
+    assert summary['Kullanılabilir Stok'].tolist() == [5, 5, 4]
+    assert unmatched['Adet'].tolist() == [2]
+
+def test_orders_without_key_columns_are_unmatched():
+    orders = normalize_orders(pd.DataFrame({'Model Kodu': ['MK1', 'MK2'], 'Adet': ['1', '2']}))
+    summary, unmatched = reconcile(_index(), {'n11': orders})
+    assert summary['Kullanılabilir Stok'].tolist() == [5, 5, 5]
+    assert unmatched['Adet'].tolist() == [1, 2]
+    assert (unmatched['Kanal'] == 'n11').all()
@@ -0,0 +1,61 @@
+"""SkuRegistry: verilen stok kodları sonraki çalıştırmalarda kaymaz."""
+import pandas as pd
+
+import n11
+from sku_registry import SkuRegistry
+
+def _assign(registry, barcodes, models, namespace='n11'):
+    return registry.assign(namespace, pd.Series(barcodes), pd.Series(models)).tolist()
+
+def _dump(path):
+    with SkuRegistry(path) as registry:
+        return (registry.conn.execute('SELECT * FROM skus ORDER BY 1, 2, 3').fetchall(),
+                registry.conn.execute('SELECT * FROM model_counters ORDER BY 1, 2').fetchall())
+
+def test_empty_registry_matches_unregistered_conversion(tmp_path, synthetic_catalog):
+    with SkuRegistry(tmp_path / 'kayit.sqlite') as registry:
+        registered = n11.build_n11(synthetic_catalog, registry)['Stok Kodu']
+    assert registered.tolist() == n11.build_n11(synthetic_catalog)['Stok Kodu'].tolist()
+
+def test_codes_survive_reordering_and_new_products(tmp_path):
+    with SkuRegistry(tmp_path / 'kayit.sqlite') as registry:
+        first = _assign(registry, ['b1', 'b2', 'b3'], ['M', 'M', 'M'])
+        assert first == ['M', 'M-1', 'M-2']
+        # Yeni ürün başa eklenir, eski sıra ters çevrilir
+        second = _assign(registry, ['b4', 'b3', 'b2', 'b1'], ['M', 'M', 'M', 'M'])
+    assert second == ['M-3', 'M-2', 'M-1', 'M']
+
+def test_suffixes_are_never_reused(tmp_path):
+    with SkuRegistry(tmp_path / 'kayit.sqlite') as registry:
+        _assign(registry, ['b1', 'b2'], ['M', 'M'])
+        # b2 katalogdan çıktı; yeni barkod onun ekini almaz
+        assert _assign(registry, ['b1', 'b5'], ['M', 'M']) == ['M', 'M-2']
+
+def test_persists_across_connections(tmp_path):
+    path = tmp_path / 'kayit.sqlite'
+    with SkuRegistry(path) as registry:
+        _assign(registry, ['b1', 'b2'], ['M', 'M'])
+    with SkuRegistry(path) as registry:
+        assert _assign(registry, ['b2', 'b1'], ['M', 'M']) == ['M-1', 'M']
+        assert registry.lookup('n11', 'b2') == 'M-1'
+
+def test_namespaces_are_independent(tmp_path):
+    with SkuRegistry(tmp_path / 'kayit.sqlite') as registry:
+        _assign(registry, ['b1', 'b2'], ['M', 'M'], namespace='n11')
+        assert _assign(registry, ['b2', 'b1'], ['M', 'M'], namespace='pazarama') == ['M', 'M-1']
+
+def test_changed_model_code_gets_new_code_and_blank_is_skipped(tmp_path):
+    with SkuRegistry(tmp_path / 'kayit.sqlite') as registry:
+        _assign(registry, ['b1', 'b2'], ['M', 'M'])
+        assert _assign(registry, ['b1', 'b2', 'b3'], ['M', 'N', '']) == ['M', 'N', '']
+        assert registry.lookup('n11', 'b3') is None
+
+def test_lookup_many_does_not_write(tmp_path):
+    path = tmp_path / 'kayit.sqlite'
+    with SkuRegistry(path) as registry:
+        _assign(registry, ['b1', 'b2'], ['M', 'M'])
+    before = _dump(path)
+    with SkuRegistry(path) as registry:
+        found = registry.lookup_many('n11', pd.Series(['b2', 'b9', 'b1']), pd.Series(['M', 'M', 'M']))
+    assert found.tolist() == ['M-1', '', 'M']
+    assert _dump(path) == before
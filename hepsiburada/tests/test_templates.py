@@ -0,0 +1,35 @@
+"""Idefix CSV şablonu eskisi gibi ';' ile okunur; ayırıcı yalnızca gerektiğinde tahmin edilir."""
+import os
+
+import idefix
+import templates
+from conftest import BASE_DIR
+
+def _write(tmp_path, text):
+    path = tmp_path / 'sablon.csv'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_repo_template_uses_semicolon():
+    schema = templates.parse_idefix_template(os.path.join(BASE_DIR, idefix.template_file))
+    assert schema['sep'] == ';'
+    assert schema['encoding'] == 'latin1'
+    assert {'Barkod', 'Marka', 'Varyant Grup Id'} <= set(schema['columns'])
+
+def test_semicolon_kept_when_header_contains_commas(tmp_path):
+    path = _write(tmp_path, 'Barkod;Olcu (en, boy, yukseklik);Marka;Not, aciklama, uyari\n')
+    schema = templates.parse_idefix_template(path)
+    assert schema['sep'] == ';'
+    assert schema['columns'] == ['Barkod', 'Olcu (en, boy, yukseklik)', 'Marka', 'Not, aciklama, uyari']
+
+def test_other_separator_sniffed_when_semicolon_misses_header(tmp_path):
+    path = _write(tmp_path, 'Barkod,Kategori,Marka,Stok Adedi\n')
+    schema = templates.parse_idefix_template(path)
+    assert schema['sep'] == ','
+    assert schema['columns'] == ['Barkod', 'Kategori', 'Marka', 'Stok Adedi']
+
+def test_unrecognized_header_falls_back_to_semicolon(tmp_path):
+    path = _write(tmp_path, 'a,b,c\n')
+    schema = templates.parse_idefix_template(path)
+    assert schema['sep'] == ';'
+    assert schema['columns'] == ['a,b,c']
@@ -0,0 +1,37 @@
+"""upload.py --delta-from: ürün, fiyat/stok ve silinen ürün yüklemeleri."""
+import pandas as pd
+
+import delta
+import upload
+from conftest import SAMPLE_EXPORT
+from fake_marketplace import FakeMarketplace
+
+SALE = "Trendyol'da Satılacak Fiyat (KDV Dahil)"
+
+def test_delta_upload_sends_price_stock_and_deletions(tmp_path, sample_catalog):
+    previous = sample_catalog.copy()
+    previous[SALE] = pd.to_numeric(previous[SALE]).astype('float64')
+    previous.loc[0, SALE] += 1  # Yalnızca fiyatı değişen ürün
+    previous = pd.concat([previous, previous.iloc[[1]].assign(Barkod='SILINEN')], ignore_index=True)
+    snapshot = str(tmp_path / 'onceki.pkl')
+    delta.save_snapshot(previous, snapshot)
+    argv = [SAMPLE_EXPORT, '--marketplaces', 'n11', '--state', str(tmp_path / 'durum.sqlite'),
+            '--delta-from', snapshot, '--no-cache', '--no-poll']
+
+    with FakeMarketplace(rate=1000) as server:
+        assert upload.main(argv + ['--base-url', server.url]) == 0
+        assert server.stats['items'] == {'n11/price-stock': 2}
+        # Anlık görüntü güncellendi: ikinci çalıştırmada gönderilecek bir şey yok
+        assert upload.main(argv + ['--base-url', server.url]) == 0
+        assert server.stats['batches'] == 1
+    assert len(delta.load_snapshot(snapshot)) == len(sample_catalog)
+
+def test_failed_upload_keeps_snapshot(tmp_path, sample_catalog):
+    snapshot = str(tmp_path / 'onceki.pkl')
+    delta.save_snapshot(sample_catalog.iloc[:-1], snapshot)
+    with FakeMarketplace(rate=1000) as server:
+        result = upload.main([SAMPLE_EXPORT, '--marketplaces', 'n11', '--state', str(tmp_path / 'durum.sqlite'),
+                              '--delta-from', snapshot, '--no-cache', '--no-poll',
+                              '--base-url', server.url + '/yok'])
+    assert result == 1
+    assert len(delta.load_snapshot(snapshot)) == len(sample_catalog) - 1
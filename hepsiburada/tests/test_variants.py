@@ -0,0 +1,48 @@
+"""Varyant grubu indeksi ve grup denetimleri."""
+import numpy as np
+import pandas as pd
+
+import validation
+import variants
+
+def _catalog(models, brands=None, prices=None, images=None):
+    n = len(models)
+    return pd.DataFrame({
+        'Barkod': [f"b{i}" for i in range(n)],
+        'Model Kodu': models,
+        'Marka': brands or ['Hivhestin'] * n,
+        'Kategori İsmi': ['Figür'] * n,
+        'Ürün Rengi': [f"r{i}" for i in range(n)],
+        'Beden': [''] * n,
+        'Boyut/Ebat': [''] * n,
+        "Trendyol'da Satılacak Fiyat (KDV Dahil)": prices or [100.0] * n,
+        'Görsel 1': images or [''] * n,
+    })
+
+def _flagged(rules):
+    return {rule: np.flatnonzero(mask).tolist() for rule, _, _, mask, _ in rules}
+
+def test_no_grouped_rows():
+    catalog_df = _catalog([None, ''])
+    index = variants.VariantGroupIndex(catalog_df)
+    assert len(index) == 0 and index.codes.tolist() == [-1, -1]
+    assert all(rows == [] for rows in _flagged(variants.group_rules(catalog_df, index)).values())
+    assert variants.fill_variant_groups(catalog_df) is catalog_df
+    report = validation.validate_catalog(catalog_df, {'varyant': variants.group_rules})
+    assert report.empty
+
+def test_group_checks():
+    catalog_df = _catalog(['M-1', 'M-2', 'M-S', 'N', ''],
+                          brands=['A', 'A', 'B', 'A', 'B'], prices=[100.0, 120.0, 200.0, 50.0, 10.0])
+    index = variants.VariantGroupIndex(catalog_df)
+    assert index.keys.tolist() == ['M', 'N']
+    assert index.positions(0).tolist() == [0, 1, 2]
+    flagged = _flagged(variants.group_rules(catalog_df, index))
+    assert flagged['grup_marka_tutarsiz'] == [2]
+    assert flagged['grup_fiyat_bandi'] == [2]
+    assert flagged['grup_varyant_tekrari'] == []
+
+def test_fill_from_first_filled_row():
+    catalog_df = _catalog(['M-1', 'M-2', 'N', ''], images=['', 'g.jpg', '', ''])
+    filled = variants.fill_variant_groups(catalog_df)
+    assert filled['Görsel 1'].tolist() == ['g.jpg', 'g.jpg', '', '']
@@ -0,0 +1,459 @@
+"""
+Pazaryeri API'lerine toplu (batch) ürün yükleme.
+
+Dönüştürücülerin ürettiği eşlenmiş satırlar (pipeline.FRAMES) Excel/CSV'ye yazılmak
+yerine doğrudan pazaryeri API'sine gönderilir:
+
+- Satırlar MARKETPLACE_APIS'teki batch_size'lık paketlere bölünür ve paketler bağlantı
+  havuzlu HTTP istemcisiyle (http_client.py) eşzamanlı gönderilir.
+- Her pazaryeri için token bucket hız sınırı uygulanır (rate istek/sn, burst kadar birikir);
+  sunucu 429 döndürürse hız kendiliğinden düşürülür.
+- 429 ve 5xx yanıtlarında ve bağlantı hatalarında üstel geri çekilmeyle (backoff, varsa
+  Retry-After) yeniden denenir; diğer 4xx yanıtları kalıcı hata sayılır. Paket özeti
+  Idempotency-Key olarak gönderildiği için tekrar denenen paket iki kez işlenmez.
+- Paket durumları SQLite'ta (STATE_FILE) tutulur: pending -> sent -> completed/failed.
+  Aynı içerikli paket bir daha gönderilmez; yarıda kalan yükleme kaldığı yerden sürer.
+- Gönderilen paketlerin durumu sorgulanır; satır bazlı redler kaydedilir.
+
+Tüm pazaryerleri için aynı toplu iş sözleşmesi konuşulur:
+
+    POST <api>/batches        {"items": [...]}  -> 2xx {"batchId": "..."}
+    GET  <api>/batches/<id>                     -> {"status": "PROCESSING" | "COMPLETED" | "FAILED",
+                                                    "failed": [{"index": 3, "reason": "..."}]}
+
+Fiyat/stok güncellemeleri aynı sözleşmeyle <api>/price-stock/batches altına gönderilir.
+--delta-from ile yalnızca yeni ve içeriği değişen ürünler ürün API'sine, yalnızca
+fiyatı/stoğu değişenler ve stoğu 0'a çekilen silinmiş ürünler pazaryerinin fiyat/stok
+akışı (pipeline.price_stock_frame) olarak fiyat/stok API'sine yüklenir; yükleme
+başarılı olursa .pkl anlık görüntü güncellenir.
+
+Pazaryerlerinin kendi ürün API'leri farklı yol ve gövde şemaları kullanır; gerçek
+uç noktaya bağlanırken MARKETPLACE_APIS'teki yol/gövde ayarları o pazaryerinin
+entegrasyon belgesine göre düzenlenmelidir. Çevrimdışı deneme için fake_marketplace.py
+bu sözleşmeyi (hız sınırı ve geçici hatalarla birlikte) uygular.
+
+API adresi ve anahtarı ortam değişkenlerinden okunur (örn. N11_API_URL, N11_API_TOKEN)
+ya da --base-url ile tüm pazaryerleri <base-url>/<pazaryeri> altına yönlendirilir.
+
+Kullanım:
+    python fake_marketplace.py --port 8089 &
+    python upload.py "Ürünleriniz_02.01.2026-23.27.xlsx" --base-url http://127.0.0.1:8089 --marketplaces n11 pazarama
+"""
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+import cache
+import convert
+import delta
+import idefix
+from catalog import read_trendyol_export
+from http_client import Client
+from pipeline import FRAMES, MARKETPLACES, price_stock_frame
+import pricing
+from profiling import phase
+from sku_registry import SkuRegistry
+
+# --- Ayarlar ---
+STATE_FILE = 'yukleme_durumu.sqlite'
+MAX_RETRIES = 5  # Bağlantı hatası ve 5xx için
+MAX_RATE_LIMITED = 30  # 429 yanıtları ayrı sayılır; bekleme sunucunun isteğine göre yapılır
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+POLL_INTERVAL_SECONDS = 2.0
+POLL_TIMEOUT_SECONDS = 600.0
+REQUEST_TIMEOUT_SECONDS = 60.0
+
+def _items_payload(records):
+    return {'items': records}
+
+# batch_size: paket başına satır, rate/burst: istek/sn ve birikebilecek istek sayısı,
+# connections: eşzamanlı bağlantı sayısı; price_stock_*: fiyat/stok güncellemelerinin yolları
+MARKETPLACE_APIS = {
+    'hepsiburada': {'batch_size': 1000, 'rate': 5.0, 'burst': 5, 'connections': 4,
+                    'batches_path': '/batches', 'status_path': '/batches/{id}', 'payload': _items_payload,
+                    'price_stock_path': '/price-stock/batches', 'price_stock_status_path': '/price-stock/batches/{id}'},
+    'pazarama': {'batch_size': 500, 'rate': 5.0, 'burst': 5, 'connections': 4,
+                 'batches_path': '/batches', 'status_path': '/batches/{id}', 'payload': _items_payload,
+                 'price_stock_path': '/price-stock/batches', 'price_stock_status_path': '/price-stock/batches/{id}'},
+    'n11': {'batch_size': 500, 'rate': 3.0, 'burst': 3, 'connections': 4,
+            'batches_path': '/batches', 'status_path': '/batches/{id}', 'payload': _items_payload,
+            'price_stock_path': '/price-stock/batches', 'price_stock_status_path': '/price-stock/batches/{id}'},
+    'idefix': {'batch_size': 500, 'rate': 5.0, 'burst': 5, 'connections': 4,
+               'batches_path': '/batches', 'status_path': '/batches/{id}', 'payload': _items_payload,
+               'price_stock_path': '/price-stock/batches', 'price_stock_status_path': '/price-stock/batches/{id}'},
+}
+PRICE_STOCK_PREFIX = 'fiyat_stok_'  # Fiyat/stok yüklemesinin durum kaydı ve özet adı: fiyat_stok_<pazaryeri>
+
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# --- Paket Durumu ---
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS upload_batches (
+    marketplace TEXT    NOT NULL,
+    digest      TEXT    NOT NULL,  -- paket gövdesinin özeti (Idempotency-Key)
+    batch_no    INTEGER NOT NULL,
+    rows        INTEGER NOT NULL,
+    status      TEXT    NOT NULL,  -- pending / sent / completed / failed
+    remote_id   TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    failed_rows INTEGER NOT NULL DEFAULT 0,
+    error       TEXT,
+    updated_at  REAL    NOT NULL,
+    PRIMARY KEY (marketplace, digest)
+) WITHOUT ROWID;
+"""
+
+class UploadState:
+    """Paket durumlarının SQLite kaydı. with bloğu içinde ya da close() ile kullanılır."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, marketplace, digest):
+        row = self.conn.execute('SELECT status, remote_id FROM upload_batches WHERE marketplace = ? AND digest = ?',
+                                (marketplace, digest)).fetchone()
+        return row or (None, None)
+
+    def update(self, marketplace, batch, **fields):
+        fields['updated_at'] = time.time()
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO upload_batches (marketplace, digest, batch_no, rows, status, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (marketplace, digest) DO UPDATE SET batch_no = excluded.batch_no',
+                (marketplace, batch.digest, batch.number, len(batch.records), fields.get('status', 'pending'),
+                 fields['updated_at']))
+            assignments = ', '.join(f"{name} = ?" for name in fields)
+            self.conn.execute(f"UPDATE upload_batches SET {assignments} WHERE marketplace = ? AND digest = ?",
+                              (*fields.values(), marketplace, batch.digest))
+
+    def summary(self, marketplace, digests=None):
+        """
+        {durum: (paket sayısı, satır sayısı)} ve reddedilen satır toplamı. digests verilirse
+        yalnızca bu paketler sayılır (önceki çalıştırmalardan kalan paketler özete girmez).
+        """
+        query = ('SELECT status, COUNT(*), SUM(rows), SUM(failed_rows) FROM upload_batches '
+                 'WHERE marketplace = ?')
+        params = (marketplace,)
+        if digests is not None:
+            query += ' AND digest IN (SELECT value FROM json_each(?))'
+            params += (json.dumps(list(digests)),)
+        rows = self.conn.execute(query + ' GROUP BY status', params).fetchall()
+        return {status: (n, total) for status, n, total, _ in rows}, sum(f or 0 for *_, f in rows)
+
+# --- Paketler ---
+
+class Batch:
+    def __init__(self, number, records, body):
+        self.number = number
+        self.records = records
+        self.body = body
+        self.digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.date, datetime.datetime, pd.Timestamp)):
+        return value.isoformat()
+    raise TypeError(f"JSON'a çevrilemeyen değer: {value!r}")
+
+def frame_records(df):
+    """DataFrame satırlarını JSON'a uygun sözlüklere çevirir (NaN -> None)."""
+    values = df.astype(object).where(df.notna(), None)
+    return values.to_dict('records')
+
+def make_batches(df, batch_size, payload=_items_payload):
+    records = frame_records(df)
+    batches = []
+    for number, start in enumerate(range(0, len(records), batch_size), 1):
+        chunk = records[start:start + batch_size]
+        body = json.dumps(payload(chunk), ensure_ascii=False, default=_json_default).encode('utf-8')
+        batches.append(Batch(number, chunk, body))
+    return batches
+
+# --- Hız Sınırı ---
+
+class TokenBucket:
+    """
+    Saniyede rate jeton üreten, en fazla capacity jeton biriktiren kova. Sunucu 429
+    döndükçe hız yarıya iner (en fazla onda birine), başarılı isteklerle yavaşça
+    ayarlanan değere geri çıkar.
+    """
+
+    def __init__(self, rate, capacity):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = None
+
+    def _refill(self):
+        now = asyncio.get_running_loop().time()
+        if self.updated is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def take(self):
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self, seconds):
+        """429 sonrası: hızı düşürür ve kovayı boşaltır, diğer istekler de en az seconds bekler."""
+        self._refill()
+        self.rate = max(self.rate / 2, self.max_rate / 10)
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def recover(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+def _backoff(attempt, retry_after=None):
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass  # HTTP tarihi biçimindeki Retry-After: üstel beklemeye düş
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** attempt, BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+# --- Yükleyici ---
+
+class Uploader:
+    """Tek pazaryerine paketleri gönderir ve durumlarını izler."""
+
+    def __init__(self, marketplace, api_url, state, token=None, api=None):
+        self.marketplace = marketplace
+        self.api = api or MARKETPLACE_APIS[marketplace]
+        self.api_url = api_url.rstrip('/')
+        self.state = state
+        self.bucket = TokenBucket(self.api['rate'], self.api['burst'])
+        headers = {'Content-Type': 'application/json; charset=utf-8', 'Accept': 'application/json'}
+        if token:
+            headers['Authorization'] = f"Bearer {token}"
+        self.client = Client(per_host=self.api['connections'], timeout=REQUEST_TIMEOUT_SECONDS, headers=headers)
+
+    async def _request(self, method, path, batch, body=None):
+        """Yeniden denemeli istek; (Response ya da None, son hata) döndürür."""
+        error = None
+        attempts = rate_limited = 0
+        while True:
+            await self.bucket.take()
+            response = retry_after = None
+            try:
+                response = await self.client.request(method, self.api_url + path, body=body,
+                                                     headers={'Idempotency-Key': batch.digest})
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                attempts += 1
+            else:
+                if response.status not in RETRY_STATUSES:
+                    self.bucket.recover()
+                    return response, None
+                error = f"HTTP {response.status}"
+                retry_after = response.headers.get('retry-after')
+                if response.status == 429:
+                    rate_limited += 1
+                    delay = _backoff(min(rate_limited, 6), retry_after)
+                    self.bucket.throttle(delay)
+                else:
+                    attempts += 1
+            self.state.update(self.marketplace, batch, attempts=attempts + rate_limited, error=error)
+            if attempts > MAX_RETRIES or rate_limited > MAX_RATE_LIMITED:
+                return None, error
+            if response is None or response.status != 429:  # 429'da bekleme kovada (throttle)
+                await asyncio.sleep(_backoff(attempts - 1, retry_after))
+
+    async def send(self, batch):
+        status, remote_id = self.state.get(self.marketplace, batch.digest)
+        if status in ('sent', 'completed'):
+            return remote_id  # Daha önce gönderildi: yalnızca durumu izlenir
+        self.state.update(self.marketplace, batch, status='pending')
+        response, error = await self._request('POST', self.api['batches_path'], batch, batch.body)
+        if response is None or not 200 <= response.status < 300:
+            if response is not None:
+                error = f"HTTP {response.status}: {(response.body or b'')[:200].decode('utf-8', 'replace')}"
+            self.state.update(self.marketplace, batch, status='failed', error=error)
+            return None
+        remote_id = str((response.json() or {}).get('batchId', ''))
+        self.state.update(self.marketplace, batch, status='sent', remote_id=remote_id, error=None)
+        return remote_id
+
+    async def poll(self, batch, remote_id):
+        deadline = time.monotonic() + POLL_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            response, error = await self._request('GET', self.api['status_path'].format(id=remote_id), batch)
+            if response is None:
+                self.state.update(self.marketplace, batch, error=error)
+                return
+            body = response.json() or {}
+            status = str(body.get('status', '')).upper()
+            if status in ('COMPLETED', 'FAILED'):
+                failed = body.get('failed') or []
+                reasons = '; '.join(f"{f.get('index')}: {f.get('reason')}" for f in failed[:10]) or None
+                self.state.update(self.marketplace, batch, status=status.lower(), failed_rows=len(failed),
+                                  error=reasons)
+                return
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        self.state.update(self.marketplace, batch, error='durum sorgusu zaman aşımı')
+
+    async def upload(self, batches, poll=True):
+        async def one(batch):
+            remote_id = await self.send(batch)
+            if remote_id and poll:
+                await self.poll(batch, remote_id)
+
+        try:
+            await asyncio.gather(*(one(batch) for batch in batches))
+        finally:
+            self.client.close()
+
+def _api_endpoint(marketplace, base_url=None):
+    """(API adresi, anahtar) döndürür; adres tanımlı değilse ValueError."""
+    prefix = marketplace.upper()
+    token = os.environ.get(f"{prefix}_API_TOKEN")
+    if base_url:
+        return f"{base_url.rstrip('/')}/{marketplace}", token
+    url = os.environ.get(f"{prefix}_API_URL")
+    if not url:
+        raise ValueError(f"{marketplace} için API adresi tanımlı değil ({prefix}_API_URL ya da --base-url).")
+    return url, token
+
+# --- Ana İşlem ---
+
+def _price_stock_api(api):
+    return {**api, 'batches_path': api['price_stock_path'], 'status_path': api['price_stock_status_path']}
+
+def upload_frames(frames, state_file=STATE_FILE, base_url=None, poll=True, feeds=None):
+    """
+    {pazaryeri: eşlenmiş DataFrame} içindeki satırları ilgili API'lere yükler ve
+    {pazaryeri: (durum özeti, reddedilen satır sayısı)} döndürür. feeds ({pazaryeri:
+    fiyat/stok akışı}) verilirse bu satırlar fiyat/stok API'sine gönderilir ve özette
+    PRICE_STOCK_PREFIX + pazaryeri adıyla yer alır. Özet yalnızca bu çalıştırmada
+    oluşturulan paketleri kapsar.
+    """
+    # Yükleme adı -> (pazaryeri, API ayarları, satırlar)
+    uploads = {name: (name, MARKETPLACE_APIS[name], df) for name, df in frames.items()}
+    for name, df in (feeds or {}).items():
+        uploads[PRICE_STOCK_PREFIX + name] = (name, _price_stock_api(MARKETPLACE_APIS[name]), df)
+    endpoints = {name: _api_endpoint(name, base_url) for name, *_ in uploads.values()}
+    batches = {label: make_batches(df, api['batch_size'], api['payload']) for label, (_, api, df) in uploads.items()}
+    with UploadState(state_file) as state:
+        async def run():
+            jobs = []
+            for label, (name, api, _) in uploads.items():
+                url, token = endpoints[name]
+                jobs.append(Uploader(label, url, state, token, api).upload(batches[label], poll))
+            await asyncio.gather(*jobs)
+
+        with phase('upload', rows=sum(len(df) for *_, df in uploads.values())):
+            asyncio.run(run())
+        return {label: state.summary(label, [batch.digest for batch in batches[label]]) for label in uploads}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Trendyol dışa aktarımını pazaryeri API\'lerine toplu yükler.')
+    parser.add_argument('trendyol_file')
+    parser.add_argument('--marketplaces', nargs='+', choices=MARKETPLACES, default=list(MARKETPLACES))
+    parser.add_argument('--base-url', help='Tüm pazaryerleri için <base-url>/<pazaryeri> (örn. sahte sunucu)')
+    parser.add_argument('--state', default=STATE_FILE, help='Paket durum kaydı (SQLite)')
+    parser.add_argument('--no-poll', action='store_true', help='Paket durumlarını sorgulama')
+    parser.add_argument('--hepsiburada-template', default=convert.hepsiburada_template_file)
+    parser.add_argument('--idefix-template', default=idefix.template_file)
+    parser.add_argument('--sku-registry', help='Kalıcı stok kodu kaydı (SQLite)')
+    parser.add_argument('--delta-from', help='Anlık görüntü (.pkl) ya da eski Trendyol dosyası; verilirse yalnızca '
+                                             'yeni/değişen ürünler, fiyat/stok değişimleri ve silinen ürünler '
+                                             'yüklenir; .pkl başarılı yüklemeden sonra güncellenir')
+    parser.add_argument('--pricing-rules', metavar='JSON',
+                        help='Pazaryeri/kategori fiyatlandırma kuralları dosyası (bkz. pricing.py)')
+    parser.add_argument('--cache-dir', default=cache.CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    pricing_rules = None
+    if args.pricing_rules:
+        try:
+            pricing_rules = pricing.load_rules(args.pricing_rules)
+        except (OSError, ValueError) as exc:
+            print(f"Hata: fiyat kuralları okunamadı ({args.pricing_rules}): {exc}")
+            return 1
+
+    if not os.path.exists(args.trendyol_file):
+        print(f"Hata: '{args.trendyol_file}' dosyası bulunamadı.")
+        return 1
+    try:
+        for name in args.marketplaces:
+            _api_endpoint(name, args.base_url)
+    except ValueError as exc:
+        print(f"Hata: {exc}")
+        return 1
+
+    if args.no_cache:
+        catalog_df = read_trendyol_export(args.trendyol_file)
+    else:
+        catalog_df = cache.read_trendyol_export_cached(args.trendyol_file, cache_dir=args.cache_dir)
+
+    sku_registry = SkuRegistry(args.sku_registry) if args.sku_registry else None
+    options = {'hepsiburada_template': args.hepsiburada_template, 'idefix_template': args.idefix_template,
+               'sku_registry': sku_registry, 'pricing_rules': pricing_rules}
+    changes = None
+    if args.delta_from and os.path.exists(args.delta_from):
+        previous_df = delta.load_snapshot(args.delta_from)
+        changes = delta.compute_delta(previous_df, catalog_df)
+        options.update(changes=changes, previous_df=previous_df)
+        print(f"Delta: {delta.summary(changes)}")
+    try:
+        frames, feeds = {}, {}
+        for name in args.marketplaces:
+            # Dosya çıktılarıyla aynı fiyatlar gönderilsin: katalog pazaryeri için önce yeniden fiyatlanır
+            priced_df = pricing.reprice(catalog_df, pricing_rules, name) if pricing_rules else catalog_df
+            df = FRAMES[name](priced_df, options)[0]
+            if changes is None:
+                frames[name] = df
+            else:
+                frames[name] = df.iloc[delta.upload_positions(changes)]
+                feeds[name] = price_stock_frame(name, df, options)
+    finally:
+        if sku_registry is not None:
+            sku_registry.close()
+
+    start = time.perf_counter()
+    results = upload_frames(frames, args.state, args.base_url, poll=not args.no_poll, feeds=feeds)
+    failed = False
+    for name, (statuses, rejected_rows) in results.items():
+        parts = ', '.join(f"{status}: {n} paket / {total} satır" for status, (n, total) in sorted(statuses.items()))
+        print(f"{name}: {parts}; reddedilen satır: {rejected_rows}")
+        failed = failed or 'failed' in statuses or 'pending' in statuses
+    print(f"Yükleme tamamlandı ({time.perf_counter() - start:.2f} sn). Durum kaydı: {args.state}")
+    if failed:
+        return 1
+    # Bir sonraki delta yalnızca başarılı yüklemeden sonraki değişiklikleri göndersin
+    if args.delta_from and not args.delta_from.lower().endswith(('.xlsx', '.xlsm')):
+        delta.save_snapshot(catalog_df, args.delta_from)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
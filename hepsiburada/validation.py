@@ -0,0 +1,261 @@
+"""
+Yükleme öncesi katalog doğrulaması.
+
+Dönüştürücüler hatalı değerleri sessizce düzeltir (fiyat okunamazsa 0, KDV yoksa 20);
+bu satırlar ancak pazaryerine yüklendikten sonra reddedilir. Bu modül Trendyol
+kataloğunu yazmadan önce bütün sütunlar üzerinde denetler:
+
+    barkod_bos             Barkod boş
+    barkod_tekrari         Aynı barkod birden çok satırda
+    gtin_uzunluk           Yalnızca rakamlardan oluşan barkod 8/12/13/14 hane değil
+    gtin_kontrol_hanesi    EAN-13 (GTIN) kontrol hanesi hatalı
+    gtin_degil             Barkod GTIN değil (yalnızca REQUIRE_GTIN = True ise)
+    fiyat_gecersiz         Liste ya da satış fiyatı boş veya sayı değil
+    fiyat_sifir            Fiyat 0 ya da negatif
+    indirim_fiyati_yuksek  Satış (indirimli) fiyatı liste fiyatından büyük
+    stok_gecersiz          Stok boş, sayı değil, tam sayı değil ya da negatif
+    kdv_gecersiz           KDV oranı ALLOWED_KDV_RATES dışında
+    baslik_uzunlugu        Ürün adı TITLE_MIN_LENGTH..TITLE_MAX_LENGTH dışında
+    gorsel_yok             Hiç görsel yok (uyarı)
+    grup_*                 Varyant grubu denetimleri (bkz. variants.py)
+
+Her kural tek bir vektörel maske üretir; rapora yalnızca işaretlenen satırlar girer.
+Rapor satır başına her ihlal için bir kayıt içerir (Excel satır numarası, barkod,
+kural, değer, açıklama). 'hata' önemindeki ihlaller pipeline'ı durdurur.
+
+Kullanım:
+    python validation.py "Ürünleriniz_02.01.2026-23.27.xlsx" --report Dogrulama_Raporu.csv
+    python pipeline.py "Ürünleriniz_02.01.2026-23.27.xlsx" --validate
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+from kernels import clean_text, strip_text
+from mapping import source_column
+from profiling import phase
+
+# --- Ayarlar ---
+LIST_PRICE_COLUMN = 'Piyasa Satış Fiyatı (KDV Dahil)'
+SALE_PRICE_COLUMN = "Trendyol'da Satılacak Fiyat (KDV Dahil)"
+STOCK_COLUMN = 'Ürün Stok Adedi'
+KDV_COLUMN = 'KDV Oranı'
+TITLE_COLUMN = 'Ürün Adı'
+IMAGE_COLUMNS = [f'Görsel {i}' for i in range(1, 9)]
+
+ALLOWED_KDV_RATES = (0, 1, 10, 20)
+TITLE_MIN_LENGTH = 3
+TITLE_MAX_LENGTH = 100  # Trendyol sınırı; daha kısa sınırı olan pazaryeri için düşürün
+GTIN_LENGTHS = (8, 12, 13, 14)
+REQUIRE_GTIN = False  # Satıcı kodları (örn. 'Dkrsyn16211') da barkod olarak kabul edilir
+
+REPORT_FILE = 'Dogrulama_Raporu.csv'
+REPORT_COLUMNS = ['Satır', 'Barkod', 'Model Kodu', 'Kural', 'Önem', 'Sütun', 'Değer', 'Açıklama']
+
+ERROR = 'hata'
+WARNING = 'uyarı'
+
+class CatalogValidationError(ValueError):
+    """Katalogda 'hata' önemli ihlal var; ayrıntılar report DataFrame'inde."""
+
+    def __init__(self, report):
+        self.report = report
+        errors = report[report['Önem'] == ERROR]
+        super().__init__(f"Katalog doğrulaması başarısız: {errors['Satır'].nunique()} satırda "
+                         f"{len(errors)} hata ({', '.join(errors['Kural'].value_counts().index)})")
+
+# --- Yardımcı Fonksiyonlar ---
+
+def _numeric(s):
+    """(float64 değerler, boş maskesi). Sayıya çevrilemeyen dolu hücreler NaN olur."""
+    if is_float_dtype(s.dtype) or is_integer_dtype(s.dtype) or is_bool_dtype(s.dtype):
+        values = s.to_numpy(dtype='float64', na_value=np.nan)
+        return values, np.isnan(values)
+    text = strip_text(s)
+    values = pd.to_numeric(text.where(text != ''), errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    return values, (text == '').to_numpy(dtype=bool)
+
+def gtin_check_digit_valid(barcodes):
+    """
+    Yalnızca rakamlardan oluşan, GTIN_LENGTHS uzunluğundaki barkodlar için kontrol
+    hanesi doğruluğu (bool dizisi). Aynı uzunluktaki barkodlar tek matris işlemiyle
+    denetlenir: sağdan ikinci haneden başlayarak ağırlıklar 3, 1, 3, ...
+    """
+    barcodes = np.asarray(barcodes, dtype=object)
+    lengths = np.fromiter((len(b) for b in barcodes), dtype='int64', count=len(barcodes))
+    valid = np.zeros(len(barcodes), dtype=bool)
+    for length in GTIN_LENGTHS:
+        rows = np.flatnonzero(lengths == length)
+        if not len(rows):
+            continue
+        digits = (np.frombuffer(''.join(barcodes[rows]).encode('ascii'), dtype=np.uint8)
+                  .reshape(-1, length).astype('int64') - ord('0'))
+        weights = np.where(np.arange(length - 1)[::-1] % 2 == 0, 3, 1)
+        check = (10 - (digits[:, :-1] @ weights) % 10) % 10
+        valid[rows] = check == digits[:, -1]
+    return valid
+
+# --- Kurallar ---
+# Her kural (df) -> [(kural, önem, sütun, maske, açıklama), ...] döndürür.
+
+def _barcode_rules(df):
+    barcode = strip_text(source_column(df, 'Barkod'))
+    blank = (barcode == '').to_numpy(dtype=bool)
+    duplicated = barcode.duplicated(keep=False).to_numpy(dtype=bool) & ~blank
+    digits_only = barcode.str.fullmatch(r'[0-9]+').to_numpy(dtype=bool)
+    gtin_length = barcode.str.len().isin(GTIN_LENGTHS).to_numpy(dtype=bool)
+
+    candidates = np.flatnonzero(digits_only & gtin_length)
+    bad_check = np.zeros(len(barcode), dtype=bool)
+    bad_check[candidates] = ~gtin_check_digit_valid(barcode.to_numpy(dtype=object)[candidates])
+
+    rules = [
+        ('barkod_bos', ERROR, 'Barkod', blank, 'Barkod boş'),
+        ('barkod_tekrari', ERROR, 'Barkod', duplicated, 'Barkod katalogda birden çok satırda geçiyor'),
+        ('gtin_uzunluk', ERROR, 'Barkod', digits_only & ~gtin_length,
+         'Sayısal barkod 8, 12, 13 ya da 14 haneli olmalı'),
+        ('gtin_kontrol_hanesi', ERROR, 'Barkod', bad_check, 'EAN/GTIN kontrol hanesi hatalı'),
+    ]
+    if REQUIRE_GTIN:
+        rules.append(('gtin_degil', ERROR, 'Barkod', ~digits_only & ~blank, 'Barkod EAN/GTIN değil'))
+    return rules
+
+def _price_rules(df):
+    list_price, list_blank = _numeric(source_column(df, LIST_PRICE_COLUMN))
+    sale_price, sale_blank = _numeric(source_column(df, SALE_PRICE_COLUMN))
+    rules = []
+    for column, values, blank in ((LIST_PRICE_COLUMN, list_price, list_blank),
+                                  (SALE_PRICE_COLUMN, sale_price, sale_blank)):
+        invalid = np.isnan(values)
+        rules.append(('fiyat_gecersiz', ERROR, column, invalid,
+                      np.where(blank, 'Fiyat boş (dönüştürücü 0 yazar)', 'Fiyat sayı değil (dönüştürücü 0 yazar)')))
+        rules.append(('fiyat_sifir', ERROR, column, ~invalid & (values <= 0), "Fiyat 0'dan büyük olmalı"))
+    with np.errstate(invalid='ignore'):
+        rules.append(('indirim_fiyati_yuksek', ERROR, SALE_PRICE_COLUMN, sale_price > list_price,
+                      'Satış (indirimli) fiyatı liste fiyatından büyük'))
+    return rules
+
+def _stock_rules(df):
+    stock, blank = _numeric(source_column(df, STOCK_COLUMN))
+    invalid = np.isnan(stock)
+    with np.errstate(invalid='ignore'):
+        negative = stock < 0
+        fractional = ~invalid & (stock != np.trunc(stock))
+    message = np.select([blank, invalid, negative], ['Stok boş (dönüştürücü 0 yazar)', 'Stok sayı değil',
+                                                     'Stok negatif'], 'Stok tam sayı değil')
+    return [('stok_gecersiz', ERROR, STOCK_COLUMN, invalid | negative | fractional, message)]
+
+def _kdv_rules(df):
+    kdv, blank = _numeric(source_column(df, KDV_COLUMN))
+    allowed = ', '.join(str(r) for r in ALLOWED_KDV_RATES)
+    message = np.where(blank, f"KDV boş (dönüştürücü 20 yazar); izin verilenler: {allowed}",
+                       f"KDV oranı geçersiz; izin verilenler: {allowed}")
+    return [('kdv_gecersiz', ERROR, KDV_COLUMN, ~np.isin(kdv, ALLOWED_KDV_RATES), message)]
+
+def _title_rules(df):
+    length = clean_text(source_column(df, TITLE_COLUMN)).str.len().to_numpy(dtype='int64')
+    message = np.where(length < TITLE_MIN_LENGTH, f"Ürün adı en az {TITLE_MIN_LENGTH} karakter olmalı",
+                       f"Ürün adı en fazla {TITLE_MAX_LENGTH} karakter olmalı")
+    return [('baslik_uzunlugu', ERROR, TITLE_COLUMN, (length < TITLE_MIN_LENGTH) | (length > TITLE_MAX_LENGTH), message)]
+
+def _image_rules(df):
+    has_image = np.zeros(len(df), dtype=bool)
+    for col in IMAGE_COLUMNS:
+        if col not in df.columns:
+            continue
+        # Yalnızca henüz görseli bulunmayan satırlara bak: çoğu satır Görsel 1'de elenir
+        pending = np.flatnonzero(~has_image)
+        if not len(pending):
+            break
+        has_image[pending] = (strip_text(df[col].iloc[pending]) != '').to_numpy(dtype=bool)
+    return [('gorsel_yok', WARNING, IMAGE_COLUMNS[0], ~has_image, 'Ürünün hiç görseli yok')]
+
+def _variant_rules(df):
+    from variants import group_rules  # variants bu modülü içe aktarır
+
+    return group_rules(df)
+
+RULES = {
+    'barkod': _barcode_rules,
+    'fiyat': _price_rules,
+    'stok': _stock_rules,
+    'kdv': _kdv_rules,
+    'baslik': _title_rules,
+    'gorsel': _image_rules,
+    'varyant': _variant_rules,
+}
+
+# --- Ana İşlem ---
+
+def excel_rows(df):
+    """Katalog satırlarının Trendyol dosyasındaki (1'den başlayan) satır numaraları."""
+    header_row = df.attrs.get('header_row')
+    if header_row is None or not is_integer_dtype(df.index.dtype):
+        return np.arange(1, len(df) + 1)
+    return df.index.to_numpy() + header_row + 2
+
+def validate_catalog(df, rules=RULES):
+    """
+    Kataloğu tüm kurallarla denetler ve ihlal raporunu (REPORT_COLUMNS) döndürür.
+    Rapor satır numarasına, sonra kural sırasına göre sıralıdır; ihlal yoksa boştur.
+    """
+    with phase('validate', rows=len(df)):
+        rows = excel_rows(df)
+        barcode = strip_text(source_column(df, 'Barkod')).to_numpy(dtype=object)
+        model = strip_text(source_column(df, 'Model Kodu')).to_numpy(dtype=object)
+        parts = []
+        order = 0
+        for check in rules.values():
+            for rule, severity, column, mask, message in check(df):
+                positions = np.flatnonzero(mask)
+                if not len(positions):
+                    continue
+                values = source_column(df, column, '').to_numpy(dtype=object)[positions]
+                parts.append(pd.DataFrame({
+                    'Satır': rows[positions], 'Barkod': barcode[positions], 'Model Kodu': model[positions],
+                    'Kural': rule, 'Önem': severity, 'Sütun': column,
+                    'Değer': ['' if v is None or v != v else str(v) for v in values],
+                    'Açıklama': np.asarray(message, dtype=object)[positions] if np.ndim(message) else message,
+                    '_order': order,
+                }))
+                order += 1
+        if not parts:
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+        report = pd.concat(parts, ignore_index=True).sort_values(['Satır', '_order'], kind='stable')
+        return report[REPORT_COLUMNS].reset_index(drop=True)
+
+def has_errors(report):
+    return bool((report['Önem'] == ERROR).any())
+
+def write_report(report, path):
+    report.to_csv(path, sep=';', index=False, encoding='utf-8-sig')
+
+def summary(report):
+    if report.empty:
+        return 'ihlal yok'
+    counts = report.groupby(['Önem', 'Kural'], sort=False).size()
+    return ', '.join(f"{rule} ({severity}): {n}" for (severity, rule), n in counts.items())
+
+def main(argv=None):
+    from catalog import read_trendyol_export
+
+    parser = argparse.ArgumentParser(description='Trendyol kataloğunu yükleme öncesi doğrular.')
+    parser.add_argument('trendyol_file')
+    parser.add_argument('--report', default=REPORT_FILE, help='İhlal raporu (CSV)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.trendyol_file):
+        print(f"Hata: '{args.trendyol_file}' dosyası bulunamadı.")
+        return 1
+
+    catalog_df = read_trendyol_export(args.trendyol_file)
+    report = validate_catalog(catalog_df)
+    write_report(report, args.report)
+    print(f"{len(catalog_df)} satır denetlendi: {summary(report)}. Rapor: {args.report}")
+    return 1 if has_errors(report) else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
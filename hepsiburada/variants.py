@@ -0,0 +1,248 @@
+"""
+Varyant grubu indeksi, grup düzeyi denetimler ve toplu grup işlemleri.
+
+Varyant grubu Model Kodu'ndan türetilir: Hepsiburada 'Varyant Grup Id' sonundaki
+'-xxx' ekini atar (kernels.variant_group_ids), N11/Pazarama 'Grup Kodu' olarak Model
+Kodu'nu aynen kullanır. VariantGroupIndex bu anahtarlardan biriyle bir kez kurulur
+ve grup -> satır konumlarını diziler halinde (CSR düzeninde) tutar:
+
+    codes    satırın grup numarası (Model Kodu boşsa -1)
+    keys     grup numarası -> grup anahtarı
+    order    satır konumları, grup numarasına göre sıralı (grup içinde özgün sırada)
+    offsets  g. grubun satırları order[offsets[g]:offsets[g + 1]]
+
+Denetimler (group_rules; validation.py kural biçiminde, 'varyant' adıyla doğrulamaya dahil):
+
+    grup_varyant_tekrari   Grupta aynı Renk/Beden/Boyut birleşimi birden çok satırda (hata)
+    grup_marka_tutarsiz    Marka grubun en sık markasından farklı (uyarı)
+    grup_kategori_tutarsiz Kategori grubun en sık kategorisinden farklı (uyarı)
+    grup_fiyat_bandi       Satış fiyatı grubun en düşük fiyatının PRICE_BAND_RATIO katından fazla (uyarı)
+
+Toplu işlem: fill_from_group, grupta alanları boş kalan satırlara grubun alanları dolu
+ilk satırından kopyalar (örn. görseller, açıklama); overwrite=True ise grubun bütün
+satırları bu satırla eşitlenir.
+
+Kullanım:
+    python variants.py "Ürünleriniz_02.01.2026-23.27.xlsx" --report Varyant_Raporu.csv
+    python pipeline.py "Ürünleriniz_02.01.2026-23.27.xlsx" --fill-variant-groups
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from kernels import clean_text, strip_text, variant_group_ids
+from mapping import source_column
+from profiling import phase
+import validation
+from validation import ERROR, WARNING
+
+# --- Ayarlar ---
+# Grup anahtarı adı -> Model Kodu'ndan anahtar
+GROUP_KEYS = {
+    'variant': variant_group_ids,  # Hepsiburada 'Varyant Grup Id'
+    'model': clean_text,           # N11/Pazarama 'Grup Kodu'
+}
+DEFAULT_GROUP_KEY = 'variant'
+OPTION_COLUMNS = ('Ürün Rengi', 'Beden', 'Boyut/Ebat')  # Grup içinde tekil olması gereken birleşim
+BRAND_COLUMN = 'Marka'
+CATEGORY_COLUMN = 'Kategori İsmi'
+PRICE_COLUMN = validation.SALE_PRICE_COLUMN
+PRICE_BAND_RATIO = 1.5
+IMAGE_COLUMNS = validation.IMAGE_COLUMNS
+DESCRIPTION_COLUMNS = ['Ürün Açıklaması']
+REPORT_FILE = 'Varyant_Raporu.csv'
+
+# --- İndeks ---
+
+class VariantGroupIndex:
+    """Katalog satırlarının varyant grupları; grup -> satır konumları dizilerde tutulur."""
+
+    def __init__(self, catalog_df, key=DEFAULT_GROUP_KEY):
+        with phase('variants.index', rows=len(catalog_df)):
+            keys = GROUP_KEYS[key](source_column(catalog_df, 'Model Kodu')).to_numpy(dtype=object)
+            codes, uniques = pd.factorize(keys)  # Gruplar ilk göründükleri sırada numaralanır
+            blank = np.flatnonzero(uniques == '')
+            if len(blank):
+                # Boş anahtar grup değildir: -1 yapılır, sonraki numaralar bir kayar
+                b = blank[0]
+                codes = np.where(codes == b, -1, codes - (codes > b))
+                uniques = np.delete(uniques, b)
+            self.codes = codes.astype(np.int64)
+            self.keys = np.asarray(uniques, dtype=object)
+            grouped = np.flatnonzero(self.codes >= 0)
+            self.order = grouped[np.argsort(self.codes[grouped], kind='stable')]
+            self.sizes = np.bincount(self.codes[grouped], minlength=len(self.keys))
+            self.offsets = np.concatenate(([0], np.cumsum(self.sizes)))
+            self._key_index = pd.Index(self.keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def group_of(self, key):
+        """Grup anahtarının numarası; yoksa -1."""
+        return int(self._key_index.get_indexer([key])[0])
+
+    def positions(self, group):
+        """g. grubun satır konumları (özgün sırada)."""
+        return self.order[self.offsets[group]:self.offsets[group + 1]]
+
+    def per_row(self, per_group, fill):
+        """Grup başına değerleri satırlara yayar; grupsuz satırlar (ve grup yoksa hepsi) fill alır."""
+        per_group = np.asarray(per_group)
+        out = np.full(len(self.codes), fill, dtype=np.result_type(per_group, fill))
+        grouped = self.codes >= 0
+        out[grouped] = per_group[self.codes[grouped]]
+        return out
+
+    def group_first(self, mask):
+        """Her grup için mask'i sağlayan ilk satırın konumu (yoksa -1)."""
+        first = np.full(len(self.keys), -1, dtype=np.int64)
+        rows = np.flatnonzero(mask & (self.codes >= 0))[::-1]
+        first[self.codes[rows]] = rows  # Tersten yazıldığı için ilk satır kalır
+        return first
+
+    def group_mode(self, values):
+        """
+        Her grubun en sık değeri: (mod[grup], satırların değer kodları, kod -> değer).
+        Eşitlikte grupta önce görülen değer seçilir; mod değer kodu olarak döner.
+        """
+        value_codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        grouped = np.flatnonzero(self.codes >= 0)
+        pairs = self.codes[grouped] * (len(uniques) + 1) + value_codes[grouped]
+        pair_codes, pair_uniques = pd.factorize(pairs)  # İlk görülme sırasında
+        counts = np.bincount(pair_codes)
+        pair_group, pair_value = np.divmod(pair_uniques, len(uniques) + 1)
+        best = np.lexsort((np.arange(len(pair_uniques)), -counts, pair_group))
+        mode = np.full(len(self.keys), -1, dtype=np.int64)
+        mode[pair_group[best][::-1]] = pair_value[best][::-1]
+        return mode, value_codes, uniques
+
+    def group_min(self, values):
+        """Her grubun NaN olmayan en küçük değeri (hepsi NaN ise NaN)."""
+        sorted_values = np.asarray(values, dtype='float64')[self.order]
+        out = np.full(len(self.keys), np.nan)
+        nonempty = self.sizes > 0
+        out[nonempty] = np.fmin.reduceat(sorted_values, self.offsets[:-1][nonempty])
+        return out
+
+# --- Denetimler ---
+
+def _text(df, column):
+    return strip_text(source_column(df, column)).to_numpy(dtype=object)
+
+def _group_messages(index, rows, template, **arrays):
+    """Yalnızca işaretli satırlar için açıklama; diğer satırlar ''."""
+    message = np.full(len(index.codes), '', dtype=object)
+    groups = index.codes[rows]
+    message[rows] = [template.format(group=index.keys[g], **{k: v[i] for k, v in arrays.items()})
+                     for i, g in enumerate(groups)]
+    return message
+
+def _mode_rule(index, df, column, rule):
+    values = _text(df, column)
+    mode, value_codes, uniques = index.group_mode(values)
+    grouped = index.codes >= 0
+    mask = grouped & (value_codes != index.per_row(mode, -1))
+    rows = np.flatnonzero(mask)
+    expected = np.asarray(uniques, dtype=object)[mode[index.codes[rows]]] if len(rows) else []
+    message = _group_messages(index, rows, "'{group}' grubunda çoğunluk: '{expected}'", expected=expected)
+    return (rule, WARNING, column, mask, message)
+
+def group_rules(df, index=None):
+    """Grup düzeyi denetimler; validation.RULES biçiminde kural listesi döndürür."""
+    index = index if index is not None else VariantGroupIndex(df)
+    grouped = index.codes >= 0
+
+    # Aynı grup + seçenek birleşimi: birleşim kodu üzerinden tekrarlar
+    option = index.codes.copy()
+    for column in OPTION_COLUMNS:
+        codes, uniques = pd.factorize(_text(df, column))
+        option = option * (len(uniques) + 1) + codes
+        option, _ = pd.factorize(option)  # Taşmayı önlemek için her adımda sıkıştır
+    duplicated = grouped & pd.Series(option).duplicated(keep=False).to_numpy()
+    dup_rows = np.flatnonzero(duplicated)
+    dup_message = _group_messages(index, dup_rows, "'{group}' grubunda aynı Renk/Beden/Boyut birden çok satırda")
+
+    price = validation._numeric(source_column(df, PRICE_COLUMN))[0]
+    group_min = index.group_min(price)
+    row_min = index.per_row(group_min, np.nan)
+    with np.errstate(invalid='ignore'):
+        outside = grouped & (price > row_min * PRICE_BAND_RATIO) & (row_min > 0)
+    band_rows = np.flatnonzero(outside)
+    band_message = _group_messages(index, band_rows, "'{group}' grubunda en düşük fiyat {low:g}; "
+                                   f"izin verilen en fazla {PRICE_BAND_RATIO:g} katı", low=row_min[band_rows])
+
+    return [
+        ('grup_varyant_tekrari', ERROR, OPTION_COLUMNS[0], duplicated, dup_message),
+        _mode_rule(index, df, BRAND_COLUMN, 'grup_marka_tutarsiz'),
+        _mode_rule(index, df, CATEGORY_COLUMN, 'grup_kategori_tutarsiz'),
+        ('grup_fiyat_bandi', WARNING, PRICE_COLUMN, outside, band_message),
+    ]
+
+# --- Toplu İşlemler ---
+
+def fill_from_group(df, columns, index=None, overwrite=False):
+    """
+    columns'un hepsi boş olan satırlara grubun bu sütunlardan en az biri dolu ilk
+    satırının değerlerini kopyalar; overwrite=True ise grubun bütün satırlarına kopyalar.
+    Sütunlar birlikte taşınır (örn. görsel sırası bozulmaz). Yeni DataFrame döndürür.
+    """
+    index = index if index is not None else VariantGroupIndex(df)
+    columns = [c for c in columns if c in df.columns]
+    if not columns:
+        return df
+    with phase('variants.fill', rows=len(df)):
+        filled = np.zeros(len(df), dtype=bool)
+        for column in columns:
+            filled |= _text(df, column) != ''
+        donor = index.group_first(filled)
+        row_donor = index.per_row(donor, -1)
+        targets = np.flatnonzero((row_donor >= 0) & (overwrite | ~filled))
+        if not len(targets):
+            return df
+        out = df.copy()
+        for column in columns:
+            values = source_column(df, column).to_numpy(dtype=object).copy()
+            values[targets] = values[row_donor[targets]]
+            out[column] = pd.Series(values, index=df.index).astype(df[column].dtype)
+        return out
+
+def fill_variant_groups(df, key=DEFAULT_GROUP_KEY):
+    """Görselleri ve açıklaması boş varyantları grubun ilk dolu satırından doldurur."""
+    index = VariantGroupIndex(df, key)
+    df = fill_from_group(df, IMAGE_COLUMNS, index)
+    return fill_from_group(df, DESCRIPTION_COLUMNS, index)
+
+# --- Ana İşlem ---
+
+def validate_groups(df, key=DEFAULT_GROUP_KEY):
+    """Yalnızca grup denetimlerinin raporu (validation.REPORT_COLUMNS)."""
+    index = VariantGroupIndex(df, key)
+    return validation.validate_catalog(df, {'varyant': lambda df: group_rules(df, index)})
+
+def main(argv=None):
+    from catalog import read_trendyol_export
+
+    parser = argparse.ArgumentParser(description='Varyant gruplarının tutarlılığını denetler.')
+    parser.add_argument('trendyol_file')
+    parser.add_argument('--key', choices=GROUP_KEYS, default=DEFAULT_GROUP_KEY,
+                        help="Grup anahtarı: 'variant' Hepsiburada Varyant Grup Id, 'model' N11/Pazarama Grup Kodu")
+    parser.add_argument('--report', default=REPORT_FILE, help='İhlal raporu (CSV)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.trendyol_file):
+        print(f"Hata: '{args.trendyol_file}' dosyası bulunamadı.")
+        return 1
+
+    catalog_df = read_trendyol_export(args.trendyol_file)
+    index = VariantGroupIndex(catalog_df, args.key)
+    report = validation.validate_catalog(catalog_df, {'varyant': lambda df: group_rules(df, index)})
+    validation.write_report(report, args.report)
+    print(f"{len(index)} grup ({int((index.sizes > 1).sum())} çok varyantlı) denetlendi: "
+          f"{validation.summary(report)}. Rapor: {args.report}")
+    return 1 if validation.has_errors(report) else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
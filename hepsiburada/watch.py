@@ -0,0 +1,288 @@
+"""
+İzleme modu: dışa aktarım klasörünü izler ve yeni gelen her Trendyol dosyasını
+sıcak (önceden yüklenmiş) bir süreç içinde dönüştürür.
+
+Süreç bir kez başlar; pandas/openpyxl içe aktarımları, pazaryeri şablonları ve son
+işlenen katalog bellekte kalır. Klasöre yeni bir 'Ürünleriniz_*.xlsx' düştüğünde
+yalnızca bu dosya okunur ve bellekteki önceki katalogla karşılaştırılır (delta.py);
+yeni/değişen ürünler '_delta' dosyalarına, fiyat/stok değişimleri ve silinen ürünler
+pazaryeri başına pipeline.PRICE_STOCK_FEED_FILE'a <çıktı klasörü>/<dosya adı>/ altında yazılır.
+İlk dosya (önceki katalog yoksa) tam olarak dönüştürülür. Son katalog SNAPSHOT_FILE'a
+da kaydedilir; süreç yeniden başlatıldığında delta buradan devam eder.
+
+Linux'ta klasör inotify ile izlenir (yazma bitip dosya kapandığında ya da klasöre
+taşındığında haber verir). inotify yoksa ya da --poll verilirse klasör aralıklarla
+taranır; boyutu ve değişiklik zamanı iki tarama boyunca sabit kalan dosya işlenir.
+
+Kullanım:
+    python watch.py indirilenler --output-dir cikti
+    python watch.py . --marketplaces n11 pazarama --poll --interval 2
+"""
+import argparse
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import time
+import traceback
+import unicodedata
+
+import cache
+from catalog import read_trendyol_export
+import convert
+import delta
+import idefix
+import pipeline
+import profiling
+import validation
+
+# --- Ayarlar ---
+EXPORT_PATTERN = 'Ürünleriniz_*.xlsx'
+SNAPSHOT_FILE = '.son_katalog.pkl'
+POLL_INTERVAL_SECONDS = 1.0
+
+# inotify sabitleri (<sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+def is_export(name):
+    # macOS'tan kopyalanan adlar ayrışık (NFD) Unicode olabilir
+    name = unicodedata.normalize('NFC', name)
+    return fnmatch.fnmatch(name, EXPORT_PATTERN) and not name.startswith('~$')
+
+# --- Klasör İzleyicileri ---
+
+class InotifyWatcher:
+    """Klasöre yazılıp kapanan ya da taşınan dosyaların adlarını inotify ile bildirir."""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify desteklenmiyor')
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 başarısız')
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch başarısız: {directory}")
+        self.directory = directory
+
+    def poll(self, timeout=None):
+        """timeout saniye içinde gelen olaylardaki dosya adlarını döndürür (boş olabilir)."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        names = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Olay kuyruğu taştı: kaçırılan dosyalar için klasörü baştan listele
+                    names.extend(os.listdir(self.directory))
+                elif name:
+                    names.append(os.fsdecode(name))
+        return list(dict.fromkeys(names))
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """
+    Klasörü aralıklarla tarar. Yeni ya da değişmiş bir dosya, (boyut, değişiklik zamanı)
+    art arda iki taramada aynı kaldığında, yani yazma bittikten sonra bildirilir.
+    """
+
+    def __init__(self, directory, interval=POLL_INTERVAL_SECONDS):
+        self.directory = directory
+        self.interval = interval
+        self.seen = self._scan()  # Başlangıçta var olan dosyalar yeni sayılmaz
+        self.pending = {}
+
+    def _scan(self):
+        signatures = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Tarama sırasında silindi
+                signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def poll(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        current = self._scan()
+        names = []
+        for name, signature in current.items():
+            if self.seen.get(name) == signature:
+                continue
+            if self.pending.get(name) == signature:
+                names.append(name)
+                self.seen[name] = signature
+                del self.pending[name]
+            else:
+                self.pending[name] = signature  # Henüz yazılıyor olabilir; bir tur daha bekle
+        self.seen = {name: sig for name, sig in self.seen.items() if name in current}
+        return names
+
+    def close(self):
+        pass
+
+def make_watcher(directory, use_polling=False, interval=POLL_INTERVAL_SECONDS):
+    if not use_polling:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError, TypeError) as exc:
+            print(f"Uyarı: inotify kullanılamıyor ({exc}); klasör {interval} sn aralıkla taranacak.")
+    return PollingWatcher(directory, interval)
+
+# --- Dönüştürücü ---
+
+class WarmConverter:
+    """Şablonları ve son işlenen kataloğu bellekte tutarak dosyaları art arda dönüştürür."""
+
+    def __init__(self, output_dir, marketplaces=pipeline.MARKETPLACES,
+                 hepsiburada_template=convert.hepsiburada_template_file,
+                 idefix_template=idefix.template_file, sku_registry_file=None,
+                 cache_dir=None, validate=False):
+        self.output_dir = output_dir
+        self.marketplaces = marketplaces
+        self.hepsiburada_template = hepsiburada_template
+        self.idefix_template = idefix_template
+        self.sku_registry_file = sku_registry_file
+        self.cache_dir = cache_dir
+        self.validate = validate
+        self.snapshot_file = os.path.join(output_dir, SNAPSHOT_FILE)
+        self.processed = {}  # mutlak yol -> (boyut, değişiklik zamanı)
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.previous_df = None
+        if os.path.exists(self.snapshot_file):
+            try:
+                self.previous_df = delta.load_snapshot(self.snapshot_file)
+            except Exception as exc:
+                print(f"Uyarı: anlık görüntü okunamadı ({exc}); ilk dosya tam dönüştürülecek.")
+
+        # Şablonları şimdiden ayrıştır; ilk dosya geldiğinde bellekte hazır olsunlar
+        if 'hepsiburada' in marketplaces:
+            convert.read_hepsiburada_template(hepsiburada_template, convert.hepsiburada_sheet_name)
+        if 'idefix' in marketplaces:
+            idefix.idefix_sablon_sutunlarini_oku(idefix_template)
+
+    def _read(self, path):
+        if self.cache_dir:
+            return cache.read_trendyol_export_cached(path, cache_dir=self.cache_dir)
+        return read_trendyol_export(path)
+
+    def process(self, path):
+        """Dosyayı dönüştürür; {pazaryeri: çıktı yolu} döndürür, aynı dosya tekrar gelirse None."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if self.processed.get(path) == signature:
+            return None
+
+        start = time.perf_counter()
+        catalog_df = self._read(path)
+        output_dir = os.path.join(self.output_dir, os.path.splitext(os.path.basename(path))[0])
+        outputs = pipeline.convert_catalog(catalog_df, output_dir, self.marketplaces,
+                                           self.hepsiburada_template, self.idefix_template,
+                                           sku_registry_file=self.sku_registry_file,
+                                           previous_df=self.previous_df, validate=self.validate)
+        elapsed = time.perf_counter() - start
+
+        self.previous_df = catalog_df
+        self.processed[path] = signature
+        print(f"{os.path.basename(path)}: {len(outputs)} dosya {output_dir} klasörüne yazıldı ({elapsed:.2f} sn).")
+        delta.save_snapshot(catalog_df, self.snapshot_file)
+        return outputs
+
+    def process_safely(self, path):
+        """process() ile aynı; hatayı basar ve izlemeye devam eder."""
+        try:
+            return self.process(path)
+        except FileNotFoundError:
+            return None  # İşlenmeden önce silindi ya da taşındı
+        except validation.CatalogValidationError as exc:
+            print(f"Hata: {os.path.basename(path)}: {exc}")
+        except Exception:
+            print(f"Hata: {os.path.basename(path)} dönüştürülemedi:")
+            traceback.print_exc()
+        return None
+
+# --- Ana İşlem ---
+
+def existing_exports(directory):
+    """Klasördeki dışa aktarımlar, eskiden yeniye."""
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if is_export(name)]
+    return sorted(paths, key=os.path.getmtime)
+
+def watch(directory, converter, use_polling=False, interval=POLL_INTERVAL_SECONDS,
+          process_existing=False, stop_after=None):
+    """
+    Klasörü izler ve gelen dosyaları converter ile dönüştürür. stop_after verilirse
+    bu kadar dosya işlendikten sonra döner (deneme ve ölçüm için).
+    """
+    watcher = make_watcher(directory, use_polling, interval)
+    count = 0
+    try:
+        if process_existing:
+            for path in existing_exports(directory):
+                count += converter.process_safely(path) is not None
+        print(f"'{directory}' izleniyor ({type(watcher).__name__}); durdurmak için Ctrl+C.")
+        while stop_after is None or count < stop_after:
+            for name in watcher.poll():
+                if is_export(name):
+                    count += converter.process_safely(os.path.join(directory, name)) is not None
+    finally:
+        watcher.close()
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Klasörü izler, yeni Trendyol dışa aktarımlarını anında dönüştürür.')
+    parser.add_argument('directory', nargs='?', default='.', help='İzlenecek dışa aktarım klasörü')
+    parser.add_argument('--output-dir', default='izleme_cikti', help='Çıktı kök klasörü')
+    parser.add_argument('--marketplaces', nargs='+', choices=pipeline.MARKETPLACES, default=list(pipeline.MARKETPLACES))
+    parser.add_argument('--hepsiburada-template', default=convert.hepsiburada_template_file)
+    parser.add_argument('--idefix-template', default=idefix.template_file)
+    parser.add_argument('--sku-registry', help='Kalıcı stok kodu kaydı (SQLite)')
+    parser.add_argument('--cache-dir', help='Ayrıştırılan katalogları bu klasörde de önbelleğe al')
+    parser.add_argument('--validate', action='store_true', help='Yazmadan önce kataloğu doğrula')
+    parser.add_argument('--process-existing', action='store_true',
+                        help='Klasörde zaten bulunan dışa aktarımları da (eskiden yeniye) işle')
+    parser.add_argument('--poll', action='store_true', help='inotify yerine klasörü aralıklarla tara')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL_SECONDS, help='Tarama aralığı (sn)')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='DOSYA',
+                        help='Aşama sürelerini JSON satırı olarak DOSYA\'ya (verilmezse stderr\'e) yaz')
+    args = parser.parse_args(argv)
+
+    if args.profile is not None:
+        profiling.enable(None if args.profile == '-' else args.profile)
+
+    if not os.path.isdir(args.directory):
+        print(f"Hata: '{args.directory}' klasörü bulunamadı.")
+        return 1
+
+    converter = WarmConverter(args.output_dir, args.marketplaces, args.hepsiburada_template,
+                              args.idefix_template, args.sku_registry, args.cache_dir, args.validate)
+    try:
+        watch(args.directory, converter, args.poll, args.interval, args.process_existing)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
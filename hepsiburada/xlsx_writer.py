@@ -0,0 +1,194 @@
+"""
+Sabit bellekli, akışlı XLSX yazıcı.
+
+pd.ExcelWriter(engine='openpyxl') bütün çalışma kitabını hücre nesneleri olarak
+bellekte kurar ve kaydederken her hücreyi ayrı XML düğümü olarak serileştirir.
+Bu modül sayfa XML'ini doğrudan üretir: satırlar DataFrame'den CHUNK_ROWS'luk
+dilimler halinde metne çevrilip zip içindeki sayfaya akıtılır. Metinler satır içi
+(inlineStr) yazıldığından paylaşılan metin tablosu da tutulmaz; bellek kullanımı
+katalog boyutundan bağımsızdır.
+
+Hücre değerleri DataFrame.to_excel(index=False) ile aynıdır: NaN/None boş hücre,
+±inf 'inf'/'-inf' metni, NumPy sayıları Python int/float, '=' ile başlayan metinler
+openpyxl'deki gibi formül olarak yazılır. Bir sayfaya art arda birden çok tablo
+yazılabilir (örn. Hepsiburada şablonunun iki satırlık üst bilgisi ve altında başlıklı veri).
+"""
+import datetime
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils.datetime import to_excel
+from openpyxl.utils.exceptions import IllegalCharacterError
+from pandas.api.types import is_float_dtype
+
+# --- Ayarlar ---
+CHUNK_ROWS = 10_000  # Tek seferde Python değerlerine dönüştürülen satır dilimi
+WRITE_BATCH_ROWS = 500  # Zip akışına tek parça halinde yazılan satır sayısı
+INF_REP = 'inf'  # to_excel varsayılanı
+
+# --- Paket Parçaları ---
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_CONTENT_TYPES = (
+    _XML_DECL
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>')
+
+_ROOT_RELS = (
+    _XML_DECL
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>')
+
+_WORKBOOK_RELS = (
+    _XML_DECL
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    '</Relationships>')
+
+# Stil 0: varsayılan, 1: tarih-saat (numFmt 22), 2: tarih (numFmt 14)
+_STYLES = (
+    _XML_DECL
+    + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>')
+
+def _workbook_xml(sheet_name):
+    return (_XML_DECL
+            + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            f'<sheets><sheet name={quoteattr(sheet_name)} sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>')
+
+# --- Hücre Serileştirme ---
+
+def _column_letter(index):
+    """0 -> A, 25 -> Z, 26 -> AA."""
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _str_cell(ref, value):
+    if not value:
+        return ''  # openpyxl boş metni boş hücre olarak yazar
+    if ILLEGAL_CHARACTERS_RE.search(value):
+        raise IllegalCharacterError(f"{value} cannot be used in worksheets.")
+    if value.startswith('=') and len(value) > 1:
+        return f'<c r="{ref}"><f>{escape(value[1:])}</f><v></v></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+
+def _number_cell(ref, value):
+    # openpyxl ile aynı biçim: 2.0 -> '2' (geri okununca int), 16 anlamlı basamak
+    return f'<c r="{ref}" t="n"><v>{value:.16g}</v></c>'
+
+def _bool_cell(ref, value):
+    return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+
+def _other_cell(ref, value):
+    if isinstance(value, (bool, np.bool_)):
+        return _bool_cell(ref, bool(value))
+    if isinstance(value, np.integer):
+        return _number_cell(ref, int(value))
+    if isinstance(value, np.floating):
+        return _number_cell(ref, float(value))
+    if isinstance(value, str):
+        return _str_cell(ref, str(value))
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            raise ValueError("Excel saat dilimli tarihleri desteklemez.")
+        return f'<c r="{ref}" t="n" s="1"><v>{to_excel(value):.16g}</v></c>'
+    if isinstance(value, datetime.date):
+        return f'<c r="{ref}" t="n" s="2"><v>{to_excel(value):.16g}</v></c>'
+    raise TypeError(f"Desteklenmeyen hücre tipi: {type(value).__name__}")
+
+_CELL_WRITERS = {str: _str_cell, int: _number_cell, float: _number_cell, bool: _bool_cell}
+
+def _row_xml(row_number, values, letters):
+    cells = [_CELL_WRITERS.get(type(v), _other_cell)(f"{letter}{row_number}", v)
+             for letter, v in zip(letters, values) if v is not None]
+    return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+# --- Değer Dönüşümü ---
+
+def _column_values(s):
+    """Sütunu to_excel'in yazacağı Python değerlerine (object dizisi) çevirir."""
+    values = s.to_numpy(dtype=object, copy=True)
+    if is_float_dtype(s.dtype):
+        raw = s.to_numpy(dtype='float64')
+        values[np.isposinf(raw)] = INF_REP
+        values[np.isneginf(raw)] = f"-{INF_REP}"
+    values[pd.isna(s).to_numpy()] = None
+    return values
+
+def iter_rows(df, chunk_rows=CHUNK_ROWS):
+    """DataFrame satırlarını dilim dilim dönüştürerek demet olarak üretir."""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        columns = [_column_values(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+        yield from zip(*columns)
+
+# --- Yazma ---
+
+def write_frames(output_file, sheet_name, frames, chunk_rows=CHUNK_ROWS):
+    """
+    Tek sayfalı çalışma kitabı yazar. frames, sırayla yazılacak (DataFrame, başlık)
+    çiftleridir; başlık True ise tablonun sütun adları bir satır olarak önce yazılır.
+    """
+    n_rows = sum(len(df) + bool(header) for df, header in frames)
+    n_cols = max((df.shape[1] for df, _ in frames), default=0)
+    letters = [_column_letter(i) for i in range(n_cols)]
+    dimension = f"A1:{letters[-1]}{n_rows}" if n_rows and n_cols else 'A1'
+
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _ROOT_RELS)
+        zf.writestr('xl/workbook.xml', _workbook_xml(sheet_name))
+        zf.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        zf.writestr('xl/styles.xml', _STYLES)
+
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((_XML_DECL + f'<worksheet xmlns="{_MAIN_NS}">'
+                         f'<dimension ref="{dimension}"/><sheetData>').encode('utf-8'))
+            row_number = 0
+            for df, header in frames:
+                if header:
+                    row_number += 1
+                    sheet.write(_row_xml(row_number, list(df.columns), letters).encode('utf-8'))
+                buffer = []
+                for row in iter_rows(df, chunk_rows):
+                    row_number += 1
+                    buffer.append(_row_xml(row_number, row, letters))
+                    if len(buffer) == WRITE_BATCH_ROWS:
+                        sheet.write(''.join(buffer).encode('utf-8'))
+                        buffer = []
+                sheet.write(''.join(buffer).encode('utf-8'))
+            sheet.write(b'</sheetData></worksheet>')
+
+def write_frame(output_file, sheet_name, df, chunk_rows=CHUNK_ROWS):
+    """df.to_excel(output_file, sheet_name=sheet_name, index=False) karşılığı."""
+    write_frames(output_file, sheet_name, [(df, True)], chunk_rows)